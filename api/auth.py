@@ -1,5 +1,9 @@
+import asyncio
 import hashlib
+import os
 import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
 import bcrypt
@@ -13,20 +17,53 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from api.config import get_settings
 from api.database import get_db
 from api.models.user import User
+from api.services.auth_cache import principal_cache, token_cache_key, attach
 
 settings = get_settings()
 bearer_scheme = HTTPBearer(auto_error=False)
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
 
+_password_pool: ThreadPoolExecutor | None = None
+
+
+def _get_password_pool() -> ThreadPoolExecutor:
+    # bcrypt releases the GIL, so hashes run truly parallel up to the pool size
+    global _password_pool
+    if _password_pool is None:
+        _password_pool = ThreadPoolExecutor(
+            max_workers=settings.password_hash_workers or os.cpu_count() or 1,
+            thread_name_prefix="vm-bcrypt",
+        )
+    return _password_pool
+
+
 def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=settings.bcrypt_rounds)).decode("utf-8")
 
 
 def verify_password(plain: str, hashed: str) -> bool:
     return bcrypt.checkpw(plain.encode("utf-8"), hashed.encode("utf-8"))
 
 
+def password_needs_rehash(hashed: str) -> bool:
+    """True if hashed was made with a different cost than BCRYPT_ROUNDS."""
+    try:
+        return int(hashed.split("$")[2]) != settings.bcrypt_rounds
+    except (IndexError, ValueError):
+        return True
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password without blocking the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(_get_password_pool(), hash_password, password)
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    """verify_password without blocking the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(_get_password_pool(), verify_password, plain, hashed)
+
+
 def generate_api_key() -> tuple[str, str, str]:
     """Generate an API key. Returns (raw_key, key_hash, key_prefix)."""
     raw_key = "vm_" + secrets.token_urlsafe(48)
@@ -54,9 +91,15 @@ async def get_current_user(
     # Try API key first (compare by SHA-256 hash)
     if api_key:
         key_hash = hash_api_key(api_key)
+        cache_key = token_cache_key("key", key_hash)
+        cached = principal_cache.get(cache_key)
+        if cached is not None:
+            return await attach(db, cached)
+        since = principal_cache.version()
         result = await db.execute(select(User).where(User.api_key_hash == key_hash, User.is_active == True))
         user = result.scalar_one_or_none()
         if user:
+            principal_cache.put(cache_key, user, since=since)
             return user
 
     # Try JWT bearer token
@@ -69,9 +112,17 @@ async def get_current_user(
         except JWTError:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
+        cache_key = token_cache_key("jwt", credentials.credentials)
+        cached = principal_cache.get(cache_key)
+        if cached is not None:
+            return await attach(db, cached)
+        since = principal_cache.version()
         result = await db.execute(select(User).where(User.username == username, User.is_active == True))
         user = result.scalar_one_or_none()
         if user:
+            # Never serve a cached principal past the token's expiry
+            exp = payload.get("exp")
+            principal_cache.put(cache_key, user, max_ttl=exp - time.time() if exp else None, since=since)
             return user
 
     raise HTTPException(
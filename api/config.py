@@ -5,6 +5,7 @@ from functools import lru_cache
 class Settings(BaseSettings):
     # Database
     database_url: str = "postgresql+asyncpg://vaultmaster:changeme@db:5432/vaultmaster"
+    auto_migrate: bool = True  # upgrade the schema on API startup (under an advisory lock)
 
     # Redis
     redis_url: str = "redis://redis:6379/0"
@@ -13,6 +14,13 @@ class Settings(BaseSettings):
     secret_key: str = "change-this-to-a-random-secret-key"
     access_token_expire_minutes: int = 1440
     algorithm: str = "HS256"
+    auth_cache_ttl_seconds: int = 60  # 0 disables the principal cache
+    auth_cache_max_entries: int = 10000
+    bcrypt_rounds: int = 12  # existing hashes are upgraded on the next login
+    password_hash_workers: int = 0  # 0 = one per CPU core
+
+    # Secret encryption: "<version>:<secret>,…", newest first (empty = derive from SECRET_KEY)
+    encryption_keys: str = ""
 
     # CORS
     allowed_origins: str = ""  # comma-separated, e.g. "https://example.com,http://localhost:3100"
@@ -22,6 +30,10 @@ class Settings(BaseSettings):
 
     # Encryption
     age_public_key: str = ""
+    age_identity_path: str = ""  # age private key used to decrypt artifacts on restore
+
+    # Plugins
+    plugin_index_path: str = "/tmp/vaultmaster/plugin-index.json"
 
     # Notifications
     smtp_host: str = ""
@@ -32,6 +44,76 @@ class Settings(BaseSettings):
     ntfy_url: str = ""
     telegram_bot_token: str = ""
     telegram_chat_id: str = ""
+    dispatch_timeout_seconds: float = 10.0  # per endpoint, for notifications and webhooks
+
+    # Outbound event queue
+    outbox_batch_size: int = 100
+    outbox_max_attempts: int = 8
+    outbox_coalesce_events: str = "run.success"  # comma-separated events sent as a digest
+    outbox_coalesce_window_seconds: int = 300  # 0 disables coalescing
+    outbox_breaker_threshold: int = 5  # consecutive failures before an endpoint is paused
+    outbox_breaker_cooldown_seconds: int = 300
+    outbox_retention_days: int = 7
+
+    # Audit log
+    audit_batch_size: int = 500
+    audit_flush_interval: float = 1.0  # seconds
+    audit_max_buffer: int = 50000  # oldest entries are dropped beyond this while the DB is unreachable
+    audit_retention_days: int = 365  # whole months older than this are dropped; 0 keeps everything
+
+    # Storage inventory
+    storage_refresh_intervals: str = "local:60,sftp:300,s3:900,b2:900,gdrive:1800,onedrive:1800"  # seconds per backend
+    storage_refresh_max_per_run: int = 20  # destinations refreshed per beat run
+    storage_cache_max_age_seconds: int = 86400  # stale entries older than this are fetched live
+    storage_warning_percent: float = 70
+    storage_critical_percent: float = 90
+
+    # Storage reconciliation
+    reconcile_full_interval_hours: int = 168  # unchanged prefixes are still listed at least this often
+    reconcile_report_limit: int = 1000  # drift entries kept per kind in a report
+    reconcile_sort_buffer_mb: int = 256  # sort spills to reconcile_tmp_dir beyond this
+    reconcile_tmp_dir: str = "/tmp/vaultmaster"
+
+    # Run leases
+    run_heartbeat_interval: int = 30  # seconds between lease renewals by the worker running a run
+    run_lease_seconds: int = 180  # a running run whose lease is this old is checked by the reaper
+
+    # Run stages
+    run_staged_retention_hours: int = 24  # staged files of a partial/failed run wait this long for a retry
+
+    # Job overlap
+    overlap_poll_seconds: int = 30  # a run waiting for its job's previous run checks again this often
+
+    # Run estimates (adaptive timeouts and ETAs)
+    run_estimate_alpha: float = 0.2  # weight of the newest run in the job's moving averages
+    run_estimate_min_samples: int = 3  # runs of history before timeouts adapt
+    run_timeout_factor: float = 3.0  # timeout = p99 duration (or p1 throughput) x this
+    run_timeout_min_seconds: int = 600
+    run_timeout_max_seconds: int = 86400
+    restore_min_throughput_bytes: int = 10 * 1024 * 1024  # restores time out after their size at this rate (or the job's p1 throughput x factor, if slower)
+
+    # Exports
+    export_batch_size: int = 5000  # rows fetched per round trip of the server-side cursor
+
+    # Catalog import (existing backups on a destination)
+    catalog_import_page_size: int = 5000  # objects per committed page
+    catalog_import_hash_concurrency: int = 4  # objects downloaded and hashed at once
+    catalog_import_egress_bytes: int = 100 * 1024 ** 3  # default download budget per pass; 0 = unlimited
+
+    # Run history
+    run_archive_after_days: int = 90  # finished runs without artifacts move to backup_run_archive (deleted artifact rows are purged); 0 disables
+    run_archive_retention_days: int = 730  # archive months older than this are dropped (daily rollups stay)
+    run_archive_batch_size: int = 5000
+
+    # Docker volume backups
+    docker_volume_parallelism: int = 2  # volumes archived at once, unless the server's meta sets max_parallel_streams
+
+    # Checksum verification
+    verify_chunk_size: int = 8 * 1024 * 1024
+    verify_hash_workers: int = 4
+    verify_concurrency_per_destination: int = 2
+    verify_nightly_egress_bytes: int = 50 * 1024 ** 3  # download budget for the nightly sample
+    verify_nightly_max_artifacts: int = 500
 
     class Config:
         env_file = ".env"
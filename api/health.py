@@ -0,0 +1,58 @@
+"""Dependency checks for the readiness endpoint."""
+
+import asyncio
+import time
+
+import redis.asyncio as aioredis
+from sqlalchemy import text
+
+from api.config import get_settings
+from api.database import engine
+
+CHECK_TIMEOUT = 3.0
+
+
+async def _check_db() -> str:
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    return "connected"
+
+
+async def _check_redis() -> str:
+    client = aioredis.from_url(get_settings().redis_url)
+    try:
+        await client.ping()
+    finally:
+        await client.aclose()
+    return "connected"
+
+
+async def _check_rclone() -> str:
+    proc = await asyncio.create_subprocess_exec(
+        "rclone", "version",
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await proc.communicate()
+    if proc.returncode != 0:
+        raise RuntimeError(stderr.decode().strip() or f"exit {proc.returncode}")
+    return stdout.decode().splitlines()[0] if stdout else "ok"
+
+
+async def _timed(check) -> dict:
+    started = time.monotonic()
+    try:
+        detail = await asyncio.wait_for(check(), timeout=CHECK_TIMEOUT)
+        ok = True
+    except asyncio.TimeoutError:
+        ok, detail = False, f"timed out after {CHECK_TIMEOUT}s"
+    except Exception as e:
+        ok, detail = False, str(e) or type(e).__name__
+    return {"ok": ok, "detail": detail, "latency_ms": round((time.monotonic() - started) * 1000, 1)}
+
+
+async def readiness() -> dict:
+    """Run all checks concurrently; each reports ok, detail and latency."""
+    names = ("database", "redis", "rclone")
+    results = await asyncio.gather(_timed(_check_db), _timed(_check_redis), _timed(_check_rclone))
+    return dict(zip(names, results))
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
@@ -10,7 +11,7 @@ from slowapi.errors import RateLimitExceeded
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from api.config import get_settings
-from api.database import engine, Base
+from api.database import engine
 from api.models import *  # noqa: F401 — register all models
 
 logger = logging.getLogger(__name__)
@@ -21,12 +22,28 @@ limiter = Limiter(key_func=get_remote_address, default_limits=["120/minute"])
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: create tables
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # Startup: derive encryption keys once (fails fast on a malformed ENCRYPTION_KEYS)
+    from api.services.encryption import load_keys
+    load_keys()
+    # Index plugins from manifests/entry points; plugin code is imported on first use
+    from api.plugins.registry import build_index
+    build_index()
+    # Schema version check (cached in Redis); migrates under a lock when behind
+    from api.schema_version import ensure_schema
+    await ensure_schema(engine)
+    # Drop cached principals when another worker changes a user
+    from api.services.auth_cache import listen_for_invalidations
+    invalidation_listener = asyncio.create_task(listen_for_invalidations())
+    # Audit entries are buffered in memory and written in batches
+    from api.services.audit import audit_writer
+    audit_writer.start()
     logger.info("VaultMaster API started")
     yield
     # Shutdown
+    invalidation_listener.cancel()
+    await audit_writer.stop()
+    from api.services.dispatch import close_http_client
+    await close_http_client()
     await engine.dispose()
     logger.info("VaultMaster API stopped")
 
@@ -71,10 +88,11 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
     allow_headers=["Authorization", "Content-Type", "X-API-Key"],
+    expose_headers=["X-Next-Cursor", "X-Total-Estimate", "X-Export-Watermark"],
 )
 
 # Register routers
-from api.routers import auth, servers, jobs, runs, artifacts, storage, retention, notifications, dashboard, audit, webhooks, users, metrics
+from api.routers import auth, servers, jobs, runs, artifacts, storage, retention, notifications, dashboard, audit, webhooks, users, exports, plugins, metrics
 
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(servers.router, prefix="/api/v1")
@@ -88,9 +106,26 @@ app.include_router(dashboard.router, prefix="/api/v1")
 app.include_router(audit.router, prefix="/api/v1")
 app.include_router(webhooks.router, prefix="/api/v1")
 app.include_router(users.router, prefix="/api/v1")
+app.include_router(exports.router, prefix="/api/v1")
+app.include_router(plugins.router, prefix="/api/v1")
 app.include_router(metrics.router, prefix="/api")
 
 
 @app.get("/api/health")
 async def health():
     return {"status": "ok", "service": "vaultmaster"}
+
+
+@app.get("/api/health/live")
+async def health_live():
+    """Liveness: the process is up and serving. Checks no dependencies."""
+    return {"status": "ok"}
+
+
+@app.get("/api/health/ready")
+async def health_ready():
+    """Readiness: database, Redis and rclone each reachable. 503 if any is not."""
+    from api.health import readiness
+    checks = await readiness()
+    ready = all(c["ok"] for c in checks.values())
+    return JSONResponse(status_code=200 if ready else 503, content={"status": "ok" if ready else "unavailable", "checks": checks})
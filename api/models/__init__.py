@@ -8,6 +8,13 @@ from api.models.notification_channel import NotificationChannel
 from api.models.user import User
 from api.models.audit_log import AuditLog
 from api.models.webhook import Webhook
+from api.models.outbox_event import OutboxEvent
+from api.models.storage_reconciliation import StorageReconciliation
+from api.models.run_log_chunk import RunLogChunk
+from api.models.backup_run_archive import BackupRunArchive
+from api.models.run_daily_rollup import RunDailyRollup
+from api.models.job_run_estimate import JobRunEstimate
+from api.models.catalog_import import CatalogImport
 
 __all__ = [
     "Server",
@@ -20,4 +27,11 @@ __all__ = [
     "User",
     "AuditLog",
     "Webhook",
+    "OutboxEvent",
+    "StorageReconciliation",
+    "RunLogChunk",
+    "BackupRunArchive",
+    "RunDailyRollup",
+    "JobRunEstimate",
+    "CatalogImport",
 ]
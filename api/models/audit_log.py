@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import String, DateTime, Text, func
+from sqlalchemy import String, DateTime, Text, Index, func
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -10,7 +10,16 @@ from api.database import Base
 
 class AuditLog(Base):
     __tablename__ = "audit_log"
+    __table_args__ = (
+        Index("ix_audit_log_created", "created_at", "id"),
+        Index("ix_audit_log_resource_type_created", "resource_type", "created_at"),
+        # text_pattern_ops lets the action prefix filter (LIKE 'server.%') use the index
+        Index("ix_audit_log_action_created", "action", "created_at", postgresql_ops={"action": "text_pattern_ops"}),
+        # Monthly partitions are managed by api.services.audit.maintain_partitions
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
+    # The partition key has to be part of the primary key
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True))
     username: Mapped[str | None] = mapped_column(String(100))
@@ -20,4 +29,4 @@ class AuditLog(Base):
     detail: Mapped[str | None] = mapped_column(Text)
     meta: Mapped[dict | None] = mapped_column(JSONB, default=dict)
     ip_address: Mapped[str | None] = mapped_column(String(45))
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True, server_default=func.now())
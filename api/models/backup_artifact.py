@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import String, DateTime, BigInteger, Boolean, ForeignKey, Text, func
+from sqlalchemy import String, DateTime, BigInteger, Boolean, ForeignKey, Index, Text, func, text
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -10,9 +10,23 @@ from api.database import Base
 
 class BackupArtifact(Base):
     __tablename__ = "backup_artifact"
+    __table_args__ = (
+        # Trigram indexes back the restore wizard's ILIKE '%q%' search (needs pg_trgm)
+        Index("ix_backup_artifact_filename_trgm", "filename", postgresql_using="gin", postgresql_ops={"filename": "gin_trgm_ops"}),
+        Index("ix_backup_artifact_db_name_trgm", "db_name", postgresql_using="gin", postgresql_ops={"db_name": "gin_trgm_ops"}),
+        Index("ix_backup_artifact_domain_trgm", "domain", postgresql_using="gin", postgresql_ops={"domain": "gin_trgm_ops"}),
+        Index("ix_backup_artifact_server_name_trgm", "server_name", postgresql_using="gin", postgresql_ops={"server_name": "gin_trgm_ops"}),
+        Index("ix_backup_artifact_tags", "tags", postgresql_using="gin"),
+        Index("ix_backup_artifact_deleted_created", "is_deleted", "created_at", "id"),
+        Index("ix_backup_artifact_storage_created", "storage_id", "created_at"),
+        # Byte-ordered path per destination: reconciliation merge-joins it with a sorted listing
+        Index("ix_backup_artifact_storage_path", "storage_id", text("ltrim(remote_path, '/') COLLATE \"C\"")),
+        # Delta exports (updated_since)
+        Index("ix_backup_artifact_updated", "updated_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    run_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("backup_run.id"), nullable=False)
+    run_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("backup_run.id"), nullable=False, index=True)
     storage_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("storage_destination.id"), nullable=False)
     filename: Mapped[str] = mapped_column(String(500), nullable=False)
     remote_path: Mapped[str] = mapped_column(String(1000), nullable=False)
@@ -27,7 +41,15 @@ class BackupArtifact(Base):
     expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     is_deleted: Mapped[bool] = mapped_column(Boolean, default=False)
     deleted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    verified_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    verify_status: Mapped[str | None] = mapped_column(String(20))  # ok, mismatch, missing, error
+    backup_level: Mapped[str | None] = mapped_column(String(20))  # full, incremental, differential; None = standalone
+    # The artifact this one was taken against (same destination); restore applies the chain from its full
+    parent_artifact_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("backup_artifact.id"), index=True,
+    )
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
     run = relationship("BackupRun", back_populates="artifacts")
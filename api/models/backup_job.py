@@ -14,7 +14,7 @@ class BackupJob(Base):
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     backup_type: Mapped[str] = mapped_column(String(50), nullable=False)  # postgresql, docker_volumes, files, do_snapshot, custom
-    server_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("server.id"), nullable=False)
+    server_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("server.id"), nullable=False, index=True)
     source_config: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
     schedule_cron: Mapped[str] = mapped_column(String(100), nullable=False)  # cron expression
     destination_ids: Mapped[list | None] = mapped_column(ARRAY(UUID(as_uuid=True)), default=list)
@@ -27,6 +27,7 @@ class BackupJob(Base):
     pre_script: Mapped[str | None] = mapped_column(String(1000))  # shell command to run before backup
     post_script: Mapped[str | None] = mapped_column(String(1000))  # shell command to run after backup
     max_retries: Mapped[int] = mapped_column(Integer, default=2)
+    overlap_policy: Mapped[str] = mapped_column(String(20), default="skip", server_default="skip")  # skip, queue_one, cancel_previous, allow
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
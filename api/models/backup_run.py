@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import String, DateTime, BigInteger, ForeignKey, Text, func
+from sqlalchemy import String, DateTime, BigInteger, Integer, ForeignKey, Index, Text, func, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -10,19 +10,47 @@ from api.database import Base
 
 class BackupRun(Base):
     __tablename__ = "backup_run"
+    __table_args__ = (
+        # Run history pages by (created_at, id), optionally per job or server
+        Index("ix_backup_run_created", "created_at", "id"),
+        Index("ix_backup_run_job_created", "job_id", "created_at", "id"),
+        Index("ix_backup_run_server_created", "server_id", "created_at", "id"),
+        # Small: only the statuses the dashboard, metrics and retries look up
+        Index(
+            "ix_backup_run_open_failed", "status", "created_at",
+            postgresql_where=text("status IN ('pending', 'running', 'failed', 'partial')"),
+        ),
+        Index("ix_backup_run_success_finished", "finished_at", postgresql_where=text("status = 'success'")),
+        # Delta exports (updated_since)
+        Index("ix_backup_run_updated", "updated_at", "id"),
+        # Redelivered task messages find their earlier run
+        Index("ix_backup_run_task_id", "task_id", postgresql_where=text("task_id IS NOT NULL")),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     job_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("backup_job.id"), nullable=False)
     server_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("server.id"), nullable=False)
-    status: Mapped[str] = mapped_column(String(50), nullable=False, default="pending")  # pending, running, success, failed, partial, cancelled
+    status: Mapped[str] = mapped_column(String(50), nullable=False, default="pending")  # pending, running, success, failed, partial, cancelled, skipped
     started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     size_bytes: Mapped[int | None] = mapped_column(BigInteger)
-    log_lines: Mapped[list | None] = mapped_column(JSONB, default=list)  # [{ts, level, msg}]
+    log_line_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")  # lines live in run_log_chunk
     error_message: Mapped[str | None] = mapped_column(Text)
-    triggered_by: Mapped[str] = mapped_column(String(50), default="scheduler")  # scheduler, manual, retry
-    retry_count: Mapped[int] = mapped_column(default=0)
+    triggered_by: Mapped[str] = mapped_column(String(50), default="scheduler")  # scheduler, manual, retry, restore, import
+    retry_count: Mapped[int] = mapped_column(default=0)  # attempt number: 0 for the first run of a trigger
+    # First incomplete stage (produce, transfer, rotate, notify, done) and what the completed ones
+    # produced; a retry resumes from here (api.services.run_stages)
+    stage: Mapped[str] = mapped_column(String(20), default="produce", server_default="produce")
+    checkpoint: Mapped[dict | None] = mapped_column(JSONB, default=dict)
+    # Set when the job's previous run was still in progress: skipped, queued, cancelled_previous, allowed
+    overlap_decision: Mapped[str | None] = mapped_column(String(20))
+    # Execution lease: the worker running it renews lease_expires_at every RUN_HEARTBEAT_INTERVAL
+    task_id: Mapped[str | None] = mapped_column(String(155))
+    worker: Mapped[str | None] = mapped_column(String(255))
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
     job = relationship("BackupJob", back_populates="runs")
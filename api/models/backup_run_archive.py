@@ -0,0 +1,38 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import String, DateTime, BigInteger, Integer, Index, Text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from api.database import Base
+
+
+class BackupRunArchive(Base):
+    """Finished runs moved out of backup_run once they are past RUN_ARCHIVE_AFTER_DAYS.
+
+    No foreign keys, so old months can be dropped as whole partitions.
+    """
+
+    __tablename__ = "backup_run_archive"
+    __table_args__ = (
+        Index("ix_backup_run_archive_created", "created_at", "id"),
+        Index("ix_backup_run_archive_job_created", "job_id", "created_at"),
+        # Monthly partitions are managed by api.services.run_history.archive_runs
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+    # The partition key has to be part of the primary key
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    job_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    server_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    status: Mapped[str] = mapped_column(String(50), nullable=False)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    size_bytes: Mapped[int | None] = mapped_column(BigInteger)
+    error_message: Mapped[str | None] = mapped_column(Text)
+    triggered_by: Mapped[str | None] = mapped_column(String(50))
+    retry_count: Mapped[int] = mapped_column(Integer, default=0)
+    log_line_count: Mapped[int] = mapped_column(Integer, default=0)  # the lines themselves are not kept
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    archived_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
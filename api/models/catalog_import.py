@@ -0,0 +1,48 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import String, DateTime, BigInteger, ForeignKey, Index, Text, func
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from api.database import Base
+
+
+class CatalogImport(Base):
+    """Ingestion of backups already on a destination into the artifact catalog (api.services.catalog_import)."""
+
+    __tablename__ = "catalog_import"
+    __table_args__ = (
+        Index("ix_catalog_import_storage_created", "storage_id", "created_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    storage_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("storage_destination.id", ondelete="CASCADE"), nullable=False,
+    )
+    # Imported artifacts are attributed to this job (and its server), through one run per backup time
+    job_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("backup_job.id", ondelete="CASCADE"), nullable=False,
+    )
+    prefix: Mapped[str] = mapped_column(String(1000), default="")  # only objects under this path
+    patterns: Mapped[list] = mapped_column(JSONB, default=list)  # [{"regex", "backup_type", "ts_format"}]
+    egress_budget_bytes: Mapped[int | None] = mapped_column(BigInteger)  # per pass; None = unlimited
+    status: Mapped[str] = mapped_column(String(20), default="pending")  # pending, running, paused, success, failed
+    # Last object path handled; a resumed import lists on from here
+    cursor: Mapped[str | None] = mapped_column(Text)
+    objects_listed: Mapped[int] = mapped_column(BigInteger, default=0)
+    imported_count: Mapped[int] = mapped_column(BigInteger, default=0)
+    existing_count: Mapped[int] = mapped_column(BigInteger, default=0)  # already in the catalog
+    unmatched_count: Mapped[int] = mapped_column(BigInteger, default=0)  # no pattern matched the path
+    failed_count: Mapped[int] = mapped_column(BigInteger, default=0)  # could not be hashed
+    # [{"path", "size", "modtime"}] of objects that could not be hashed; retried at the end of each pass
+    failed_objects: Mapped[list] = mapped_column(JSONB, default=list)
+    hashed_by_backend: Mapped[int] = mapped_column(BigInteger, default=0)
+    hashed_by_download: Mapped[int] = mapped_column(BigInteger, default=0)
+    bytes_downloaded: Mapped[int] = mapped_column(BigInteger, default=0)
+    samples: Mapped[dict] = mapped_column(JSONB, default=dict)  # {"unmatched": [...], "failed": [...]}, capped
+    error: Mapped[str | None] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
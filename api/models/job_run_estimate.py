@@ -0,0 +1,33 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, BigInteger, Integer, Float, ForeignKey, String, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from api.database import Base
+
+
+class JobRunEstimate(Base):
+    """Exponentially weighted statistics of a job's successful runs, per backup level.
+
+    Duration is that of the produce stage (the executor); throughput is that of
+    the transfer stage in bytes per second. A weekly full and the daily
+    incrementals between them are kept apart.
+    """
+
+    __tablename__ = "job_run_estimate"
+
+    job_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("backup_job.id", ondelete="CASCADE"), primary_key=True,
+    )
+    backup_level: Mapped[str] = mapped_column(String(20), primary_key=True, default="")  # "" = standalone backups
+    samples: Mapped[int] = mapped_column(Integer, default=0)
+    duration_mean: Mapped[float | None] = mapped_column(Float)  # seconds
+    duration_var: Mapped[float] = mapped_column(Float, default=0)
+    size_mean: Mapped[float | None] = mapped_column(Float)  # bytes
+    throughput_samples: Mapped[int] = mapped_column(Integer, default=0)
+    throughput_mean: Mapped[float | None] = mapped_column(Float)  # bytes/s
+    throughput_var: Mapped[float] = mapped_column(Float, default=0)
+    last_size_bytes: Mapped[int | None] = mapped_column(BigInteger)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,22 @@
+import uuid
+from datetime import date
+
+from sqlalchemy import String, Date, BigInteger, Float
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from api.database import Base
+
+
+class RunDailyRollup(Base):
+    """Per-day run counts of archived runs; outlives the archive partitions."""
+
+    __tablename__ = "run_daily_rollup"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)  # UTC
+    job_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    server_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    status: Mapped[str] = mapped_column(String(50), primary_key=True)
+    runs: Mapped[int] = mapped_column(BigInteger, default=0)
+    size_bytes: Mapped[int] = mapped_column(BigInteger, default=0)
+    duration_seconds: Mapped[float] = mapped_column(Float, default=0)
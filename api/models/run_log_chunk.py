@@ -0,0 +1,34 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, LargeBinary, ForeignKey, Index, func, text
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+from sqlalchemy.orm import Mapped, mapped_column
+
+from api.database import Base
+
+
+class RunLogChunk(Base):
+    """A block of consecutive log lines of a run, stored as zlib-compressed NDJSON.
+
+    Chunks are only ever inserted; lines first_line .. first_line + line_count - 1.
+    ``search`` holds the messages as a tsvector for full-text search across runs.
+    """
+
+    __tablename__ = "run_log_chunk"
+    __table_args__ = (
+        Index("ix_run_log_chunk_search", "search", postgresql_using="gin"),
+        Index("ix_run_log_chunk_created", "created_at"),
+        # Chunks written before search existed, until the backfill task has indexed them
+        Index("ix_run_log_chunk_unindexed", "created_at", postgresql_where=text("search IS NULL")),
+    )
+
+    run_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("backup_run.id", ondelete="CASCADE"), primary_key=True,
+    )
+    seq: Mapped[int] = mapped_column(Integer, primary_key=True)
+    first_line: Mapped[int] = mapped_column(Integer, nullable=False)
+    line_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    search: Mapped[str | None] = mapped_column(TSVECTOR)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
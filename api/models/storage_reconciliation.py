@@ -0,0 +1,36 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import String, DateTime, Integer, BigInteger, Boolean, ForeignKey, Index, Text, func
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from api.database import Base
+
+
+class StorageReconciliation(Base):
+    """One comparison of a destination's listing with its artifact catalog."""
+
+    __tablename__ = "storage_reconciliation"
+    __table_args__ = (
+        Index("ix_storage_reconciliation_storage_started", "storage_id", "started_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    storage_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("storage_destination.id", ondelete="CASCADE"), nullable=False,
+    )
+    status: Mapped[str] = mapped_column(String(20), default="running")  # running, success, failed
+    full: Mapped[bool] = mapped_column(Boolean, default=False)  # every prefix listed, watermark ignored
+    prefixes_listed: Mapped[int] = mapped_column(Integer, default=0)
+    prefixes_skipped: Mapped[int] = mapped_column(Integer, default=0)
+    objects_listed: Mapped[int] = mapped_column(BigInteger, default=0)
+    artifacts_checked: Mapped[int] = mapped_column(BigInteger, default=0)
+    missing_count: Mapped[int] = mapped_column(BigInteger, default=0)  # in the catalog, not on storage
+    orphaned_count: Mapped[int] = mapped_column(BigInteger, default=0)  # on storage, not in the catalog
+    size_mismatch_count: Mapped[int] = mapped_column(BigInteger, default=0)
+    drift: Mapped[dict] = mapped_column(JSONB, default=dict)  # sample entries per kind, capped
+    watermark: Mapped[dict] = mapped_column(JSONB, default=dict)  # per top-level prefix, read by the next run
+    error: Mapped[str | None] = mapped_column(Text)
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
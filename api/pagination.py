@@ -0,0 +1,65 @@
+"""Keyset (cursor) pagination helpers."""
+
+import base64
+import json
+import uuid
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID, *extra: int) -> str:
+    raw = json.dumps([created_at.isoformat(), str(row_id), *extra]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, extra: int = 0) -> tuple:
+    """Decode a cursor with ``extra`` trailing integers. Raises ValueError if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id, *rest = json.loads(base64.urlsafe_b64decode(padded))
+        if len(rest) != extra or not all(isinstance(v, int) for v in rest):
+            raise ValueError
+        return (datetime.fromisoformat(created_at), uuid.UUID(row_id), *rest)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def _escape_like(q: str) -> str:
+    return q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def like_pattern(q: str) -> str:
+    """Build a '%q%' pattern with LIKE wildcards in q escaped (escape char is backslash)."""
+    return f"%{_escape_like(q)}%"
+
+
+def prefix_pattern(q: str) -> str:
+    """Build a 'q%' pattern; unlike '%q%' this can use a text_pattern_ops btree index."""
+    return f"{_escape_like(q)}%"
+
+
+class _Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, query):
+        self.query = query
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.query, **kw)
+
+
+async def estimate_count(db: AsyncSession, query) -> int:
+    """Planner row estimate for a query — O(1) instead of an exact COUNT(*).
+
+    Pass the query without LIMIT, otherwise the estimate is capped by it.
+    """
+    result = await db.execute(_Explain(query))
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -16,6 +16,8 @@ Example plugin structure:
       __init__.py      # Plugin metadata
       backup.py        # BackupPlugin implementation
       manifest.json    # Plugin manifest
+
+Plugins are indexed and imported on demand by api.plugins.registry.
 """
 
 import importlib
@@ -143,7 +145,11 @@ def get_all_plugins() -> list[dict]:
 
 
 def load_plugins(plugins_dir: str | None = None):
-    """Discover and load plugins from the plugins directory."""
+    """Eagerly import every plugin in the plugins directory.
+
+    Not needed in normal operation: api.plugins.registry imports a plugin the
+    first time one of its types is used.
+    """
     if plugins_dir is None:
         plugins_dir = os.environ.get("VAULTMASTER_PLUGINS_DIR", "/app/plugins")
 
@@ -0,0 +1,259 @@
+"""Plugin index and lazy loading: plugins are imported the first time one of their keys is asked for."""
+
+import hashlib
+import importlib
+import json
+import logging
+import os
+import sys
+from importlib.metadata import entry_points
+from pathlib import Path
+
+from api.config import get_settings
+from api.plugins import (
+    BackupPlugin, StoragePlugin, NotificationPlugin,
+    register_backup_plugin, register_storage_plugin, register_notification_plugin,
+    _backup_plugins, _notification_plugins,
+)
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "vaultmaster.plugins"
+PLUGIN_TYPES = ("backup", "storage", "notification")
+
+# Built-in backup executors, resolved the same way as plugins
+BUILTIN_BACKUP_EXECUTORS = {
+    "postgresql": "api.services.backup_executor:execute_postgresql_backup",
+    "docker_volumes": "api.services.backup_executor:execute_docker_volumes_backup",
+    "files": "api.services.backup_executor:execute_files_backup",
+    "custom": "api.services.backup_executor:execute_custom_backup",
+}
+
+_index: dict | None = None
+_loaded: set[str] = set()  # plugin ids already imported
+_unindexed_loaded = False
+
+
+def plugins_dir() -> Path:
+    return Path(os.environ.get("VAULTMASTER_PLUGINS_DIR", "/app/plugins"))
+
+
+def _fingerprint(root: Path) -> str:
+    """Cheap change detector: manifest mtimes plus the mtimes of sys.path directories.
+
+    Installing or removing a package touches site-packages, which changes its mtime.
+    """
+    h = hashlib.sha256()
+    if root.is_dir():
+        h.update(f"{root}:{root.stat().st_mtime_ns}".encode())
+        for manifest in sorted(root.glob("*/manifest.json")):
+            h.update(f"{manifest}:{manifest.stat().st_mtime_ns}".encode())
+    for entry in sys.path:
+        try:
+            h.update(f"{entry}:{os.stat(entry or '.').st_mtime_ns}".encode())
+        except OSError:
+            continue
+    return h.hexdigest()
+
+
+def _scan(root: Path) -> dict:
+    """Build the index from manifests and entry-point metadata (no plugin imports).
+
+    Plugin directories describe themselves in manifest.json
+    ({"name", "version", "description", "provides": [{"type", "key", "icon"}]}); packages
+    declare "<type>:<key>" entry points in the "vaultmaster.plugins" group. Directories
+    without a manifest are listed as unindexed and imported only as a last resort.
+    """
+    plugins: dict[str, dict] = {}
+    provides: dict[str, dict[str, str]] = {t: {} for t in PLUGIN_TYPES}
+    unindexed: list[str] = []
+
+    if root.is_dir():
+        for item in sorted(root.iterdir()):
+            if not item.is_dir() or not (item / "__init__.py").exists():
+                continue
+            manifest_path = item / "manifest.json"
+            if not manifest_path.exists():
+                unindexed.append(item.name)
+                continue
+            try:
+                manifest = json.loads(manifest_path.read_text())
+            except (OSError, ValueError) as e:
+                logger.error(f"Invalid manifest for plugin {item.name}: {e}")
+                continue
+            plugin_id = f"dir:{item.name}"
+            plugins[plugin_id] = {
+                "source": "dir",
+                "module": f"{root.name}.{item.name}",
+                "name": manifest.get("name", item.name),
+                "version": manifest.get("version", ""),
+                "description": manifest.get("description", ""),
+                "provides": manifest.get("provides", []),
+            }
+            for p in manifest.get("provides", []):
+                if p.get("type") in provides and p.get("key"):
+                    provides[p["type"]][p["key"]] = plugin_id
+
+    for ep in entry_points(group=ENTRY_POINT_GROUP):
+        plugin_type, sep, key = ep.name.partition(":")
+        if not sep or plugin_type not in provides:
+            logger.error(f"Ignoring entry point {ep.name!r}: name must be '<backup|storage|notification>:<key>'")
+            continue
+        plugin_id = f"ep:{ep.name}"
+        dist = getattr(ep, "dist", None)
+        plugins[plugin_id] = {
+            "source": "entry_point",
+            "target": ep.value,
+            "name": dist.name if dist else ep.name,
+            "version": dist.version if dist else "",
+            "description": "",
+            "provides": [{"type": plugin_type, "key": key}],
+        }
+        provides[plugin_type][key] = plugin_id
+
+    return {"plugins": plugins, "provides": provides, "unindexed": unindexed}
+
+
+def build_index(force: bool = False) -> dict:
+    """Load the plugin index from the disk cache, rebuilding it if anything changed."""
+    global _index
+    root = plugins_dir()
+    cache_path = Path(get_settings().plugin_index_path)
+    fingerprint = _fingerprint(root)
+
+    if not force:
+        try:
+            cached = json.loads(cache_path.read_text())
+            if cached.get("fingerprint") == fingerprint:
+                _index = cached
+                return _index
+        except (OSError, ValueError):
+            pass
+
+    _index = {"fingerprint": fingerprint, **_scan(root)}
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(_index))
+        tmp.replace(cache_path)
+    except OSError as e:
+        logger.warning(f"Could not write plugin index cache {cache_path}: {e}")
+
+    count = len(_index["plugins"])
+    if count or _index["unindexed"]:
+        logger.info(f"Indexed {count} plugins ({len(_index['unindexed'])} without manifest)")
+    return _index
+
+
+def get_index() -> dict:
+    return _index if _index is not None else build_index()
+
+
+def _register_object(obj, plugin_type: str):
+    if isinstance(obj, type):
+        obj = obj()
+    if isinstance(obj, BackupPlugin):
+        register_backup_plugin(obj)
+    elif isinstance(obj, StoragePlugin):
+        register_storage_plugin(obj)
+    elif isinstance(obj, NotificationPlugin):
+        register_notification_plugin(obj)
+    elif callable(obj):
+        obj()  # register() hook
+    else:
+        raise TypeError(f"Entry point for {plugin_type} plugin is not a plugin or register function")
+
+
+def _import_dir_plugin(module_name: str):
+    parent = str(plugins_dir().parent)
+    if parent not in sys.path:
+        sys.path.insert(0, parent)
+    module = importlib.import_module(module_name)
+    if hasattr(module, "register"):
+        module.register()
+
+
+def _load(plugin_id: str):
+    if plugin_id in _loaded:
+        return
+    _loaded.add(plugin_id)
+    entry = get_index()["plugins"][plugin_id]
+    try:
+        if entry["source"] == "dir":
+            _import_dir_plugin(entry["module"])
+        else:
+            module_name, _, attr = entry["target"].partition(":")
+            obj = importlib.import_module(module_name)
+            for part in filter(None, attr.split(".")):
+                obj = getattr(obj, part)
+            _register_object(obj, entry["provides"][0]["type"])
+        logger.info(f"Loaded plugin: {entry['name']}")
+    except Exception as e:
+        logger.error(f"Failed to load plugin {entry['name']}: {e}")
+
+
+def _load_unindexed():
+    global _unindexed_loaded
+    if _unindexed_loaded:
+        return
+    _unindexed_loaded = True
+    root = plugins_dir()
+    for name in get_index()["unindexed"]:
+        logger.warning(f"Plugin {name} has no manifest.json; importing it to find what it provides")
+        try:
+            _import_dir_plugin(f"{root.name}.{name}")
+        except Exception as e:
+            logger.error(f"Failed to load plugin {name}: {e}")
+
+
+def _resolve(plugin_type: str, key: str, registry: dict):
+    if key in registry:
+        return registry[key]
+    plugin_id = get_index()["provides"][plugin_type].get(key)
+    if plugin_id:
+        _load(plugin_id)
+    if key not in registry:
+        _load_unindexed()
+    return registry.get(key)
+
+
+def get_backup_plugin(backup_type: str) -> BackupPlugin | None:
+    return _resolve("backup", backup_type, _backup_plugins)
+
+
+def get_notification_plugin(channel_type: str) -> NotificationPlugin | None:
+    return _resolve("notification", channel_type, _notification_plugins)
+
+
+def get_backup_executor(backup_type: str):
+    """Return an async executor(server, job, run_id) -> result dict, or None.
+
+    Built-in types resolve to api.services.backup_executor; anything else is
+    looked up in the plugin index and imported on first use.
+    """
+    target = BUILTIN_BACKUP_EXECUTORS.get(backup_type)
+    if target:
+        module_name, _, attr = target.partition(":")
+        return getattr(importlib.import_module(module_name), attr)
+
+    plugin = get_backup_plugin(backup_type)
+    if plugin is None:
+        return None
+    from api.services.backup_executor import execute_plugin_backup
+    return lambda server, job, run_id: execute_plugin_backup(plugin, server, job, run_id)
+
+
+def list_available() -> list[dict]:
+    """Everything the index knows about, loaded or not."""
+    out = [
+        {"type": "backup", "key": key, "name": key, "source": "builtin", "loaded": True}
+        for key in BUILTIN_BACKUP_EXECUTORS
+    ]
+    for plugin_id, entry in get_index()["plugins"].items():
+        for p in entry["provides"]:
+            out.append({
+                "type": p.get("type"), "key": p.get("key"), "name": entry["name"],
+                "version": entry["version"], "description": entry["description"],
+                "source": entry["source"], "loaded": plugin_id in _loaded,
+            })
+    return out
@@ -1,20 +1,23 @@
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select, desc, or_
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select, desc, or_, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 
 from api.auth import get_current_user
 from api.database import get_db
 from api.models.backup_artifact import BackupArtifact
-from api.schemas import BackupArtifactOut
+from api.models.backup_run import BackupRun
+from api.pagination import decode_cursor, encode_cursor, estimate_count, like_pattern
+from api.schemas import BackupArtifactOut, ArtifactVerifyRequest
 
 router = APIRouter(prefix="/artifacts", tags=["artifacts"], dependencies=[Depends(get_current_user)])
 
 
 @router.get("", response_model=list[BackupArtifactOut])
 async def search_artifacts(
+    response: Response,
     q: str | None = None,
     backup_type: str | None = None,
     domain: str | None = None,
@@ -22,19 +25,27 @@ async def search_artifacts(
     tags: list[str] | None = Query(None),
     from_date: datetime | None = None,
     to_date: datetime | None = None,
-    limit: int = 50,
+    limit: int = Query(default=50, ge=1, le=200),
     offset: int = 0,
+    cursor: str | None = None,
+    with_total: bool = False,
     db: AsyncSession = Depends(get_db),
 ):
-    query = select(BackupArtifact).where(BackupArtifact.is_deleted == False).order_by(desc(BackupArtifact.created_at))
+    """Search artifacts, newest first.
+
+    Pass the X-Next-Cursor response header back as ``cursor`` to page without OFFSET.
+    ``with_total`` adds an X-Total-Estimate header (planner estimate, not an exact count).
+    """
+    query = select(BackupArtifact).where(BackupArtifact.is_deleted == False)
 
     if q:
+        pattern = like_pattern(q)
         query = query.where(
             or_(
-                BackupArtifact.filename.ilike(f"%{q}%"),
-                BackupArtifact.db_name.ilike(f"%{q}%"),
-                BackupArtifact.domain.ilike(f"%{q}%"),
-                BackupArtifact.server_name.ilike(f"%{q}%"),
+                BackupArtifact.filename.ilike(pattern),
+                BackupArtifact.db_name.ilike(pattern),
+                BackupArtifact.domain.ilike(pattern),
+                BackupArtifact.server_name.ilike(pattern),
             )
         )
     if backup_type:
@@ -50,9 +61,38 @@ async def search_artifacts(
     if to_date:
         query = query.where(BackupArtifact.created_at <= to_date)
 
-    query = query.limit(limit).offset(offset)
+    if with_total:
+        total = await estimate_count(db, query.with_only_columns(BackupArtifact.id))
+        response.headers["X-Total-Estimate"] = str(total)
+
+    if cursor:
+        try:
+            cursor_created, cursor_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        query = query.where(tuple_(BackupArtifact.created_at, BackupArtifact.id) < (cursor_created, cursor_id))
+    elif offset:
+        query = query.offset(offset)
+
+    query = query.order_by(desc(BackupArtifact.created_at), desc(BackupArtifact.id)).limit(limit)
     result = await db.execute(query)
-    return result.scalars().all()
+    artifacts = result.scalars().all()
+    if len(artifacts) == limit:
+        last = artifacts[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
+    return artifacts
+
+
+@router.post("/verify")
+async def verify_artifacts(body: ArtifactVerifyRequest, db: AsyncSession = Depends(get_db)):
+    """Queue checksum verification for many artifacts at once."""
+    result = await db.execute(select(BackupArtifact.id).where(BackupArtifact.id.in_(body.artifact_ids)))
+    found = [str(a) for a in result.scalars().all()]
+    if not found:
+        raise HTTPException(status_code=404, detail="No matching artifacts")
+    from api.tasks.backup_tasks import verify_artifacts_bulk
+    task = verify_artifacts_bulk.delay(found)
+    return {"task_id": task.id, "status": "queued", "count": len(found)}
 
 
 @router.get("/{artifact_id}", response_model=BackupArtifactOut)
@@ -69,15 +109,55 @@ async def restore_artifact(
     artifact_id: uuid.UUID,
     target_server_id: uuid.UUID | None = None,
     target_db_name: str | None = None,
+    tables: list[str] | None = Query(None),
+    schemas: list[str] | None = Query(None),
+    paths: list[str] | None = Query(None),
+    target_path: str | None = None,
+    jobs: int = Query(default=1, ge=1, le=16),
     db: AsyncSession = Depends(get_db),
 ):
+    """Queue a streaming restore. Progress is logged on the returned run (see /runs/{id}/log).
+
+    tables/schemas select a subset of a custom-format dump; paths select members of a tar archive;
+    jobs > 1 runs pg_restore in parallel (custom-format dumps only).
+    """
     result = await db.execute(select(BackupArtifact).where(BackupArtifact.id == artifact_id))
     artifact = result.scalar_one_or_none()
     if not artifact:
         raise HTTPException(status_code=404, detail="Artifact not found")
+
+    from api.services.restore import detect_format
+    try:
+        fmt = detect_format(artifact)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if (tables or schemas) and fmt != "pg_custom":
+        raise HTTPException(status_code=400, detail="Table/schema selection needs a custom-format PostgreSQL dump")
+    if paths and fmt != "tar":
+        raise HTTPException(status_code=400, detail="Path selection is only supported for tar archives")
+    if jobs > 1 and fmt != "pg_custom":
+        raise HTTPException(status_code=400, detail="Parallel jobs need a custom-format PostgreSQL dump")
+
+    source_run = (await db.execute(select(BackupRun).where(BackupRun.id == artifact.run_id))).scalar_one()
+    run = BackupRun(
+        job_id=source_run.job_id,
+        server_id=target_server_id or source_run.server_id,
+        status="pending",
+        triggered_by="restore",
+    )
+    db.add(run)
+    await db.commit()
+
+    options = {"tables": tables, "schemas": schemas, "paths": paths, "target_path": target_path, "jobs": jobs}
     from api.tasks.backup_tasks import run_restore_task
-    task = run_restore_task.delay(str(artifact_id), str(target_server_id) if target_server_id else None, target_db_name)
-    return {"task_id": task.id, "status": "queued", "artifact_id": str(artifact_id)}
+    task = run_restore_task.delay(
+        str(artifact_id),
+        str(target_server_id) if target_server_id else None,
+        target_db_name,
+        str(run.id),
+        options,
+    )
+    return {"task_id": task.id, "status": "queued", "artifact_id": str(artifact_id), "run_id": str(run.id)}
 
 
 @router.post("/{artifact_id}/verify")
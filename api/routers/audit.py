@@ -1,33 +1,51 @@
-import uuid
-
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import select, desc
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select, desc, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.auth import get_current_user
 from api.database import get_db
 from api.models.audit_log import AuditLog
-from api.models.user import User
+from api.pagination import decode_cursor, encode_cursor, prefix_pattern
 
 router = APIRouter(prefix="/audit", tags=["audit"], dependencies=[Depends(get_current_user)])
 
 
 @router.get("")
 async def list_audit_logs(
+    response: Response,
     action: str | None = None,
     resource_type: str | None = None,
-    limit: int = Query(default=50, le=200),
+    limit: int = Query(default=50, ge=1, le=200),
     offset: int = 0,
+    cursor: str | None = None,
     db: AsyncSession = Depends(get_db),
 ):
+    """List audit entries, newest first.
+
+    ``action`` matches by prefix ("server" or "server.create").
+    Pass the X-Next-Cursor response header back as ``cursor`` to page without OFFSET.
+    """
     q = select(AuditLog)
     if action:
-        q = q.where(AuditLog.action.ilike(f"%{action}%"))
+        q = q.where(AuditLog.action.like(prefix_pattern(action)))
     if resource_type:
         q = q.where(AuditLog.resource_type == resource_type)
-    q = q.order_by(desc(AuditLog.created_at)).offset(offset).limit(limit)
+
+    if cursor:
+        try:
+            cursor_created, cursor_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        q = q.where(tuple_(AuditLog.created_at, AuditLog.id) < (cursor_created, cursor_id))
+    elif offset:
+        q = q.offset(offset)
+
+    q = q.order_by(desc(AuditLog.created_at), desc(AuditLog.id)).limit(limit)
     result = await db.execute(q)
     logs = result.scalars().all()
+    if len(logs) == limit:
+        last = logs[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
     return [
         {
             "id": str(l.id),
@@ -43,27 +61,3 @@ async def list_audit_logs(
         }
         for l in logs
     ]
-
-
-async def log_action(
-    db: AsyncSession,
-    action: str,
-    user: User | None = None,
-    resource_type: str | None = None,
-    resource_id: str | None = None,
-    detail: str | None = None,
-    meta: dict | None = None,
-    ip_address: str | None = None,
-):
-    """Helper to create an audit log entry."""
-    entry = AuditLog(
-        user_id=user.id if user else None,
-        username=user.username if user else None,
-        action=action,
-        resource_type=resource_type,
-        resource_id=resource_id,
-        detail=detail,
-        meta=meta or {},
-        ip_address=ip_address,
-    )
-    db.add(entry)
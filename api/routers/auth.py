@@ -6,11 +6,12 @@ from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 from api.auth import (
-    verify_password, create_access_token, hash_password,
-    get_current_user, generate_api_key,
+    verify_password_async, hash_password_async, password_needs_rehash,
+    create_access_token, get_current_user, generate_api_key,
 )
 from api.database import get_db
 from api.models.user import User
+from api.services.auth_cache import invalidate_user
 from api.schemas import (
     LoginRequest, Token, UserOut, SetupRequest, SetupStatus,
     ProfileUpdate, ChangePasswordRequest, ApiKeyOut,
@@ -46,7 +47,7 @@ async def setup(body: SetupRequest, db: AsyncSession = Depends(get_db)):
 
     admin = User(
         username=body.username,
-        hashed_password=hash_password(body.password),
+        hashed_password=await hash_password_async(body.password),
         is_active=True,
         is_admin=True,
     )
@@ -62,8 +63,10 @@ async def setup(body: SetupRequest, db: AsyncSession = Depends(get_db)):
 async def login(request: Request, body: LoginRequest, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(User).where(User.username == body.username))
     user = result.scalar_one_or_none()
-    if not user or not verify_password(body.password, user.hashed_password):
+    if not user or not await verify_password_async(body.password, user.hashed_password):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    if password_needs_rehash(user.hashed_password):
+        user.hashed_password = await hash_password_async(body.password)
     token = create_access_token(data={"sub": user.username})
     return Token(access_token=token)
 
@@ -83,6 +86,7 @@ async def update_profile(
     if body.email_addresses is not None:
         user.email_addresses = body.email_addresses
     await db.commit()
+    await invalidate_user(user.id)
     await db.refresh(user)
     return user
 
@@ -94,12 +98,13 @@ async def change_password(
     db: AsyncSession = Depends(get_db),
 ):
     """Change the current user's password."""
-    if not verify_password(body.current_password, user.hashed_password):
+    if not await verify_password_async(body.current_password, user.hashed_password):
         raise HTTPException(status_code=400, detail="Current password is incorrect")
     if len(body.new_password) < 8:
         raise HTTPException(status_code=400, detail="New password must be at least 8 characters")
-    user.hashed_password = hash_password(body.new_password)
+    user.hashed_password = await hash_password_async(body.new_password)
     await db.commit()
+    await invalidate_user(user.id)
     return {"message": "Password changed successfully"}
 
 
@@ -113,6 +118,7 @@ async def create_api_key(
     user.api_key_hash = key_hash
     user.api_key_prefix = key_prefix
     await db.commit()
+    await invalidate_user(user.id)
     return ApiKeyOut(api_key=raw_key, prefix=key_prefix)
 
 
@@ -125,4 +131,5 @@ async def revoke_api_key(
     user.api_key_hash = None
     user.api_key_prefix = None
     await db.commit()
+    await invalidate_user(user.id)
     return {"message": "API key revoked"}
@@ -1,7 +1,7 @@
 from datetime import datetime, timedelta, timezone
 
 from fastapi import APIRouter, Depends
-from sqlalchemy import select, func, desc
+from sqlalchemy import select, func, desc, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from croniter import croniter
 
@@ -13,6 +13,7 @@ from api.models.backup_run import BackupRun
 from api.models.storage_destination import StorageDestination
 from api.models.backup_artifact import BackupArtifact
 from api.schemas import DashboardOut
+from api.services.run_stages import NON_BACKUP_TRIGGERS
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"], dependencies=[Depends(get_current_user)])
 
@@ -48,13 +49,19 @@ async def get_dashboard(db: AsyncSession = Depends(get_db)):
     ]
 
     # Runs (last 24h)
-    runs_result = await db.execute(
-        select(BackupRun).where(BackupRun.created_at >= last_24h)
-    )
-    runs = runs_result.scalars().all()
-    runs_success = sum(1 for r in runs if r.status == "success")
-    runs_failed = sum(1 for r in runs if r.status == "failed")
-    success_rate = round(runs_success / len(runs) * 100, 1) if runs else 0.0
+    runs_total, runs_success, runs_failed = (await db.execute(
+        select(
+            func.count(),
+            func.count().filter(BackupRun.status == "success"),
+            func.count().filter(BackupRun.status == "failed"),
+        ).where(
+            BackupRun.created_at >= last_24h,
+            BackupRun.triggered_by.notin_(NON_BACKUP_TRIGGERS),
+            # Not started because the previous run was still going: neither success nor failure
+            BackupRun.status != "skipped",
+        )
+    )).one()
+    success_rate = round(runs_success / runs_total * 100, 1) if runs_total else 0.0
 
     # Next scheduled runs
     next_runs = []
@@ -75,7 +82,13 @@ async def get_dashboard(db: AsyncSession = Depends(get_db)):
 
     # Active runs
     active_result = await db.execute(
-        select(BackupRun).where(BackupRun.status == "running")
+        select(BackupRun)
+        .where(
+            BackupRun.status == "running",
+            # Runs of a dead worker drop out once their lease expires (the reaper then fails them)
+            or_(BackupRun.lease_expires_at >= now, BackupRun.lease_expires_at.is_(None)),
+        )
+        .order_by(BackupRun.created_at)
     )
     active_runs = [
         {
@@ -127,7 +140,7 @@ async def get_dashboard(db: AsyncSession = Depends(get_db)):
     # Last successful backup
     last_ok_result = await db.execute(
         select(BackupRun)
-        .where(BackupRun.status == "success")
+        .where(BackupRun.status == "success", BackupRun.triggered_by.notin_(NON_BACKUP_TRIGGERS))
         .order_by(desc(BackupRun.finished_at))
         .limit(1)
     )
@@ -139,13 +152,14 @@ async def get_dashboard(db: AsyncSession = Depends(get_db)):
         last_ok_iso = finished.isoformat()
         hours_since = round((now - finished).total_seconds() / 3600, 1)
 
-    # Storage warnings (>70% used)
+    # Storage warnings (STORAGE_WARNING_PERCENT / STORAGE_CRITICAL_PERCENT)
+    from api.services.storage_inventory import usage_level
     storage_warnings = []
     for s in storage_dests:
         if s.capacity_bytes and s.used_bytes:
             pct = round(s.used_bytes / s.capacity_bytes * 100, 1)
-            if pct > 70:
-                level = "critical" if pct > 90 else "warning"
+            level = usage_level(pct)
+            if level != "ok":
                 storage_warnings.append({
                     "id": str(s.id),
                     "name": s.name,
@@ -160,7 +174,7 @@ async def get_dashboard(db: AsyncSession = Depends(get_db)):
         jobs_active=jobs_active,
         jobs_total=len(jobs),
         storage_destinations=storage_info,
-        runs_24h=len(runs),
+        runs_24h=runs_total,
         runs_success_24h=runs_success,
         runs_failed_24h=runs_failed,
         success_rate=success_rate,
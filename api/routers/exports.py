@@ -0,0 +1,112 @@
+import uuid
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from api.auth import get_current_user
+from api.database import async_session
+from api.models.audit_log import AuditLog
+from api.models.backup_artifact import BackupArtifact
+from api.models.backup_run import BackupRun
+from api.pagination import prefix_pattern
+from api.services.exports import FORMATS, open_snapshot, stream_rows
+
+router = APIRouter(prefix="/exports", tags=["exports"], dependencies=[Depends(get_current_user)])
+
+ExportFormat = Literal["ndjson", "csv"]
+
+
+async def _export(query, fmt: str, name: str) -> StreamingResponse:
+    # Not get_db: the session has to outlive the handler and stay open while the body streams
+    db = async_session()
+    try:
+        watermark = await open_snapshot(db)
+    except Exception:
+        await db.close()
+        raise
+    return StreamingResponse(
+        stream_rows(db, query, fmt),
+        media_type=FORMATS[fmt],
+        headers={
+            "X-Export-Watermark": watermark.isoformat(),
+            "Content-Disposition": f'attachment; filename="{name}.{fmt}"',
+        },
+    )
+
+
+@router.get("/artifacts")
+async def export_artifacts(
+    format: ExportFormat = "ndjson",
+    updated_since: datetime | None = None,
+    storage_id: uuid.UUID | None = None,
+    backup_type: str | None = None,
+    include_deleted: bool = True,
+):
+    """Stream the artifact catalog.
+
+    Deleted artifacts are included (``is_deleted``) so a delta sync sees deletions.
+    With ``updated_since``, only artifacts changed since then, oldest change first.
+    """
+    query = select(*BackupArtifact.__table__.columns)
+    if updated_since:
+        query = query.where(BackupArtifact.updated_at >= updated_since).order_by(
+            BackupArtifact.updated_at, BackupArtifact.id,
+        )
+    if storage_id:
+        query = query.where(BackupArtifact.storage_id == storage_id)
+    if backup_type:
+        query = query.where(BackupArtifact.backup_type == backup_type)
+    if not include_deleted:
+        query = query.where(BackupArtifact.is_deleted == False)
+    return await _export(query, format, "artifacts")
+
+
+@router.get("/runs")
+async def export_runs(
+    format: ExportFormat = "ndjson",
+    updated_since: datetime | None = None,
+    job_id: uuid.UUID | None = None,
+    server_id: uuid.UUID | None = None,
+    status: str | None = None,
+):
+    """Stream run history (runs not yet archived, see RUN_ARCHIVE_AFTER_DAYS).
+
+    With ``updated_since``, only runs changed since then, oldest change first.
+    """
+    query = select(*BackupRun.__table__.columns)
+    if updated_since:
+        query = query.where(BackupRun.updated_at >= updated_since).order_by(BackupRun.updated_at, BackupRun.id)
+    if job_id:
+        query = query.where(BackupRun.job_id == job_id)
+    if server_id:
+        query = query.where(BackupRun.server_id == server_id)
+    if status:
+        query = query.where(BackupRun.status == status)
+    return await _export(query, format, "runs")
+
+
+@router.get("/audit")
+async def export_audit(
+    format: ExportFormat = "ndjson",
+    since: datetime | None = None,
+    until: datetime | None = None,
+    action: str | None = None,
+    resource_type: str | None = None,
+):
+    """Stream the audit trail, oldest first. Entries never change, so ``since`` is the delta filter.
+
+    ``since``/``until`` limit the scan to the matching monthly partitions.
+    """
+    query = select(*AuditLog.__table__.columns).order_by(AuditLog.created_at, AuditLog.id)
+    if since:
+        query = query.where(AuditLog.created_at >= since)
+    if until:
+        query = query.where(AuditLog.created_at < until)
+    if action:
+        query = query.where(AuditLog.action.like(prefix_pattern(action)))
+    if resource_type:
+        query = query.where(AuditLog.resource_type == resource_type)
+    return await _export(query, format, "audit")
@@ -1,4 +1,5 @@
 import uuid
+from typing import Literal
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
@@ -88,6 +89,27 @@ async def trigger_job(job_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
     return {"task_id": task.id, "status": "queued", "job_id": str(job_id)}
 
 
+@router.get("/{job_id}/estimate")
+async def job_estimate(
+    job_id: uuid.UUID,
+    level: Literal["full", "incremental", "differential"] | None = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """Expected duration, size and throughput of the job's runs, and the timeout they get.
+
+    File jobs with incremental backups keep one estimate per ``level``.
+    """
+    from api.services.run_estimates import as_dict, get_estimate
+
+    result = await db.execute(select(BackupJob.id).where(BackupJob.id == job_id))
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    estimate = await get_estimate(db, job_id, level)
+    await db.flush()
+    await db.refresh(estimate)
+    return as_dict(estimate)
+
+
 @router.get("/{job_id}/schedule-preview")
 async def schedule_preview(job_id: uuid.UUID, count: int = 5, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(BackupJob).where(BackupJob.id == job_id))
@@ -12,6 +12,7 @@ from api.models.backup_run import BackupRun
 from api.models.storage_destination import StorageDestination
 from api.models.backup_artifact import BackupArtifact
 from api.models.user import User
+from api.services.run_stages import NON_BACKUP_TRIGGERS
 
 router = APIRouter(tags=["metrics"])
 
@@ -32,6 +33,11 @@ async def prometheus_metrics(db: AsyncSession = Depends(get_db)):
         else:
             lines.append(f"{name} {value}")
 
+    def counter(name: str, help_text: str, value):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name} {value}")
+
     # Servers
     servers = (await db.execute(select(Server))).scalars().all()
     gauge("vaultmaster_servers_total", "Total number of servers", len(servers))
@@ -44,15 +50,38 @@ async def prometheus_metrics(db: AsyncSession = Depends(get_db)):
     gauge("vaultmaster_jobs_active", "Number of active backup jobs", sum(1 for j in jobs if j.is_active))
 
     # Runs (24h)
-    runs_24h = (await db.execute(select(BackupRun).where(BackupRun.created_at >= last_24h))).scalars().all()
-    gauge("vaultmaster_runs_24h_total", "Total runs in last 24h", len(runs_24h))
-    gauge("vaultmaster_runs_24h_success", "Successful runs in last 24h", sum(1 for r in runs_24h if r.status == "success"))
-    gauge("vaultmaster_runs_24h_failed", "Failed runs in last 24h", sum(1 for r in runs_24h if r.status == "failed"))
-    gauge("vaultmaster_runs_active", "Currently running backups", sum(1 for r in runs_24h if r.status == "running"))
+    total, success, failed = (await db.execute(
+        select(
+            func.count(),
+            func.count().filter(BackupRun.status == "success"),
+            func.count().filter(BackupRun.status == "failed"),
+        ).where(
+            BackupRun.created_at >= last_24h,
+            BackupRun.triggered_by.notin_(NON_BACKUP_TRIGGERS),
+            # Not started because the previous run was still going: neither success nor failure
+            BackupRun.status != "skipped",
+        )
+    )).one()
+    gauge("vaultmaster_runs_24h_total", "Runs in last 24h (not counting skipped runs)", total)
+    gauge("vaultmaster_runs_24h_success", "Successful runs in last 24h", success)
+    gauge("vaultmaster_runs_24h_failed", "Failed runs in last 24h", failed)
+    # All running runs with a live lease, not only those started in the last 24h
+    from api.services.run_leases import count_active
+    active = await count_active(db)
+    gauge("vaultmaster_runs_active", "Currently running backups", active)
+    # Overlap policy decisions: runs started while the job's previous run was in progress
+    from api.services.overlap import DECISIONS
+    overlaps = dict((await db.execute(
+        select(BackupRun.overlap_decision, func.count())
+        .where(BackupRun.created_at >= last_24h, BackupRun.overlap_decision.isnot(None))
+        .group_by(BackupRun.overlap_decision)
+    )).all())
+    for decision in DECISIONS:
+        gauge("vaultmaster_runs_24h_overlap", "Runs in last 24h that overlapped a previous run, by decision",
+              overlaps.get(decision, 0), {"decision": decision})
 
     # Success rate
-    success = sum(1 for r in runs_24h if r.status == "success")
-    rate = round(success / len(runs_24h) * 100, 1) if runs_24h else 0
+    rate = round(success / total * 100, 1) if total else 0
     gauge("vaultmaster_success_rate_24h", "Backup success rate in last 24h (percent)", rate)
 
     # Storage
@@ -74,4 +103,17 @@ async def prometheus_metrics(db: AsyncSession = Depends(get_db)):
     user_count = (await db.execute(select(func.count()).select_from(User))).scalar() or 0
     gauge("vaultmaster_users_total", "Total number of users", user_count)
 
+    # Auth principal cache (per API worker)
+    from api.services.auth_cache import principal_cache
+    counter("vaultmaster_auth_cache_hits_total", "Authentications served from the principal cache", principal_cache.hits)
+    counter("vaultmaster_auth_cache_misses_total", "Authentications that needed a database lookup", principal_cache.misses)
+    counter("vaultmaster_auth_cache_invalidations_total", "Principal cache invalidations applied", principal_cache.invalidations)
+    gauge("vaultmaster_auth_cache_entries", "Principals currently cached", len(principal_cache))
+
+    # Audit writer (per API worker)
+    from api.services.audit import audit_writer
+    counter("vaultmaster_audit_written_total", "Audit entries written to the database", audit_writer.written)
+    counter("vaultmaster_audit_dropped_total", "Audit entries dropped because the buffer was full", audit_writer.dropped)
+    gauge("vaultmaster_audit_buffered", "Audit entries waiting to be written", audit_writer.pending)
+
     return "\n".join(lines) + "\n"
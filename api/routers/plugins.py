@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Depends
+
+from api.auth import get_current_user
+
+router = APIRouter(prefix="/plugins", tags=["plugins"], dependencies=[Depends(get_current_user)])
+
+
+@router.get("")
+async def list_plugins(type: str | None = None):
+    """Built-in backup types and every indexed plugin, imported yet or not (``loaded``)."""
+    from api.plugins.registry import list_available
+
+    return [p for p in list_available() if type is None or p["type"] == type]
@@ -1,36 +1,101 @@
 import uuid
+from datetime import datetime
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy import select, desc
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select, desc, func, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sse_starlette.sse import EventSourceResponse
 
 from api.auth import get_current_user
 from api.database import get_db
 from api.models.backup_run import BackupRun
+from api.pagination import decode_cursor, encode_cursor
 from api.schemas import BackupRunOut
+from api.services.run_stages import NON_BACKUP_TRIGGERS, QUEUED_ATTEMPT
 
 router = APIRouter(prefix="/runs", tags=["runs"], dependencies=[Depends(get_current_user)])
 
 
 @router.get("", response_model=list[BackupRunOut])
 async def list_runs(
+    response: Response,
     status: str | None = None,
     job_id: uuid.UUID | None = None,
     server_id: uuid.UUID | None = None,
-    limit: int = 50,
+    limit: int = Query(default=50, ge=1, le=500),
     offset: int = 0,
+    cursor: str | None = None,
     db: AsyncSession = Depends(get_db),
 ):
-    query = select(BackupRun).order_by(desc(BackupRun.created_at)).limit(limit).offset(offset)
+    """List runs, newest first.
+
+    Pass the X-Next-Cursor response header back as ``cursor`` to page without OFFSET.
+    Archived runs (see RUN_ARCHIVE_AFTER_DAYS) are not included.
+    """
+    query = select(BackupRun)
     if status:
         query = query.where(BackupRun.status == status)
     if job_id:
         query = query.where(BackupRun.job_id == job_id)
     if server_id:
         query = query.where(BackupRun.server_id == server_id)
-    result = await db.execute(query)
-    return result.scalars().all()
+
+    if cursor:
+        try:
+            cursor_created, cursor_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        query = query.where(tuple_(BackupRun.created_at, BackupRun.id) < (cursor_created, cursor_id))
+    elif offset:
+        query = query.offset(offset)
+
+    query = query.order_by(desc(BackupRun.created_at), desc(BackupRun.id)).limit(limit)
+    runs = (await db.execute(query)).scalars().all()
+    if len(runs) == limit:
+        last = runs[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
+    return runs
+
+
+@router.get("/logs/search")
+async def search_run_logs(
+    response: Response,
+    q: str = Query(min_length=1, max_length=500),
+    mode: Literal["phrase", "words"] = "phrase",
+    job_id: uuid.UUID | None = None,
+    server_id: uuid.UUID | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    level: str | None = None,
+    context: int = Query(default=2, ge=0, le=20),
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """Search the logs of all runs for a phrase (or all of some words), newest first.
+
+    Each match comes with its run, job and server and ``context`` lines before and
+    after. Pass the X-Next-Cursor response header back as ``cursor`` for more.
+    """
+    from api.services.log_search import search_logs
+
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor, extra=1)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    try:
+        matches, last = await search_logs(
+            db, q, mode=mode, job_id=job_id, server_id=server_id, since=since, until=until,
+            level=level, context=context, limit=limit, cursor=after,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if last:
+        response.headers["X-Next-Cursor"] = encode_cursor(*last)
+    return matches
 
 
 @router.get("/{run_id}", response_model=BackupRunOut)
@@ -42,46 +107,142 @@ async def get_run(run_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
     return run
 
 
+@router.get("/{run_id}/progress")
+async def get_run_progress(run_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    """Live progress of a run: stage, bytes moved, rate and ETA (null once it expired)."""
+    from api.services.run_progress import get_progress
+
+    status = (await db.execute(select(BackupRun.status).where(BackupRun.id == run_id))).scalar_one_or_none()
+    if status is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    return {"status": status, "progress": await get_progress(run_id)}
+
+
+@router.get("/{run_id}/logs")
+async def get_run_logs(
+    run_id: uuid.UUID,
+    start: int = Query(default=0, ge=0),
+    limit: int = Query(default=500, ge=1, le=5000),
+    tail: int | None = Query(default=None, ge=1, le=5000),
+    db: AsyncSession = Depends(get_db),
+):
+    """Log lines of a run: ``start``/``limit`` for a range, or the last ``tail`` lines."""
+    from api.services.run_logs import read_lines
+
+    total = (await db.execute(select(BackupRun.log_line_count).where(BackupRun.id == run_id))).scalar_one_or_none()
+    if total is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    if tail is not None:
+        start, limit = max(total - tail, 0), tail
+    return {"total": total, "start": start, "lines": await read_lines(db, run_id, start, limit)}
+
+
 @router.get("/{run_id}/log")
 async def stream_run_log(run_id: uuid.UUID, request: Request, db: AsyncSession = Depends(get_db)):
-    """SSE endpoint for live log streaming."""
-    result = await db.execute(select(BackupRun).where(BackupRun.id == run_id))
-    run = result.scalar_one_or_none()
-    if not run:
+    """SSE endpoint for live log streaming. Event ids are line numbers, so reconnects resume.
+
+    ``progress`` events (no id) carry the run's live progress and ETA whenever it changes.
+    """
+    result = await db.execute(select(BackupRun.id).where(BackupRun.id == run_id))
+    if result.scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail="Run not found")
 
     import asyncio
     import json
+    import redis.asyncio as aioredis
+    from api.config import get_settings
+    from api.database import async_session
+    from api.services.run_logs import read_chunks_after
+    from api.services.run_progress import read_progress
+
+    last_event_id = request.headers.get("last-event-id", "")
+    last_line = int(last_event_id) if last_event_id.isdigit() else -1
 
     async def event_generator():
-        last_index = 0
-        while True:
-            if await request.is_disconnected():
-                break
-            # Re-fetch run to get latest log lines
-            async with get_db().__class__(bind=None) as fresh_db:
-                pass
-            # For now, return existing log lines
-            if run.log_lines and last_index < len(run.log_lines):
-                for line in run.log_lines[last_index:]:
-                    yield {"event": "log", "data": json.dumps(line)}
-                last_index = len(run.log_lines)
-            if run.status in ("success", "failed", "cancelled"):
-                yield {"event": "done", "data": json.dumps({"status": run.status, "size_bytes": run.size_bytes})}
-                break
-            await asyncio.sleep(1)
+        seq = -1
+        progress_at = None
+        redis_client = aioredis.from_url(get_settings().redis_url)
+        try:
+            while True:
+                if await request.is_disconnected():
+                    break
+                # A short-lived session per poll, so the request doesn't pin a connection
+                async with async_session() as poll_db:
+                    status, size_bytes = (await poll_db.execute(
+                        select(BackupRun.status, BackupRun.size_bytes).where(BackupRun.id == run_id)
+                    )).one()
+                    lines, seq = await read_chunks_after(poll_db, run_id, seq)
+                for line in lines:
+                    if line["n"] > last_line:
+                        yield {"event": "log", "id": str(line["n"]), "data": json.dumps(line)}
+                progress = await read_progress(redis_client, run_id)
+                if progress and progress.get("updated_at") != progress_at:
+                    progress_at = progress.get("updated_at")
+                    yield {"event": "progress", "data": json.dumps(progress)}
+                if status in ("success", "failed", "partial", "cancelled", "skipped"):
+                    yield {"event": "done", "data": json.dumps({"status": status, "size_bytes": size_bytes})}
+                    break
+                await asyncio.sleep(1)
+        finally:
+            await redis_client.aclose()
 
     return EventSourceResponse(event_generator())
 
 
 @router.post("/{run_id}/cancel")
 async def cancel_run(run_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    """Cancel a pending or running run.
+
+    A running run is cancelled by its worker, which stops its remote processes within
+    seconds; until then the run stays ``running`` (status ``cancelling`` here).
+    """
+    from api.services.cancellation import request_cancel
+
+    result = await db.execute(select(BackupRun).where(BackupRun.id == run_id))
+    run = result.scalar_one_or_none()
+    if not run:
+        raise HTTPException(status_code=404, detail="Run not found")
+    if run.status not in ("pending", "running"):
+        raise HTTPException(status_code=400, detail="Can only cancel pending or running jobs")
+    # Set for pending runs too: a worker may be starting the run right now
+    await request_cancel(run_id)
+    cancelled = (await db.execute(
+        update(BackupRun)
+        .where(BackupRun.id == run_id, BackupRun.status == "pending")
+        .values(status="cancelled", finished_at=func.now())
+        .returning(BackupRun.id)
+    )).scalar_one_or_none()
+    return {"status": "cancelled" if cancelled else "cancelling", "run_id": str(run_id)}
+
+
+@router.post("/{run_id}/retry")
+async def retry_run(run_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    """Resume a failed or partial backup at its first incomplete stage.
+
+    Files that were produced and are still staged are reused: only the
+    destinations that do not hold them yet are uploaded again.
+    """
     result = await db.execute(select(BackupRun).where(BackupRun.id == run_id))
     run = result.scalar_one_or_none()
     if not run:
         raise HTTPException(status_code=404, detail="Run not found")
-    if run.status != "running":
-        raise HTTPException(status_code=400, detail="Can only cancel running jobs")
-    run.status = "cancelled"
-    await db.flush()
-    return {"status": "cancelled", "run_id": str(run_id)}
+    if run.status not in ("failed", "partial") or run.triggered_by in NON_BACKUP_TRIGGERS:
+        raise HTTPException(status_code=400, detail="Can only retry failed or partial backups")
+    # At most one attempt queued per run: automatic retries and the reaper mark theirs too
+    attempt = run.retry_count + 1
+    queued = (await db.execute(
+        update(BackupRun)
+        .where(
+            BackupRun.id == run_id,
+            BackupRun.status.in_(("failed", "partial")),
+            ~func.coalesce(BackupRun.checkpoint, {}).has_key(QUEUED_ATTEMPT),
+        )
+        .values(checkpoint=func.coalesce(BackupRun.checkpoint, {}).op("||")({QUEUED_ATTEMPT: attempt}))
+        .returning(BackupRun.id)
+    )).scalar_one_or_none()
+    if queued is None:
+        raise HTTPException(status_code=409, detail="A retry of this run is already scheduled or running")
+    await db.commit()
+    from api.tasks.backup_tasks import run_backup_task
+    task = run_backup_task.delay(str(run.job_id), attempt=attempt, run_id=str(run_id))
+    return {"task_id": task.id, "status": "queued", "run_id": str(run_id), "stage": run.stage}
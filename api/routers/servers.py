@@ -13,6 +13,7 @@ from api.database import get_db
 from api.models.server import Server
 from api.models.user import User
 from api.schemas import ServerCreate, ServerUpdate, ServerOut
+from api.services.encryption import SERVER_SECRET_KEYS, encrypt_config, decrypt_configs
 from api.services.ssh_client import test_ssh_connection, list_remote_directory, list_remote_databases, list_remote_docker, prune_docker_volumes
 
 router = APIRouter(prefix="/servers", tags=["servers"], dependencies=[Depends(get_current_user)])
@@ -20,6 +21,12 @@ router = APIRouter(prefix="/servers", tags=["servers"], dependencies=[Depends(ge
 SSH_KEY_DIR = Path("/root/.ssh")
 
 
+def _out(servers: list[Server]) -> list[ServerOut]:
+    """Response models with secrets decrypted; the rows keep their ciphertext."""
+    metas = decrypt_configs([s.meta for s in servers])
+    return [ServerOut.model_validate(s).model_copy(update={"meta": m}) for s, m in zip(servers, metas)]
+
+
 class TestConnectionRequest(BaseModel):
     host: str
     port: int = 22
@@ -33,19 +40,20 @@ class TestConnectionRequest(BaseModel):
 @router.get("", response_model=list[ServerOut])
 async def list_servers(db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(Server).order_by(Server.name))
-    return result.scalars().all()
+    return _out(result.scalars().all())
 
 
 @router.post("", response_model=ServerOut, status_code=status.HTTP_201_CREATED)
 async def create_server(body: ServerCreate, db: AsyncSession = Depends(get_db)):
     server = Server(**body.model_dump(exclude={"api_token"}))
+    server.meta = encrypt_config(body.meta, SERVER_SECRET_KEYS)
     if body.api_token:
         from api.services.encryption import encrypt_secret
         server.api_token_encrypted = encrypt_secret(body.api_token)
     db.add(server)
     await db.flush()
     await db.refresh(server)
-    return server
+    return _out([server])[0]
 
 
 @router.post("/test-connection")
@@ -141,7 +149,7 @@ async def get_server(server_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
     server = result.scalar_one_or_none()
     if not server:
         raise HTTPException(status_code=404, detail="Server not found")
-    return server
+    return _out([server])[0]
 
 
 @router.put("/{server_id}", response_model=ServerOut)
@@ -151,13 +159,15 @@ async def update_server(server_id: uuid.UUID, body: ServerUpdate, db: AsyncSessi
     if not server:
         raise HTTPException(status_code=404, detail="Server not found")
     for key, value in body.model_dump(exclude_unset=True, exclude={"api_token"}).items():
+        if key == "meta":
+            value = encrypt_config(value, SERVER_SECRET_KEYS)
         setattr(server, key, value)
     if body.api_token is not None:
         from api.services.encryption import encrypt_secret
         server.api_token_encrypted = encrypt_secret(body.api_token)
     await db.flush()
     await db.refresh(server)
-    return server
+    return _out([server])[0]
 
 
 @router.delete("/{server_id}", status_code=status.HTTP_204_NO_CONTENT)
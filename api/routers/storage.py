@@ -10,7 +10,11 @@ from api.auth import get_current_user
 from api.config import get_settings
 from api.database import get_db
 from api.models.storage_destination import StorageDestination
-from api.schemas import StorageDestinationCreate, StorageDestinationUpdate, StorageDestinationOut
+from api.schemas import (
+    StorageDestinationCreate, StorageDestinationUpdate, StorageDestinationOut, StorageReconciliationOut,
+    CatalogImportCreate, CatalogImportOut,
+)
+from api.services.encryption import STORAGE_SECRET_KEYS, encrypt_config, decrypt_configs
 
 router = APIRouter(prefix="/storage", tags=["storage"])
 
@@ -18,6 +22,12 @@ router = APIRouter(prefix="/storage", tags=["storage"])
 _auth = Depends(get_current_user)
 
 
+def _out(dests: list[StorageDestination]) -> list[StorageDestinationOut]:
+    """Response models with secrets decrypted; the rows keep their ciphertext."""
+    configs = decrypt_configs([d.config for d in dests])
+    return [StorageDestinationOut.model_validate(d).model_copy(update={"config": c}) for d, c in zip(dests, configs)]
+
+
 # ── OAuth endpoints (callback is unauthenticated — redirect from Google/Microsoft) ──
 
 class OAuthStartRequest(BaseModel):
@@ -70,16 +80,17 @@ async def oauth_redirect_uri():
 @router.get("", response_model=list[StorageDestinationOut], dependencies=[_auth])
 async def list_storage(db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(StorageDestination).order_by(StorageDestination.name))
-    return result.scalars().all()
+    return _out(result.scalars().all())
 
 
 @router.post("", response_model=StorageDestinationOut, status_code=status.HTTP_201_CREATED, dependencies=[_auth])
 async def create_storage(body: StorageDestinationCreate, db: AsyncSession = Depends(get_db)):
     dest = StorageDestination(**body.model_dump())
+    dest.config = encrypt_config(body.config, STORAGE_SECRET_KEYS)
     db.add(dest)
     await db.flush()
     await db.refresh(dest)
-    return dest
+    return _out([dest])[0]
 
 
 @router.get("/{storage_id}", response_model=StorageDestinationOut, dependencies=[_auth])
@@ -88,12 +99,7 @@ async def get_storage(storage_id: uuid.UUID, db: AsyncSession = Depends(get_db))
     dest = result.scalar_one_or_none()
     if not dest:
         raise HTTPException(status_code=404, detail="Storage destination not found")
-    return dest
-
-
-_SECRET_CONFIG_KEYS = {
-    "secret_key", "password", "client_secret", "application_key", "app_key", "token",
-}
+    return _out([dest])[0]
 
 
 @router.put("/{storage_id}", response_model=StorageDestinationOut, dependencies=[_auth])
@@ -107,15 +113,20 @@ async def update_storage(storage_id: uuid.UUID, body: StorageDestinationUpdate,
     if "config" in data and dest.config:
         old_cfg = dict(dest.config)
         new_cfg = data["config"] or {}
-        for key in _SECRET_CONFIG_KEYS:
+        for key in STORAGE_SECRET_KEYS:
             if key in old_cfg and (not new_cfg.get(key)):
                 new_cfg[key] = old_cfg[key]
         data["config"] = new_cfg
+    if "config" in data:
+        data["config"] = encrypt_config(data["config"], STORAGE_SECRET_KEYS)
     for key, value in data.items():
         setattr(dest, key, value)
     await db.flush()
     await db.refresh(dest)
-    return dest
+    if "config" in data or "backend" in data:
+        from api.services.storage_inventory import invalidate
+        await invalidate(dest.id)
+    return _out([dest])[0]
 
 
 @router.delete("/{storage_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[_auth])
@@ -125,6 +136,8 @@ async def delete_storage(storage_id: uuid.UUID, db: AsyncSession = Depends(get_d
     if not dest:
         raise HTTPException(status_code=404, detail="Storage destination not found")
     await db.delete(dest)
+    from api.services.storage_inventory import invalidate
+    await invalidate(storage_id)
 
 
 @router.post("/{storage_id}/test", dependencies=[_auth])
@@ -139,22 +152,140 @@ async def test_storage(storage_id: uuid.UUID, db: AsyncSession = Depends(get_db)
 
 
 @router.get("/{storage_id}/usage", dependencies=[_auth])
-async def storage_usage(storage_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+async def storage_usage(storage_id: uuid.UUID, refresh: bool = False, db: AsyncSession = Depends(get_db)):
+    """Cached usage; ``stale`` means a background refresh has been queued. ``refresh`` checks live."""
     result = await db.execute(select(StorageDestination).where(StorageDestination.id == storage_id))
     dest = result.scalar_one_or_none()
     if not dest:
         raise HTTPException(status_code=404, detail="Storage destination not found")
-    from api.services.rclone_client import get_storage_usage
-    usage = await get_storage_usage(dest)
-    return usage
+    from api.services.storage_inventory import get_usage
+    return await get_usage(dest, force=refresh)
 
 
 @router.get("/{storage_id}/browse", dependencies=[_auth])
-async def browse_storage(storage_id: uuid.UUID, path: str = "/", db: AsyncSession = Depends(get_db)):
+async def browse_storage(
+    storage_id: uuid.UUID, path: str = "/", refresh: bool = False, db: AsyncSession = Depends(get_db),
+):
+    """Cached directory listing; same freshness rules as usage."""
     result = await db.execute(select(StorageDestination).where(StorageDestination.id == storage_id))
     dest = result.scalar_one_or_none()
     if not dest:
         raise HTTPException(status_code=404, detail="Storage destination not found")
-    from api.services.rclone_client import list_storage_directory
-    entries = await list_storage_directory(dest, path)
-    return {"path": path, "entries": entries}
+    from api.services.storage_inventory import get_listing
+    return await get_listing(dest, path, force=refresh)
+
+
+@router.post("/{storage_id}/reconcile", dependencies=[_auth])
+async def start_reconciliation(storage_id: uuid.UUID, full: bool = False, db: AsyncSession = Depends(get_db)):
+    """Queue a catalog/storage drift check. ``full`` lists every prefix, ignoring the watermark."""
+    result = await db.execute(select(StorageDestination.id).where(StorageDestination.id == storage_id))
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Storage destination not found")
+    from api.tasks.storage_tasks import reconcile_storage
+    task = reconcile_storage.delay(str(storage_id), full=full)
+    return {"task_id": task.id, "status": "queued"}
+
+
+@router.get("/{storage_id}/reconcile", response_model=list[StorageReconciliationOut], dependencies=[_auth])
+async def list_reconciliations(
+    storage_id: uuid.UUID, limit: int = Query(default=10, ge=1, le=100), db: AsyncSession = Depends(get_db),
+):
+    """Latest drift reports for a destination, newest first."""
+    from api.models.storage_reconciliation import StorageReconciliation
+    result = await db.execute(
+        select(StorageReconciliation)
+        .where(StorageReconciliation.storage_id == storage_id)
+        .order_by(StorageReconciliation.started_at.desc())
+        .limit(limit)
+    )
+    return result.scalars().all()
+
+
+@router.post("/{storage_id}/imports", response_model=CatalogImportOut, status_code=201, dependencies=[_auth])
+async def start_catalog_import(storage_id: uuid.UUID, data: CatalogImportCreate, db: AsyncSession = Depends(get_db)):
+    """Queue an import of the backups already on a destination into the artifact catalog.
+
+    Objects whose path matches one of ``patterns`` become artifacts of ``job_id``. Objects
+    already catalogued are skipped, so an import can be repeated safely.
+    """
+    from api.models.backup_job import BackupJob
+    from api.models.catalog_import import CatalogImport
+    from api.services.catalog_import import compile_patterns
+
+    result = await db.execute(select(StorageDestination.id).where(StorageDestination.id == storage_id))
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Storage destination not found")
+    if (await db.execute(select(BackupJob.id).where(BackupJob.id == data.job_id))).scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    patterns = [p.model_dump(exclude_none=True) for p in data.patterns] if data.patterns else []
+    try:
+        compile_patterns(patterns)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    active = (await db.execute(
+        select(CatalogImport.id).where(
+            CatalogImport.storage_id == storage_id, CatalogImport.status.in_(("pending", "running")),
+        ).limit(1)
+    )).scalar_one_or_none()
+    if active is not None:
+        raise HTTPException(status_code=409, detail=f"Import {active} of this destination is already queued or running")
+
+    budget = data.egress_budget_bytes
+    if budget is None:
+        budget = get_settings().catalog_import_egress_bytes
+    imp = CatalogImport(
+        storage_id=storage_id, job_id=data.job_id, prefix=data.prefix.strip("/"), patterns=patterns,
+        egress_budget_bytes=budget or None, status="pending",
+    )
+    db.add(imp)
+    await db.commit()
+    await db.refresh(imp)
+    from api.tasks.storage_tasks import import_catalog
+    import_catalog.delay(str(imp.id))
+    return imp
+
+
+@router.get("/{storage_id}/imports", response_model=list[CatalogImportOut], dependencies=[_auth])
+async def list_catalog_imports(
+    storage_id: uuid.UUID, limit: int = Query(default=10, ge=1, le=100), db: AsyncSession = Depends(get_db),
+):
+    """Catalog imports of a destination, newest first."""
+    from api.models.catalog_import import CatalogImport
+    result = await db.execute(
+        select(CatalogImport)
+        .where(CatalogImport.storage_id == storage_id)
+        .order_by(CatalogImport.created_at.desc())
+        .limit(limit)
+    )
+    return result.scalars().all()
+
+
+@router.post("/{storage_id}/imports/{import_id}/resume", response_model=CatalogImportOut, dependencies=[_auth])
+async def resume_catalog_import(
+    storage_id: uuid.UUID,
+    import_id: uuid.UUID,
+    egress_budget_bytes: int | None = Query(default=None, ge=0),
+    force: bool = False,
+    db: AsyncSession = Depends(get_db),
+):
+    """Continue a paused or failed import after its cursor, optionally with a new egress budget.
+
+    ``force`` also requeues an import shown as running, for when its worker died.
+    """
+    from api.models.catalog_import import CatalogImport
+    result = await db.execute(
+        select(CatalogImport).where(CatalogImport.id == import_id, CatalogImport.storage_id == storage_id)
+    )
+    imp = result.scalar_one_or_none()
+    if not imp:
+        raise HTTPException(status_code=404, detail="Import not found")
+    if imp.status == "success" or (imp.status == "running" and not force):
+        raise HTTPException(status_code=409, detail=f"Import is {imp.status}")
+    if egress_budget_bytes is not None:
+        imp.egress_budget_bytes = egress_budget_bytes or None
+    imp.status = "paused" if imp.status == "running" else imp.status
+    await db.commit()
+    await db.refresh(imp)
+    from api.tasks.storage_tasks import import_catalog
+    import_catalog.delay(str(imp.id))
+    return imp
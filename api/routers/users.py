@@ -5,9 +5,10 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
-from api.auth import get_current_user, hash_password
+from api.auth import get_current_user, hash_password_async
 from api.database import get_db
 from api.models.user import User
+from api.services.auth_cache import invalidate_user
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -79,7 +80,7 @@ async def create_user(body: UserCreate, admin: User = Depends(require_admin), db
 
     user = User(
         username=body.username,
-        hashed_password=hash_password(body.password),
+        hashed_password=await hash_password_async(body.password),
         role=body.role,
         is_admin=body.role == "admin",
         is_active=True,
@@ -119,7 +120,9 @@ async def update_user(user_id: uuid.UUID, body: UserUpdate, admin: User = Depend
     if body.email_addresses is not None:
         user.email_addresses = body.email_addresses
 
-    await db.flush()
+    # Commit before invalidating so no worker re-caches the old row
+    await db.commit()
+    await invalidate_user(user.id)
     await db.refresh(user)
     return UserListOut(
         id=user.id,
@@ -144,3 +147,5 @@ async def delete_user(user_id: uuid.UUID, admin: User = Depends(require_admin),
     if user.id == admin.id:
         raise HTTPException(status_code=400, detail="Cannot delete your own account")
     await db.delete(user)
+    await db.commit()
+    await invalidate_user(user_id)
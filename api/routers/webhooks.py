@@ -1,18 +1,15 @@
 import uuid
-import hmac
-import hashlib
-import json
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-import httpx
 
 from api.auth import get_current_user
 from api.database import get_db
 from api.models.webhook import Webhook
 from api.models.user import User
+from api.services.dispatch import send_webhook
 
 router = APIRouter(prefix="/webhooks", tags=["webhooks"], dependencies=[Depends(get_current_user)])
 
@@ -104,7 +101,7 @@ async def test_webhook(webhook_id: uuid.UUID, db: AsyncSession = Depends(get_db)
         "data": {"message": "VaultMaster webhook test"},
     }
     try:
-        status_code = await _send_webhook(wh, payload)
+        status_code = await send_webhook(wh, payload)
         wh.last_triggered = datetime.now(timezone.utc)
         wh.last_status_code = status_code
         if status_code >= 400:
@@ -115,53 +112,3 @@ async def test_webhook(webhook_id: uuid.UUID, db: AsyncSession = Depends(get_db)
         wh.failure_count += 1
         await db.flush()
         return {"success": False, "message": str(e)}
-
-
-# ── Event dispatcher ──
-VALID_EVENTS = [
-    "backup.started", "backup.completed", "backup.failed",
-    "restore.started", "restore.completed", "restore.failed",
-    "server.created", "server.deleted", "server.offline",
-    "job.created", "job.deleted", "job.triggered",
-    "storage.warning", "storage.critical",
-    "user.login", "user.created",
-]
-
-
-async def dispatch_webhook_event(db: AsyncSession, event: str, data: dict):
-    """Send event to all active webhooks subscribed to this event type."""
-    result = await db.execute(select(Webhook).where(Webhook.is_active == True))
-    webhooks = result.scalars().all()
-
-    payload = {
-        "event": event,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        "data": data,
-    }
-
-    for wh in webhooks:
-        if not wh.events or event in wh.events or "*" in wh.events:
-            try:
-                code = await _send_webhook(wh, payload)
-                wh.last_triggered = datetime.now(timezone.utc)
-                wh.last_status_code = code
-                if code >= 400:
-                    wh.failure_count += 1
-            except Exception:
-                wh.failure_count += 1
-
-
-async def _send_webhook(wh: Webhook, payload: dict) -> int:
-    """Send a single webhook request."""
-    body = json.dumps(payload)
-    headers = dict(wh.headers or {})
-    headers["Content-Type"] = "application/json"
-    headers["User-Agent"] = "VaultMaster/2.0"
-
-    if wh.secret:
-        signature = hmac.new(wh.secret.encode(), body.encode(), hashlib.sha256).hexdigest()
-        headers["X-VaultMaster-Signature"] = f"sha256={signature}"
-
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        resp = await client.post(wh.url, content=body, headers=headers)
-        return resp.status_code
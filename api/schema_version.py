@@ -0,0 +1,101 @@
+"""Startup schema check against the newest alembic revision shipped in migrations/."""
+
+import asyncio
+import logging
+from functools import lru_cache
+from pathlib import Path
+
+import redis.asyncio as aioredis
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from api.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+BASELINE_REVISION = "0001"
+MIGRATION_LOCK_ID = 0x7661756C746D  # arbitrary, shared by all workers
+CACHE_KEY = "vm:schema:verified"
+
+
+@lru_cache()
+def alembic_config() -> Config:
+    cfg = Config(str(ALEMBIC_INI))
+    cfg.set_main_option("script_location", str(ALEMBIC_INI.parent / "migrations"))
+    cfg.attributes["configure_logger"] = False
+    return cfg
+
+
+@lru_cache()
+def head_revision() -> str:
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+async def current_revision(engine: AsyncEngine) -> str | None:
+    """Revision recorded in the database; '' if tables exist without alembic, None if empty."""
+    async with engine.connect() as conn:
+        if (await conn.execute(text("SELECT to_regclass('alembic_version')"))).scalar():
+            return (await conn.execute(text("SELECT version_num FROM alembic_version"))).scalar() or ""
+        has_tables = (await conn.execute(text("SELECT to_regclass('backup_job')"))).scalar()
+        return "" if has_tables else None
+
+
+async def _cached(head: str) -> bool:
+    client = aioredis.from_url(get_settings().redis_url)
+    try:
+        return (await client.get(CACHE_KEY)) == head.encode()
+    except Exception:
+        return False
+    finally:
+        await client.aclose()
+
+
+async def _remember(head: str):
+    client = aioredis.from_url(get_settings().redis_url)
+    try:
+        await client.set(CACHE_KEY, head)
+    except Exception as e:
+        logger.warning(f"Could not cache schema version: {e}")
+    finally:
+        await client.aclose()
+
+
+async def _upgrade(engine: AsyncEngine, head: str):
+    async with engine.connect() as lock_conn:
+        await lock_conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+        try:
+            # Another worker may have finished the upgrade while we waited
+            current = await current_revision(engine)
+            if current == head:
+                return
+            cfg = alembic_config()
+            # alembic's env.py runs its own event loop, so it gets a thread of its own
+            if current == "":
+                logger.warning(f"Database has no alembic_version; stamping baseline {BASELINE_REVISION}")
+                await asyncio.to_thread(command.stamp, cfg, BASELINE_REVISION)
+            logger.info(f"Upgrading database schema from {current or 'empty'} to {head}")
+            await asyncio.to_thread(command.upgrade, cfg, "head")
+        finally:
+            await lock_conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+
+
+async def ensure_schema(engine: AsyncEngine):
+    """Make sure the database is at the code's head revision. Raises if it isn't and can't be."""
+    head = head_revision()
+    if await _cached(head):
+        return
+
+    current = await current_revision(engine)
+    if current != head:
+        if not get_settings().auto_migrate:
+            raise RuntimeError(
+                f"Database schema is at {current or 'no revision'}, this release needs {head}. "
+                "Run `alembic upgrade head` (existing pre-migration installs: `alembic stamp 0001` first)."
+            )
+        await _upgrade(engine, head)
+
+    await _remember(head)
@@ -1,5 +1,6 @@
 import uuid
 from datetime import datetime
+from typing import Literal
 from pydantic import BaseModel, Field
 
 
@@ -118,6 +119,65 @@ class StorageDestinationOut(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class StorageReconciliationOut(BaseModel):
+    id: uuid.UUID
+    storage_id: uuid.UUID
+    status: str
+    full: bool
+    prefixes_listed: int
+    prefixes_skipped: int
+    objects_listed: int
+    artifacts_checked: int
+    missing_count: int
+    orphaned_count: int
+    size_mismatch_count: int
+    drift: dict
+    error: str | None
+    started_at: datetime
+    finished_at: datetime | None
+
+    model_config = {"from_attributes": True}
+
+
+class CatalogImportPattern(BaseModel):
+    regex: str  # named groups: ts, db_name, domain, server_name, backup_type, level
+    backup_type: str | None = None  # default: the job's
+    ts_format: str | None = None  # strptime format of the ts group, default %Y%m%d_%H%M%S
+
+
+class CatalogImportCreate(BaseModel):
+    job_id: uuid.UUID
+    prefix: str = ""
+    patterns: list[CatalogImportPattern] | None = None  # default: VaultMaster's own file names
+    egress_budget_bytes: int | None = Field(default=None, ge=0)  # default CATALOG_IMPORT_EGRESS_BYTES; 0 = unlimited
+
+
+class CatalogImportOut(BaseModel):
+    id: uuid.UUID
+    storage_id: uuid.UUID
+    job_id: uuid.UUID
+    prefix: str
+    patterns: list
+    egress_budget_bytes: int | None
+    status: str
+    cursor: str | None
+    objects_listed: int
+    imported_count: int
+    existing_count: int
+    unmatched_count: int
+    failed_count: int
+    hashed_by_backend: int
+    hashed_by_download: int
+    bytes_downloaded: int
+    samples: dict
+    error: str | None
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
+
+    model_config = {"from_attributes": True}
+
+
 # ── Backup Job ──
 class BackupJobCreate(BaseModel):
     name: str
@@ -134,6 +194,7 @@ class BackupJobCreate(BaseModel):
     pre_script: str | None = None
     post_script: str | None = None
     max_retries: int = 2
+    overlap_policy: Literal["skip", "queue_one", "cancel_previous", "allow"] = "skip"  # while the previous run is in progress
 
 
 class BackupJobUpdate(BaseModel):
@@ -151,6 +212,7 @@ class BackupJobUpdate(BaseModel):
     pre_script: str | None = None
     post_script: str | None = None
     max_retries: int | None = None
+    overlap_policy: Literal["skip", "queue_one", "cancel_previous", "allow"] | None = None
 
 
 class BackupJobOut(BaseModel):
@@ -170,6 +232,7 @@ class BackupJobOut(BaseModel):
     pre_script: str | None
     post_script: str | None
     max_retries: int
+    overlap_policy: str = "skip"
     created_at: datetime
     updated_at: datetime
 
@@ -185,10 +248,15 @@ class BackupRunOut(BaseModel):
     started_at: datetime | None
     finished_at: datetime | None
     size_bytes: int | None
-    log_lines: list | None
+    log_line_count: int | None  # lines via GET /runs/{id}/logs
     error_message: str | None
     triggered_by: str
     retry_count: int
+    stage: str | None = None  # first incomplete stage: produce, transfer, rotate, notify, done
+    checkpoint: dict | None = None
+    overlap_decision: str | None = None  # skipped, queued, cancelled_previous, allowed
+    worker: str | None = None
+    heartbeat_at: datetime | None = None
     created_at: datetime
 
     model_config = {"from_attributes": True}
@@ -211,11 +279,19 @@ class BackupArtifactOut(BaseModel):
     server_name: str | None
     expires_at: datetime | None
     is_deleted: bool
+    verified_at: datetime | None = None
+    verify_status: str | None = None
+    backup_level: str | None = None
+    parent_artifact_id: uuid.UUID | None = None
     created_at: datetime
 
     model_config = {"from_attributes": True}
 
 
+class ArtifactVerifyRequest(BaseModel):
+    artifact_ids: list[uuid.UUID] = Field(min_length=1, max_length=1000)
+
+
 class ArtifactSearch(BaseModel):
     q: str | None = None
     backup_type: str | None = None
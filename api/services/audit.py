@@ -0,0 +1,121 @@
+"""Buffered audit log writer and monthly partition maintenance."""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.config import get_settings
+from api.models.audit_log import AuditLog
+from api.services.partitions import maintain_monthly_partitions
+
+logger = logging.getLogger(__name__)
+
+class AuditWriter:
+    def __init__(self, batch_size: int, flush_interval: float, max_buffer: int):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self._buffer: list[dict] = []
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self.written = 0
+        self.dropped = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def record(self, entry: dict):
+        if len(self._buffer) >= self.max_buffer:
+            # Database unreachable for a long time: keep the newest entries
+            self._buffer.pop(0)
+            self.dropped += 1
+        self._buffer.append(entry)
+        if self._wakeup is not None and len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self):
+        """Write everything buffered so far. Entries are put back if the insert fails."""
+        from api.database import async_session
+
+        while self._buffer:
+            batch, self._buffer = self._buffer[:self.batch_size], self._buffer[self.batch_size:]
+            try:
+                async with async_session() as db:
+                    # executemany with asyncpg is sent as multi-row INSERT … VALUES
+                    await db.execute(insert(AuditLog), batch)
+                    await db.commit()
+                self.written += len(batch)
+            except Exception as e:
+                logger.error(f"Audit flush of {len(batch)} entries failed: {e}")
+                self._buffer = batch + self._buffer
+                overflow = len(self._buffer) - self.max_buffer
+                if overflow > 0:
+                    del self._buffer[:overflow]
+                    self.dropped += overflow
+                return
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self):
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+_settings = get_settings()
+audit_writer = AuditWriter(
+    batch_size=_settings.audit_batch_size,
+    flush_interval=_settings.audit_flush_interval,
+    max_buffer=_settings.audit_max_buffer,
+)
+
+
+def log_action(
+    action: str,
+    user=None,
+    resource_type: str | None = None,
+    resource_id: str | None = None,
+    detail: str | None = None,
+    meta: dict | None = None,
+    ip_address: str | None = None,
+):
+    """Record an audit entry. Returns immediately; the entry is written in the next batch."""
+    audit_writer.record({
+        "id": uuid.uuid4(),
+        "user_id": user.id if user else None,
+        "username": user.username if user else None,
+        "action": action,
+        "resource_type": resource_type,
+        "resource_id": resource_id,
+        "detail": detail,
+        "meta": meta or {},
+        "ip_address": ip_address,
+        "created_at": datetime.now(timezone.utc),
+    })
+
+
+async def maintain_partitions(db: AsyncSession, months_ahead: int = 2, retention_days: int | None = None) -> dict:
+    """Create upcoming monthly partitions and drop those entirely past retention."""
+    retention_days = get_settings().audit_retention_days if retention_days is None else retention_days
+    return await maintain_monthly_partitions(db, "audit_log", months_ahead, retention_days)
@@ -0,0 +1,156 @@
+"""In-process principal cache for authentication, invalidated across workers over Redis."""
+
+import asyncio
+import hashlib
+import logging
+import time
+import uuid
+from collections import OrderedDict
+
+import redis.asyncio as aioredis
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from api.config import get_settings
+from api.models.user import User
+
+logger = logging.getLogger(__name__)
+
+INVALIDATE_CHANNEL = "vm:auth:invalidate"
+
+
+class PrincipalCache:
+    """Bounded TTL + LRU map of credential hash → user column snapshot."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, uuid.UUID, dict]] = OrderedDict()
+        self._by_user: dict[uuid.UUID, set[str]] = {}
+        # Bumped by every invalidation and clear; a lookup that started before the
+        # user's last one must not cache what it read
+        self._version = 0
+        self._user_version: dict[uuid.UUID, int] = {}
+        self._cleared_version = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> dict | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires, user_id, values = entry
+        if expires <= time.monotonic():
+            self._drop(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return values
+
+    def version(self) -> int:
+        """Taken before the database lookup and passed back to put()."""
+        return self._version
+
+    def put(self, key: str, user: User, max_ttl: float | None = None, since: int | None = None):
+        ttl = self.ttl if max_ttl is None else min(self.ttl, max_ttl)
+        if not self.enabled or ttl <= 0:
+            return
+        if since is not None and max(self._user_version.get(user.id, 0), self._cleared_version) > since:
+            # Invalidated while it was being read: the row may predate the change
+            return
+        values = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+        self._drop(key)
+        self._entries[key] = (time.monotonic() + ttl, user.id, values)
+        self._by_user.setdefault(user.id, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: uuid.UUID):
+        for key in self._by_user.pop(user_id, set()):
+            self._entries.pop(key, None)
+        self._version += 1
+        self._user_version[user_id] = self._version
+        self.invalidations += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._by_user.clear()
+        self._version += 1
+        self._cleared_version = self._version
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            keys = self._by_user.get(entry[1])
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_user[entry[1]]
+
+
+_settings = get_settings()
+principal_cache = PrincipalCache(_settings.auth_cache_max_entries, _settings.auth_cache_ttl_seconds)
+
+
+def token_cache_key(kind: str, credential: str) -> str:
+    """Cache key for a credential; API keys are passed already hashed."""
+    if kind == "jwt":
+        credential = hashlib.sha256(credential.encode()).hexdigest()
+    return f"{kind}:{credential}"
+
+
+async def attach(db: AsyncSession, values: dict) -> User:
+    """Bind a cached snapshot to the request session without querying."""
+    user = User(**{k: list(v) if isinstance(v, list) else v for k, v in values.items()})
+    make_transient_to_detached(user)
+    return await db.merge(user, load=False)
+
+
+async def invalidate_user(user_id: uuid.UUID):
+    """Drop a user's cached principals in this worker and, via Redis, in all others."""
+    principal_cache.invalidate_user(user_id)
+    client = aioredis.from_url(get_settings().redis_url)
+    try:
+        await client.publish(INVALIDATE_CHANNEL, str(user_id))
+    except Exception as e:
+        # Other workers fall back to the TTL
+        logger.warning(f"Could not publish auth cache invalidation for {user_id}: {e}")
+    finally:
+        await client.aclose()
+
+
+async def listen_for_invalidations():
+    """Apply invalidations published by other workers. Runs for the app's lifetime."""
+    while True:
+        client = aioredis.from_url(get_settings().redis_url)
+        try:
+            async with client.pubsub() as pubsub:
+                await pubsub.subscribe(INVALIDATE_CHANNEL)
+                # Anything published while we were disconnected is lost
+                principal_cache.clear()
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    try:
+                        principal_cache.invalidate_user(uuid.UUID(message["data"].decode()))
+                    except ValueError:
+                        logger.warning(f"Ignoring malformed auth invalidation: {message['data']!r}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Auth cache invalidation listener lost Redis ({e}), retrying")
+            principal_cache.clear()
+            await asyncio.sleep(5)
+        finally:
+            await client.aclose()
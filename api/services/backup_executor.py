@@ -1,13 +1,31 @@
+import asyncio
 import hashlib
+import json
 import logging
 import os
+import shlex
 import tempfile
-from datetime import datetime, timezone
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
 
-from api.services.ssh_client import run_remote_command
+from api.services.ssh_client import run_remote_command, run_work_dir
 
 logger = logging.getLogger(__name__)
 
+# GNU tar --listed-incremental snapshot files, one directory per job on the source server
+SNAPSHOT_DIR = "/var/lib/vaultmaster/snapshots"
+
+# Set per run from the job's history (api.services.run_estimates); until a job
+# has enough of it, the executors' own timeouts apply
+command_timeout: ContextVar[int | None] = ContextVar("command_timeout", default=None)
+# The level the run planned before producing (its estimate is per level); planned here otherwise
+backup_plan: ContextVar[dict | None] = ContextVar("backup_plan", default=None)
+
+
+def _timeout(default: int) -> int:
+    """Timeout for a run's long remote command (dump, archive, script)."""
+    return command_timeout.get() or default
+
 
 async def execute_postgresql_backup(server, job, run_id: str) -> dict:
     """Execute a PostgreSQL backup via pg_dump over SSH."""
@@ -21,7 +39,8 @@ async def execute_postgresql_backup(server, job, run_id: str) -> dict:
     timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
     ext = "dump" if dump_format == "custom" else "sql"
     filename = f"{db_name}_{timestamp}.{ext}.gz"
-    remote_path = f"/tmp/vaultmaster/{filename}"
+    work_dir = run_work_dir(run_id)
+    remote_path = f"{work_dir}/{filename}"
 
     logs = []
 
@@ -30,14 +49,16 @@ async def execute_postgresql_backup(server, job, run_id: str) -> dict:
         logs.append(entry)
         logger.info(f"[{run_id}] {msg}")
 
+    stopped = False
     try:
         # Ensure temp dir exists
-        await run_remote_command(server, "mkdir -p /tmp/vaultmaster")
+        await run_remote_command(server, f"mkdir -p {work_dir}")
 
         # Stop containers if configured
         if stop_containers:
             containers = " ".join(stop_containers)
             log("info", f"Stopping containers: {containers}")
+            stopped = True
             await run_remote_command(server, f"docker stop {containers}")
 
         # Run pg_dump
@@ -47,7 +68,7 @@ async def execute_postgresql_backup(server, job, run_id: str) -> dict:
             dump_cmd = f"pg_dump -U {pg_user} {db_name} | gzip -{compress_level} > {remote_path}"
 
         log("info", f"Running pg_dump for {db_name}")
-        exit_code, stdout, stderr = await run_remote_command(server, dump_cmd, timeout=3600)
+        exit_code, stdout, stderr = await run_remote_command(server, dump_cmd, timeout=_timeout(3600))
 
         if exit_code != 0:
             log("error", f"pg_dump failed: {stderr}")
@@ -64,12 +85,6 @@ async def execute_postgresql_backup(server, job, run_id: str) -> dict:
 
         log("info", f"Backup size: {size_bytes} bytes, checksum: {checksum[:16]}...")
 
-        # Restart containers
-        if stop_containers:
-            containers = " ".join(stop_containers)
-            log("info", f"Restarting containers: {containers}")
-            await run_remote_command(server, f"docker start {containers}")
-
         return {
             "success": True,
             "filename": filename,
@@ -80,74 +95,293 @@ async def execute_postgresql_backup(server, job, run_id: str) -> dict:
         }
 
     except Exception as e:
-        # Restart containers on failure
-        if stop_containers:
-            containers = " ".join(stop_containers)
-            await run_remote_command(server, f"docker start {containers}")
         log("error", str(e))
         return {"success": False, "error": str(e), "logs": logs}
+    finally:
+        # Also when the run is cancelled mid-dump
+        if stopped:
+            containers = " ".join(stop_containers)
+            log("info", f"Restarting containers: {containers}")
+            await run_remote_command(server, f"docker start {containers}")
+
+
+DOCKER_VOLUMES_DIR = "/var/lib/docker/volumes"
+
+
+async def _sh(server, command: str, timeout: int = 300) -> tuple[int, str, str]:
+    """Run a compound command in one shell, so sudo (if configured) covers all of it."""
+    return await run_remote_command(server, f"sh -c {shlex.quote(command)}", timeout=timeout)
+
+
+async def _volume_sizes(server, volumes: list[str]) -> dict[str, int]:
+    """Estimated bytes per volume (du), used to start the largest volumes first."""
+    paths = " ".join(shlex.quote(f"{DOCKER_VOLUMES_DIR}/{v}") for v in volumes)
+    _, stdout, _ = await run_remote_command(server, f"du -sb {paths}", timeout=600)
+    sizes = {}
+    for line in stdout.splitlines():
+        size, _, path = line.partition("\t")
+        if size.isdigit():
+            sizes[os.path.basename(path.rstrip("/"))] = int(size)
+    return sizes
+
+
+async def _create_volume_snapshot(server, run_id: str, config: dict) -> tuple[str, str] | None:
+    """Snapshot the filesystem holding the volumes.
+
+    Returns (path to read the volumes from, cleanup command), or None when the
+    filesystem is not btrfs, ZFS or LVM.
+    """
+    exit_code, stdout, _ = await run_remote_command(
+        server, f"findmnt -n -o FSTYPE,SOURCE,TARGET --target {DOCKER_VOLUMES_DIR}",
+    )
+    if exit_code != 0 or len(stdout.split()) < 3:
+        return None
+    fstype, source, target = stdout.split()[:3]
+    rel = os.path.relpath(DOCKER_VOLUMES_DIR, target)
+    name = f"vaultmaster-{run_id}"
+
+    if fstype == "btrfs":
+        snap = f"{target.rstrip('/')}/.{name}"
+        cmd, cleanup = f"btrfs subvolume snapshot -r {target} {snap}", f"btrfs subvolume delete {snap}"
+        path = f"{snap}/{rel}"
+    elif fstype == "zfs":
+        cmd, cleanup = f"zfs snapshot {source}@{name}", f"zfs destroy {source}@{name}"
+        path = f"{target.rstrip('/')}/.zfs/snapshot/{name}/{rel}"
+    elif source.startswith("/dev/"):
+        # lvs fails for anything that is not a logical volume
+        exit_code, stdout, _ = await run_remote_command(server, f"lvs --noheadings -o vg_name {source}")
+        vg = stdout.strip()
+        if exit_code != 0 or not vg:
+            return None
+        mount_dir = f"{run_work_dir(run_id)}/snapshot"
+        size = config.get("snapshot_size", "5G")  # copy-on-write space for changes during the backup
+        ro = "ro,nouuid" if fstype == "xfs" else "ro"
+        cmd = (
+            f"lvcreate -s -n {name} -L {shlex.quote(size)} {source} && mkdir -p {mount_dir} "
+            f"&& mount -o {ro} /dev/{vg}/{name} {mount_dir}"
+        )
+        cleanup = f"umount {mount_dir}; lvremove -f /dev/{vg}/{name}"
+        path = f"{mount_dir}/{rel}"
+    else:
+        return None
+
+    exit_code, _, stderr = await _sh(server, cmd, timeout=120)
+    if exit_code != 0:
+        await _sh(server, cleanup)
+        raise Exception(f"{fstype} snapshot failed: {stderr.strip()}")
+    return path, cleanup
 
 
 async def execute_docker_volumes_backup(server, job, run_id: str) -> dict:
-    """Backup Docker volumes via tar over SSH."""
-    config = job.source_config
-    volumes = config.get("volumes", [])
+    """Backup Docker volumes over SSH, one tar.gz artifact per volume.
+
+    Volumes are archived in parallel (largest first) up to the server's limit:
+    meta.max_parallel_streams, else DOCKER_VOLUME_PARALLELISM. source_config.consistency:
+
+    - "none" (default): read the live volumes
+    - "pause" / "stop": pause or stop the running containers using the volumes
+      for the duration of the backup, and restore them afterwards
+    - "snapshot": pause the containers only while a btrfs/ZFS/LVM snapshot is
+      taken, then read from the snapshot; falls back to "pause" elsewhere
+    """
+    from api.config import get_settings
+    from api.services.ssh_client import list_remote_docker
+
+    config = job.source_config or {}
+    consistency = config.get("consistency", "none")
     timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-    filename = f"docker_volumes_{timestamp}.tar.gz"
-    remote_path = f"/tmp/vaultmaster/{filename}"
+    work_dir = run_work_dir(run_id)
+    limit = int((server.meta or {}).get("max_parallel_streams") or get_settings().docker_volume_parallelism)
 
     logs = []
 
     def log(level: str, msg: str):
         entry = {"ts": datetime.now(timezone.utc).isoformat(), "level": level, "msg": msg}
         logs.append(entry)
+        logger.info(f"[{run_id}] {msg}")
 
-    try:
-        await run_remote_command(server, "mkdir -p /tmp/vaultmaster")
-
-        if volumes:
-            volume_paths = " ".join(f"/var/lib/docker/volumes/{v}" for v in volumes)
-        else:
-            volume_paths = "/var/lib/docker/volumes"
-
-        log("info", f"Archiving Docker volumes: {volume_paths}")
-        cmd = f"tar -czf {remote_path} {volume_paths}"
-        exit_code, stdout, stderr = await run_remote_command(server, cmd, timeout=3600)
-
-        if exit_code != 0:
-            log("error", f"tar failed: {stderr}")
-            raise Exception(f"tar failed: {stderr}")
-
-        exit_code, stdout, _ = await run_remote_command(server, f"stat -c %s {remote_path}")
-        size_bytes = int(stdout.strip()) if exit_code == 0 else 0
+    held: list[str] = []  # containers we paused or stopped
+    resume = "unpause" if consistency in ("pause", "snapshot") else "start"
+    snapshot_cleanup = None
 
-        exit_code, stdout, _ = await run_remote_command(server, f"sha256sum {remote_path}")
-        checksum = stdout.split()[0] if exit_code == 0 else ""
+    async def release():
+        nonlocal held
+        if held:
+            log("info", f"Running docker {resume} for: {' '.join(held)}")
+            exit_code, _, stderr = await run_remote_command(server, f"docker {resume} {' '.join(held)}")
+            if exit_code != 0:
+                log("error", f"docker {resume} failed: {stderr.strip()}")
+            held = []
 
-        log("info", f"Docker volumes backup complete: {size_bytes} bytes")
+    try:
+        await run_remote_command(server, f"mkdir -p {work_dir}")
+
+        docker = await list_remote_docker(server)
+        # The job form saves volume_names
+        volumes = config.get("volumes") or config.get("volume_names") or [v["name"] for v in docker["volumes"]]
+        if not volumes:
+            raise Exception(docker["error"] or "No Docker volumes found")
+
+        sizes = await _volume_sizes(server, volumes)
+        volumes = sorted(volumes, key=lambda v: sizes.get(v, 0), reverse=True)
+        log("info", f"Backing up {len(volumes)} volumes, {sum(sizes.values()):,} bytes estimated, {limit} at a time")
+
+        base = DOCKER_VOLUMES_DIR
+        if consistency in ("pause", "stop", "snapshot"):
+            running = {c["name"] for c in docker["containers"] if c.get("state") == "running"}
+            users = sorted({c for v in docker["volumes"] if v["name"] in volumes for c in v["used_by"]} & running)
+            if users:
+                action = "stop" if consistency == "stop" else "pause"
+                log("info", f"Running docker {action} for: {' '.join(users)}")
+                exit_code, _, stderr = await run_remote_command(server, f"docker {action} {' '.join(users)}", timeout=600)
+                if exit_code != 0:
+                    raise Exception(f"docker {action} failed: {stderr.strip()}")
+                held = users
+            if consistency == "snapshot":
+                snapshot = await _create_volume_snapshot(server, run_id, config)
+                if snapshot:
+                    base, snapshot_cleanup = snapshot
+                    log("info", f"Reading volumes from snapshot at {base}")
+                    await release()
+                else:
+                    log("warning", "No btrfs/ZFS/LVM snapshot support for the volumes; containers stay paused")
+
+        sem = asyncio.Semaphore(limit)
+
+        async def archive(volume: str) -> dict:
+            filename = f"docker_volume_{volume}_{timestamp}.tar.gz"
+            path = f"{work_dir}/{filename}"
+            # Member names match a plain tar of /var/lib/docker/volumes, whatever base is
+            cmd = (
+                f"tar -czf {shlex.quote(path)} -C {shlex.quote(base)} "
+                f"--transform {shlex.quote('s,^,' + DOCKER_VOLUMES_DIR.lstrip('/') + '/,')} {shlex.quote(volume)} "
+                f"&& stat -c %s {shlex.quote(path)} && sha256sum {shlex.quote(path)}"
+            )
+            async with sem:
+                started = datetime.now(timezone.utc)
+                exit_code, stdout, stderr = await _sh(server, cmd, timeout=_timeout(7200))
+            if exit_code != 0:
+                raise Exception(f"tar of volume {volume} failed: {stderr.strip()}")
+            lines = stdout.split()
+            size_bytes, checksum = int(lines[0]), lines[1]
+            elapsed = (datetime.now(timezone.utc) - started).total_seconds()
+            log("info", f"Volume {volume}: {size_bytes:,} bytes in {elapsed:.0f}s")
+            return {
+                "filename": filename,
+                "remote_path": path,
+                "size_bytes": size_bytes,
+                "checksum_sha256": checksum,
+                "volume": volume,
+            }
+
+        results = await asyncio.gather(*(archive(v) for v in volumes), return_exceptions=True)
+        errors = [str(r) for r in results if isinstance(r, Exception)]
+        if errors:
+            raise Exception("; ".join(errors))
+        files = list(results)
+
+        total = sum(f["size_bytes"] for f in files)
+        log("info", f"Docker volumes backup complete: {len(files)} artifacts, {total:,} bytes")
 
         return {
             "success": True,
-            "filename": filename,
-            "remote_path": remote_path,
-            "size_bytes": size_bytes,
-            "checksum_sha256": checksum,
+            "files": files,
+            "size_bytes": total,
             "logs": logs,
         }
 
     except Exception as e:
         log("error", str(e))
         return {"success": False, "error": str(e), "logs": logs}
+    finally:
+        if snapshot_cleanup:
+            await _sh(server, snapshot_cleanup)
+        await release()
+
+
+def snapshot_dir(job) -> str:
+    return f"{SNAPSHOT_DIR}/{job.id}"
+
+
+async def _read_chain(server, job) -> dict | None:
+    """The job's incremental chain state, or None if there is no usable level-0 snapshot."""
+    snap_dir = snapshot_dir(job)
+    exit_code, stdout, _ = await run_remote_command(
+        server, f"test -f {snap_dir}/full.snar && test -f {snap_dir}/latest.snar && cat {snap_dir}/chain.json",
+    )
+    if exit_code != 0:
+        return None
+    try:
+        chain = json.loads(stdout)
+        chain["full_at"] = datetime.fromisoformat(chain["full_at"])
+        return chain if chain.get("full_run") and chain.get("latest_run") else None
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+async def plan_backup_level(server, job) -> dict:
+    """Decide the level of the next file backup.
+
+    source_config["incremental"] is "incremental" (changes since the previous
+    backup) or "differential" (changes since the last full); anything else means
+    a full backup every time. A new full is taken every full_interval_days.
+    """
+    config = job.source_config or {}
+    mode = config.get("incremental")
+    if mode not in ("incremental", "differential"):
+        return {"level": None, "parent_run_id": None}
+
+    chain = await _read_chain(server, job)
+    full_interval = timedelta(days=int(config.get("full_interval_days", 7)))
+    if chain is None or datetime.now(timezone.utc) - chain["full_at"] >= full_interval:
+        return {"level": "full", "parent_run_id": None}
+    if mode == "differential":
+        return {"level": "differential", "parent_run_id": chain["full_run"]}
+    return {"level": "incremental", "parent_run_id": chain["latest_run"]}
+
+
+async def _commit_snapshot(server, job, run_id: str, level: str):
+    """Make this run's snapshot file the base for the next run. Only called after success."""
+    snap_dir = snapshot_dir(job)
+    work = f"{snap_dir}/{run_id}.snar"
+    if level == "differential":
+        # Differentials always start from the full's snapshot
+        await run_remote_command(server, f"rm -f {work}")
+        return
+    chain = await _read_chain(server, job) if level == "incremental" else None
+    state = {
+        "full_run": chain["full_run"] if chain else run_id,
+        "full_at": (chain["full_at"] if chain else datetime.now(timezone.utc)).isoformat(),
+        "latest_run": run_id,
+    }
+    steps = [f"cp -p {work} {snap_dir}/full.snar"] if level == "full" else []
+    steps += [
+        f"mv {work} {snap_dir}/latest.snar",
+        f"printf %s {shlex.quote(json.dumps(state))} > {snap_dir}/chain.json.tmp",
+        f"mv {snap_dir}/chain.json.tmp {snap_dir}/chain.json",
+    ]
+    exit_code, _, stderr = await run_remote_command(server, " && ".join(steps))
+    if exit_code != 0:
+        raise Exception(f"Could not save incremental snapshot: {stderr}")
+
+
+async def reset_incremental_chain(server, job):
+    """Forget the job's snapshot state so the next file backup is a full one."""
+    await run_remote_command(server, f"rm -f {snapshot_dir(job)}/chain.json")
 
 
 async def execute_files_backup(server, job, run_id: str) -> dict:
-    """Backup files/directories via tar over SSH."""
+    """Backup files/directories via tar over SSH.
+
+    With source_config["incremental"] set, GNU tar --listed-incremental ships
+    only what changed since the previous (incremental) or last full
+    (differential) backup. The result carries backup_level and parent_run_id so
+    the artifacts can be chained.
+    """
     config = job.source_config
     paths = config.get("paths", [])
     excludes = config.get("excludes", [])
     timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-    filename = f"files_{timestamp}.tar.gz"
-    remote_path = f"/tmp/vaultmaster/{filename}"
 
     logs = []
 
@@ -155,15 +389,37 @@ async def execute_files_backup(server, job, run_id: str) -> dict:
         entry = {"ts": datetime.now(timezone.utc).isoformat(), "level": level, "msg": msg}
         logs.append(entry)
 
+    plan = {"level": None, "parent_run_id": None}
+    work_snar = f"{snapshot_dir(job)}/{run_id}.snar"
+    work_dir = run_work_dir(run_id)
     try:
-        await run_remote_command(server, "mkdir -p /tmp/vaultmaster")
+        await run_remote_command(server, f"mkdir -p {work_dir}")
+
+        plan = backup_plan.get() or await plan_backup_level(server, job)
+        level = plan["level"]
+        filename = f"files_{level}_{timestamp}.tar.gz" if level else f"files_{timestamp}.tar.gz"
+        remote_path = f"{work_dir}/{filename}"
+
+        incremental_flag = ""
+        if level:
+            snap_dir = snapshot_dir(job)
+            if level == "full":
+                prepare = f"mkdir -p {snap_dir} && rm -f {work_snar}"
+            else:
+                base = "full.snar" if level == "differential" else "latest.snar"
+                prepare = f"cp -p {snap_dir}/{base} {work_snar}"
+            exit_code, _, stderr = await run_remote_command(server, prepare)
+            if exit_code != 0:
+                raise Exception(f"Could not prepare incremental snapshot: {stderr}")
+            incremental_flag = f"--listed-incremental={work_snar}"
+            log("info", f"Backup level: {level}" + (f" (parent run {plan['parent_run_id']})" if plan["parent_run_id"] else ""))
 
         exclude_flags = " ".join(f"--exclude='{e}'" for e in excludes)
         path_str = " ".join(paths)
-        cmd = f"tar -czf {remote_path} {exclude_flags} {path_str}"
+        cmd = f"tar -czf {remote_path} {incremental_flag} {exclude_flags} {path_str}"
 
         log("info", f"Archiving files: {path_str}")
-        exit_code, stdout, stderr = await run_remote_command(server, cmd, timeout=7200)
+        exit_code, stdout, stderr = await run_remote_command(server, cmd, timeout=_timeout(7200))
 
         if exit_code != 0 and exit_code != 1:  # tar returns 1 for "file changed during read"
             log("error", f"tar failed: {stderr}")
@@ -175,6 +431,9 @@ async def execute_files_backup(server, job, run_id: str) -> dict:
         exit_code, stdout, _ = await run_remote_command(server, f"sha256sum {remote_path}")
         checksum = stdout.split()[0] if exit_code == 0 else ""
 
+        if level:
+            await _commit_snapshot(server, job, run_id, level)
+
         log("info", f"File backup complete: {size_bytes} bytes")
 
         return {
@@ -183,10 +442,14 @@ async def execute_files_backup(server, job, run_id: str) -> dict:
             "remote_path": remote_path,
             "size_bytes": size_bytes,
             "checksum_sha256": checksum,
+            "backup_level": level,
+            "parent_run_id": plan["parent_run_id"],
             "logs": logs,
         }
 
     except Exception as e:
+        if plan["level"]:
+            await run_remote_command(server, f"rm -f {work_snar}")
         log("error", str(e))
         return {"success": False, "error": str(e), "logs": logs}
 
@@ -206,7 +469,7 @@ async def execute_custom_backup(server, job, run_id: str) -> dict:
 
     try:
         log("info", f"Running custom script")
-        exit_code, stdout, stderr = await run_remote_command(server, script, timeout=7200)
+        exit_code, stdout, stderr = await run_remote_command(server, script, timeout=_timeout(7200))
 
         if exit_code != 0:
             log("error", f"Script failed (exit {exit_code}): {stderr}")
@@ -227,3 +490,48 @@ async def execute_custom_backup(server, job, run_id: str) -> dict:
     except Exception as e:
         log("error", str(e))
         return {"success": False, "error": str(e), "logs": logs}
+
+
+async def execute_plugin_backup(plugin, server, job, run_id: str) -> dict:
+    """Run a BackupPlugin and describe its artifact like the built-in executors do."""
+    config = job.source_config or {}
+    work_dir = run_work_dir(run_id)
+    logs = []
+
+    def log(level: str, msg: str):
+        entry = {"ts": datetime.now(timezone.utc).isoformat(), "level": level, "msg": msg}
+        logs.append(entry)
+        logger.info(f"[{run_id}] {msg}")
+
+    try:
+        ok, message = await plugin.validate_config(config)
+        if not ok:
+            raise Exception(f"Invalid configuration for {plugin.name}: {message}")
+
+        await run_remote_command(server, f"mkdir -p {work_dir}")
+        log("info", f"Running {plugin.name} plugin backup")
+        success, message, artifact_path = await plugin.run_backup(server, config, work_dir)
+        if not success:
+            raise Exception(message)
+        log("info", message)
+
+        size_bytes, checksum = 0, ""
+        if artifact_path:
+            exit_code, stdout, _ = await run_remote_command(server, f"stat -c %s {artifact_path}")
+            size_bytes = int(stdout.strip()) if exit_code == 0 else 0
+            exit_code, stdout, _ = await run_remote_command(server, f"sha256sum {artifact_path}")
+            checksum = stdout.split()[0] if exit_code == 0 else ""
+            log("info", f"Backup size: {size_bytes} bytes, checksum: {checksum[:16]}...")
+
+        return {
+            "success": True,
+            "filename": os.path.basename(artifact_path) if artifact_path else f"{plugin.backup_type}_backup",
+            "remote_path": artifact_path or "",
+            "size_bytes": size_bytes,
+            "checksum_sha256": checksum,
+            "logs": logs,
+        }
+
+    except Exception as e:
+        log("error", str(e))
+        return {"success": False, "error": str(e), "logs": logs}
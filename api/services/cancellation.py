@@ -0,0 +1,95 @@
+"""Run cancellation: a Redis flag the worker polls, then signals the run's remote process groups."""
+
+import asyncio
+import logging
+import shlex
+
+import redis.asyncio as aioredis
+
+from api.config import get_settings
+from api.services.ssh_client import current_run_id, kill_run_processes, run_pid_dir, run_remote_command, run_work_dir
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 1.0
+CANCEL_GRACE_SECONDS = 15
+CANCEL_TTL = 86400
+
+
+class RunCancelled(Exception):
+    pass
+
+
+def cancel_key(run_id) -> str:
+    return f"vm:run:{run_id}:cancel"
+
+
+async def request_cancel(run_id):
+    client = aioredis.from_url(get_settings().redis_url)
+    try:
+        await client.set(cancel_key(run_id), 1, ex=CANCEL_TTL)
+    finally:
+        await client.aclose()
+
+
+async def run_cancellable(server, run_id, coro):
+    """Await coro (an executor call for run_id) and stop it when the run is cancelled.
+
+    Raises RunCancelled once the work has been stopped.
+    """
+    # The task copies the context here, so every remote command it runs is recorded for the run
+    token = current_run_id.set(str(run_id))
+    try:
+        task = asyncio.ensure_future(coro)
+    finally:
+        current_run_id.reset(token)
+
+    client = aioredis.from_url(get_settings().redis_url)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=POLL_INTERVAL)
+            if done:
+                return task.result()
+            if await client.exists(cancel_key(run_id)):
+                break
+
+        await client.delete(cancel_key(run_id))
+        logger.info(f"Cancelling run {run_id}")
+        await kill_run_processes(server, run_id)
+        done, _ = await asyncio.wait({task}, timeout=CANCEL_GRACE_SECONDS)
+        if not done:
+            task.cancel()
+        # Let the executor's finally blocks finish; its result no longer matters
+        await asyncio.gather(task, return_exceptions=True)
+        raise RunCancelled(f"Run {run_id} was cancelled")
+    finally:
+        if not task.done():
+            task.cancel()
+        await client.aclose()
+
+
+async def check_cancelled(run_id):
+    """Raise RunCancelled if the run was cancelled. For stages with no remote processes to stop (rotation)."""
+    client = aioredis.from_url(get_settings().redis_url)
+    try:
+        if await client.delete(cancel_key(run_id)):
+            raise RunCancelled(f"Run {run_id} was cancelled")
+    finally:
+        await client.aclose()
+
+
+async def clear_cancel(run_id):
+    """Drop a cancel request that arrived after the run's last check, so a retry of the run does not see it."""
+    client = aioredis.from_url(get_settings().redis_url)
+    try:
+        await client.delete(cancel_key(run_id))
+    finally:
+        await client.aclose()
+
+
+async def cleanup_run(server, run_id, keep_staged: bool = False):
+    """Remove the run's pid directory and, unless its artifacts live there, its staging directory."""
+    paths = [run_pid_dir(run_id)] + ([] if keep_staged else [run_work_dir(run_id)])
+    exit_code, _, stderr = await run_remote_command(server, f"rm -rf {' '.join(shlex.quote(p) for p in paths)}")
+    if exit_code != 0:
+        logger.warning(f"Cleanup of run {run_id} on {server.name} failed: {stderr.strip()}")
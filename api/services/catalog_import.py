@@ -0,0 +1,441 @@
+"""Bulk import of backups already on a destination into the artifact catalog."""
+
+import asyncio
+import copy
+import logging
+import posixpath
+import re
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+
+from sqlalchemy import select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.config import get_settings
+from api.models.backup_artifact import BackupArtifact
+from api.models.backup_job import BackupJob
+from api.models.catalog_import import CatalogImport
+from api.models.server import Server
+from api.models.storage_destination import StorageDestination
+from api.services.reconciliation import artifact_key, sorted_lines, top_level
+from api.services.verification import EgressBudget, hash_object
+
+logger = logging.getLogger(__name__)
+
+GROUPS = ("ts", "db_name", "domain", "server_name", "backup_type", "level")
+LEVELS = ("full", "incremental", "differential")
+DEFAULT_TS_FORMAT = "%Y%m%d_%H%M%S"
+
+# What VaultMaster itself writes (api.services.backup_executor)
+DEFAULT_PATTERNS = [
+    {"regex": r"(?:^|/)docker_volume_[^/]+_(?P<ts>\d{8}_\d{6})\.tar\.gz(?:\.age)?$", "backup_type": "docker_volumes"},
+    {
+        "regex": r"(?:^|/)files_(?:(?P<level>full|incremental|differential)_)?(?P<ts>\d{8}_\d{6})\.tar\.gz(?:\.age)?$",
+        "backup_type": "files",
+    },
+    {"regex": r"(?:^|/)(?P<db_name>[^/]+)_(?P<ts>\d{8}_\d{6})\.(?:dump|sql)\.gz(?:\.age)?$", "backup_type": "postgresql"},
+]
+
+# Run ids of imported backups: uuid5(namespace, "job_id:backup time")
+RUN_NAMESPACE = uuid.UUID("6f1c2d0e-4a7b-5c39-9e12-8d4f3b6a1c57")
+
+_LIST_FORMAT = "psth"
+_HASH_ARGS = ("--hash", "SHA256")
+_SHA256 = re.compile(r"^[0-9a-f]{64}$")
+
+_STAGE_COLUMNS = [
+    "id", "run_id", "created_at", "filename", "remote_path", "size_bytes", "checksum_sha256",
+    "is_encrypted", "backup_type", "tags", "domain", "db_name", "server_name", "backup_level",
+]
+
+_CREATE_STAGE = text("""
+    CREATE TEMP TABLE catalog_import_stage (
+        id uuid, run_id uuid, created_at timestamptz, filename text, remote_path text, size_bytes bigint,
+        checksum_sha256 text, is_encrypted boolean, backup_type text, tags text[], domain text, db_name text,
+        server_name text, backup_level text
+    ) ON COMMIT DROP
+""")
+
+# Another import, or a backup, may have catalogued a path since the page was checked
+_DROP_CATALOGUED = text("""
+    DELETE FROM catalog_import_stage s USING backup_artifact a
+    WHERE a.storage_id = CAST(:storage_id AS uuid)
+      AND ltrim(a.remote_path, '/') COLLATE "C" = s.remote_path COLLATE "C"
+""")
+
+# Pages of one backup time, and its copies on other destinations, share the run
+_INSERT_RUNS = text("""
+    INSERT INTO backup_run (
+        id, job_id, server_id, status, started_at, finished_at, size_bytes, triggered_by, retry_count,
+        stage, checkpoint, log_line_count, created_at
+    )
+    SELECT run_id, CAST(:job_id AS uuid), CAST(:server_id AS uuid), 'success', min(created_at), min(created_at),
+           0, 'import', 0, 'done', jsonb_build_object('import_id', CAST(:import_id AS text)), 0,
+           min(created_at)
+    FROM catalog_import_stage
+    GROUP BY run_id
+    ON CONFLICT (id) DO NOTHING
+""")
+
+# A run's size is that of one copy: the largest of its destinations
+_RUN_SIZES = text("""
+    UPDATE backup_run r SET size_bytes = s.size_bytes, updated_at = now()
+    FROM (
+        SELECT run_id, max(total) AS size_bytes FROM (
+            SELECT run_id, sum(size_bytes) AS total FROM backup_artifact
+            WHERE run_id IN (SELECT run_id FROM catalog_import_stage) AND is_deleted = false
+            GROUP BY run_id, storage_id
+        ) per_destination
+        GROUP BY run_id
+    ) s
+    WHERE r.id = s.run_id
+""")
+
+_INSERT_ARTIFACTS = text("""
+    INSERT INTO backup_artifact (
+        id, run_id, storage_id, filename, remote_path, size_bytes, checksum_sha256, is_encrypted, backup_type,
+        tags, domain, db_name, server_name, backup_level, is_deleted, created_at
+    )
+    SELECT id, run_id, CAST(:storage_id AS uuid), filename, remote_path, size_bytes, checksum_sha256, is_encrypted,
+           backup_type, tags, domain, db_name, server_name, backup_level, false, created_at
+    FROM catalog_import_stage
+""")
+
+# Imported incrementals and differentials of the job on the destination get their parent:
+# the latest full (differential) or full/incremental (incremental) before them
+_LINK_CHAINS = text("""
+    UPDATE backup_artifact a SET updated_at = now(), parent_artifact_id = (
+        SELECT p.id FROM backup_artifact p JOIN backup_run pr ON pr.id = p.run_id
+        WHERE pr.job_id = r.job_id AND p.storage_id = a.storage_id AND p.is_deleted = false
+          AND p.backup_type = a.backup_type AND p.created_at < a.created_at
+          AND (p.backup_level = 'full' OR (a.backup_level = 'incremental' AND p.backup_level = 'incremental'))
+        ORDER BY p.created_at DESC, p.id DESC
+        LIMIT 1
+    )
+    FROM backup_run r
+    WHERE r.id = a.run_id AND r.job_id = CAST(:job_id AS uuid) AND r.triggered_by = 'import'
+      AND a.storage_id = CAST(:storage_id AS uuid) AND a.is_deleted = false
+      AND a.backup_level IN ('incremental', 'differential') AND a.parent_artifact_id IS NULL
+""")
+
+# Imported incrementals and differentials with no full before them cannot be restored as part of
+# a chain: catalogue them as standalone backups. Runs before _LINK_CHAINS.
+_UNCHAINED = text("""
+    UPDATE backup_artifact a SET backup_level = NULL, updated_at = now()
+    FROM backup_run r
+    WHERE r.id = a.run_id AND r.job_id = CAST(:job_id AS uuid) AND r.triggered_by = 'import'
+      AND a.storage_id = CAST(:storage_id AS uuid) AND a.is_deleted = false
+      AND a.backup_level IN ('incremental', 'differential') AND a.parent_artifact_id IS NULL
+      AND NOT EXISTS (
+          SELECT 1 FROM backup_artifact p JOIN backup_run pr ON pr.id = p.run_id
+          WHERE pr.job_id = r.job_id AND p.storage_id = a.storage_id AND p.is_deleted = false
+            AND p.backup_type = a.backup_type AND p.backup_level = 'full' AND p.created_at < a.created_at
+      )
+""")
+
+
+def compile_patterns(patterns: list[dict]) -> list[tuple[re.Pattern, dict]]:
+    """Compile an import's patterns. Raises ValueError for a bad regex or an unknown group name."""
+    compiled = []
+    for spec in patterns:
+        try:
+            regex = re.compile(spec["regex"])
+        except (KeyError, TypeError, re.error) as e:
+            raise ValueError(f"Invalid pattern {spec!r}: {e}")
+        unknown = set(regex.groupindex) - set(GROUPS)
+        if unknown:
+            raise ValueError(f"Unknown groups in {spec['regex']!r}: {', '.join(sorted(unknown))}")
+        compiled.append((regex, spec))
+    return compiled
+
+
+def match_path(path: str, modtime: datetime | None, compiled, job: BackupJob, server: Server) -> dict | None:
+    """Catalog fields for an object from the first pattern that matches its path (and parses its ts)."""
+    for regex, spec in compiled:
+        m = regex.search(path)
+        if not m:
+            continue
+        groups = {k: v for k, v in m.groupdict().items() if v}
+        ts = modtime
+        if "ts" in groups:
+            try:
+                ts = datetime.strptime(groups["ts"], spec.get("ts_format") or DEFAULT_TS_FORMAT)
+            except ValueError:
+                continue
+            ts = ts.replace(tzinfo=timezone.utc) if ts.tzinfo is None else ts
+        if ts is None:
+            continue
+        level = groups.get("level")
+        backup_type = (groups.get("backup_type") or spec.get("backup_type") or job.backup_type)[:50]
+        job_db = (job.source_config or {}).get("db_name") if backup_type == job.backup_type else None
+        return {
+            "created_at": ts,
+            "backup_type": backup_type,
+            "db_name": groups.get("db_name") or job_db or None,
+            "domain": (groups.get("domain") or job.domain or None),
+            "server_name": (groups.get("server_name") or server.name)[:255],
+            "backup_level": level if level in LEVELS else None,
+        }
+    return None
+
+
+def _parse_line(line: str, unit: str) -> tuple[str, int, datetime | None, str | None]:
+    """(path, size, modification time, sha256 or None) from an lsf line in _LIST_FORMAT."""
+    path, size, modtime, digest = (line.split("\t") + ["", "", ""])[:4]
+    try:
+        mtime = datetime.strptime(modtime, "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+    except ValueError:
+        mtime = None
+    digest = digest.strip().lower()
+    return (
+        unit + path,
+        int(size) if size.lstrip("-").isdigit() else -1,
+        mtime,
+        digest if _SHA256.match(digest) else None,
+    )
+
+
+def _normalize_prefix(prefix: str | None) -> str:
+    prefix = (prefix or "").strip("/")
+    return f"{prefix}/" if prefix else ""
+
+
+def _unit_of(path: str, prefix: str) -> str:
+    if prefix:
+        return prefix
+    return path.split("/", 1)[0] + "/" if "/" in path else ""
+
+
+async def _units(dest: StorageDestination, prefix: str, cursor: str | None) -> list[str]:
+    """Listing units in processing order: root files ("") then each top-level directory."""
+    if prefix:
+        return [prefix]
+    dirs, _ = await top_level(dest)
+    units = [""] + sorted(dirs)
+    if cursor and (done := _unit_of(cursor, prefix)):
+        # Root files and the directories before the cursor's are done
+        units = [u for u in units if u and u >= done]
+    return units
+
+
+async def _listing(dest: StorageDestination, unit: str, prefix: str):
+    # Root files only at the top level; a directory or prefix recursively
+    extra = _HASH_ARGS if unit or prefix else _HASH_ARGS + ("--max-depth", "1")
+    async for line in sorted_lines(dest, unit, _LIST_FORMAT, extra):
+        yield _parse_line(line, unit)
+
+
+def _sample(samples: dict, kind: str, entry: dict):
+    entries = samples.setdefault(kind, [])
+    if len(entries) < get_settings().reconcile_report_limit:
+        entries.append(entry)
+
+
+class BudgetExhausted(Exception):
+    pass
+
+
+def _failed_entry(path: str, size: int, modtime: datetime | None) -> dict:
+    return {"path": path, "size": size, "modtime": modtime.isoformat() if modtime else None}
+
+
+def _retry_pages(failed: list[dict], size: int) -> list[list]:
+    """The failed objects as listing pages, in path order."""
+    objs = sorted(
+        (e["path"], e["size"], datetime.fromisoformat(e["modtime"]) if e["modtime"] else None, None)
+        for e in failed
+    )
+    return [objs[i:i + size] for i in range(0, len(objs), size)]
+
+
+async def _import_page(
+    db: AsyncSession, imp: CatalogImport, dest: StorageDestination, job: BackupJob, server: Server,
+    compiled, page: list, budget: EgressBudget, samples: dict, failed: list[dict], retry: bool = False,
+):
+    """Import one page of the listing and commit it with the cursor.
+
+    Objects that cannot be hashed go to ``failed``. A ``retry`` page is taken
+    from there and leaves the cursor alone. Raises BudgetExhausted (after
+    committing what came before) when an object would overrun the egress budget.
+    """
+    settings = get_settings()
+    counts = Counter()
+    if retry:
+        paths = {obj[0] for obj in page}
+        failed[:] = [e for e in failed if e["path"] not in paths]
+    catalogued = set((await db.execute(
+        select(artifact_key).where(
+            BackupArtifact.storage_id == dest.id, artifact_key >= page[0][0], artifact_key <= page[-1][0],
+        )
+    )).scalars())
+    # No transaction stays open while objects are downloaded
+    await db.commit()
+
+    rows, to_hash, handled, blocked = [], [], 0, None
+    for path, size, modtime, digest in page:
+        if path in catalogued:
+            counts["existing"] += 1
+        elif (meta := match_path(path, modtime, compiled, job, server)) is None:
+            counts["unmatched"] += 1
+            _sample(samples, "unmatched", {"path": path, "size": size})
+        elif len(path) > 1000 or len(posixpath.basename(path)) > 500:
+            counts["failed"] += 1
+            _sample(samples, "failed", {"path": path, "error": "Path too long for the catalog"})
+        else:
+            row = {"path": path, "size": size, "modtime": modtime, "sha256": digest, **meta}
+            if digest is None:
+                if not budget.try_reserve(max(size, 0)):
+                    blocked = path
+                    break
+                to_hash.append(row)
+            else:
+                counts["backend"] += 1
+            rows.append(row)
+        handled += 1
+
+    sem = asyncio.Semaphore(settings.catalog_import_hash_concurrency)
+
+    async def _hash(row: dict):
+        async with sem:
+            try:
+                row["sha256"], nbytes = await hash_object(dest, row["path"])
+            except Exception as e:
+                _sample(samples, "failed", {"path": row["path"], "error": str(e)[:500]})
+                counts["failed"] += 1
+                failed.append(_failed_entry(row["path"], row["size"], row["modtime"]))
+                return
+            counts["download"] += 1
+            counts["bytes"] += nbytes
+            if row["size"] < 0:
+                row["size"] = nbytes
+
+    await asyncio.gather(*(_hash(row) for row in to_hash))
+    rows = [row for row in rows if row["sha256"]]
+
+    imported = 0
+    if rows:
+        tags = list(job.tags or []) + ["imported"]
+        records = [
+            (
+                uuid.uuid4(),
+                uuid.uuid5(RUN_NAMESPACE, f"{job.id}:{row['created_at'].isoformat()}"),
+                row["created_at"],
+                posixpath.basename(row["path"]),
+                row["path"],
+                max(row["size"], 0),
+                row["sha256"],
+                row["path"].endswith(".age"),
+                row["backup_type"],
+                tags,
+                (row["domain"] or "")[:100] or None,
+                (row["db_name"] or "")[:255] or None,
+                row["server_name"],
+                row["backup_level"],
+            )
+            for row in rows
+        ]
+        conn = await db.connection()
+        await conn.execute(_CREATE_STAGE)
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            "catalog_import_stage", records=records, columns=_STAGE_COLUMNS,
+        )
+        await conn.execute(_DROP_CATALOGUED, {"storage_id": str(dest.id)})
+        await conn.execute(
+            _INSERT_RUNS, {"job_id": str(job.id), "server_id": str(server.id), "import_id": str(imp.id)},
+        )
+        imported = (await conn.execute(_INSERT_ARTIFACTS, {"storage_id": str(dest.id)})).rowcount
+        await conn.execute(_RUN_SIZES)
+        counts["existing"] += len(rows) - imported
+
+    if retry:
+        # Counted as failed when first listed; what is left over waits for the next pass
+        failed.extend(_failed_entry(*obj[:3]) for obj in page[handled:])
+        imp.failed_count += counts["failed"] - handled
+    else:
+        imp.objects_listed += handled
+        imp.failed_count += counts["failed"]
+    imp.imported_count += imported
+    imp.existing_count += counts["existing"]
+    imp.unmatched_count += counts["unmatched"]
+    imp.hashed_by_backend += counts["backend"]
+    imp.hashed_by_download += counts["download"]
+    imp.bytes_downloaded += counts["bytes"]
+    imp.samples = copy.deepcopy(samples)
+    imp.failed_objects = copy.deepcopy(failed)
+    if handled and not retry:
+        imp.cursor = page[handled - 1][0]
+    await db.commit()
+    if blocked:
+        raise BudgetExhausted(f"Egress budget exhausted before {blocked}")
+
+
+async def claim(db: AsyncSession, import_id: uuid.UUID) -> CatalogImport | None:
+    """Mark an import running unless another worker has it. Commits."""
+    claimed = (await db.execute(
+        update(CatalogImport)
+        .where(CatalogImport.id == import_id, CatalogImport.status.in_(("pending", "paused", "failed")))
+        .values(status="running", error=None, finished_at=None)
+        .returning(CatalogImport.id)
+    )).scalar_one_or_none()
+    await db.commit()
+    if claimed is None:
+        return None
+    return await db.get(CatalogImport, import_id, populate_existing=True)
+
+
+async def run_import(db: AsyncSession, imp: CatalogImport) -> CatalogImport:
+    """Run a claimed import from its cursor until done, paused by the budget, or failed. Commits as it goes."""
+    settings = get_settings()
+    dest = await db.get(StorageDestination, imp.storage_id)
+    job = await db.get(BackupJob, imp.job_id)
+    server = await db.get(Server, job.server_id)
+    compiled = compile_patterns(imp.patterns or DEFAULT_PATTERNS)
+    budget = EgressBudget(imp.egress_budget_bytes)
+    samples = copy.deepcopy(imp.samples or {})
+    failed = copy.deepcopy(imp.failed_objects or [])
+    prefix = _normalize_prefix(imp.prefix)
+    resume_after = imp.cursor
+    resume_unit = _unit_of(resume_after, prefix) if resume_after else None
+    if imp.started_at is None:
+        imp.started_at = datetime.now(timezone.utc)
+        await db.commit()
+
+    try:
+        for unit in await _units(dest, prefix, resume_after):
+            page = []
+            async for obj in _listing(dest, unit, prefix):
+                # Root files come before the directories, so the cursor only orders its own unit
+                if unit == resume_unit and obj[0] <= resume_after:
+                    continue
+                page.append(obj)
+                if len(page) >= settings.catalog_import_page_size:
+                    await _import_page(db, imp, dest, job, server, compiled, page, budget, samples, failed)
+                    page = []
+            if page:
+                await _import_page(db, imp, dest, job, server, compiled, page, budget, samples, failed)
+        # One more try for objects whose download failed (on this pass or an earlier one)
+        for page in _retry_pages(failed, settings.catalog_import_page_size):
+            await _import_page(db, imp, dest, job, server, compiled, page, budget, samples, failed, retry=True)
+        if failed:
+            imp.status = "failed"
+            imp.error = f"{len(failed)} object(s) could not be hashed; resume the import to retry them"
+        else:
+            params = {"job_id": str(job.id), "storage_id": str(dest.id)}
+            await db.execute(_UNCHAINED, params)
+            await db.execute(_LINK_CHAINS, params)
+            imp.status = "success"
+    except BudgetExhausted as e:
+        imp.status = "paused"
+        imp.error = str(e)
+    except Exception as e:
+        logger.error(f"Catalog import {imp.id} from {dest.name} failed: {e}")
+        await db.rollback()
+        imp.status = "failed"
+        imp.error = str(e)[:2000]
+
+    imp.finished_at = datetime.now(timezone.utc)
+    await db.commit()
+    await db.refresh(imp)
+    return imp
@@ -0,0 +1,101 @@
+"""Outbound HTTP dispatch for notifications and webhooks, over one pooled client per event loop."""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import weakref
+from typing import Awaitable
+
+import httpx
+from sqlalchemy import select, or_, func
+
+from api.config import get_settings
+from api.models.webhook import Webhook
+
+logger = logging.getLogger(__name__)
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        settings = get_settings()
+        client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(settings.dispatch_timeout_seconds, connect=5.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            headers={"User-Agent": "VaultMaster/2.0"},
+        )
+        _clients[loop] = client
+    return client
+
+
+async def close_http_client():
+    """Close the client for the running loop (call before the loop shuts down)."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def fan_out(
+    sends: dict[str, Awaitable],
+    timeout: float | None = None,
+    timeouts: dict[str, float] | None = None,
+) -> dict[str, tuple[bool, str]]:
+    """Run sends concurrently, each with its own timeout.
+
+    ``sends`` maps a label to an awaitable returning (success, message);
+    ``timeouts`` overrides the timeout for individual labels.
+    Exceptions and timeouts are reported as failures instead of raised.
+    """
+    default_timeout = timeout or get_settings().dispatch_timeout_seconds
+    timeouts = timeouts or {}
+
+    async def _guarded(label: str, aw: Awaitable) -> tuple[bool, str]:
+        limit = timeouts.get(label, default_timeout)
+        try:
+            return await asyncio.wait_for(aw, timeout=limit)
+        except asyncio.TimeoutError:
+            return False, f"Timed out after {limit}s"
+        except Exception as e:
+            logger.error(f"Dispatch to {label} failed: {e}")
+            return False, str(e)
+
+    labels = list(sends)
+    results = await asyncio.gather(*(_guarded(label, sends[label]) for label in labels))
+    return dict(zip(labels, results))
+
+
+def webhook_headers(wh: Webhook, body: str) -> dict:
+    headers = dict(wh.headers or {})
+    headers["Content-Type"] = "application/json"
+    headers["User-Agent"] = "VaultMaster/2.0"
+    if wh.secret:
+        signature = hmac.new(wh.secret.encode(), body.encode(), hashlib.sha256).hexdigest()
+        headers["X-VaultMaster-Signature"] = f"sha256={signature}"
+    return headers
+
+
+async def send_webhook(wh: Webhook, payload: dict) -> int:
+    """Send a single webhook request. Returns the HTTP status code."""
+    body = json.dumps(payload)
+    resp = await get_http_client().post(wh.url, content=body, headers=webhook_headers(wh, body))
+    return resp.status_code
+
+
+def subscribed_webhooks(event: str):
+    """Query for active webhooks subscribed to event (empty list or '*' means all events)."""
+    return select(Webhook).where(
+        Webhook.is_active == True,
+        or_(
+            Webhook.events.is_(None),
+            func.cardinality(Webhook.events) == 0,
+            Webhook.events.overlap([event, "*"]),
+        ),
+    )
+
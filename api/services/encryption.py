@@ -1,27 +1,156 @@
+"""Secret encryption with versioned, HKDF-derived keys."""
+
 import base64
-import os
+from dataclasses import dataclass
+from functools import lru_cache
 
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, MultiFernet, InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 
 from api.config import get_settings
 
+# Secrets inside JSONB are stored as "enc:v<version>:<fernet token>"; plain values pass
+# through unchanged until the re-encryption task rewrites them
+ENC_PREFIX = "enc:v"
+
+STORAGE_SECRET_KEYS = {
+    "secret_key", "password", "client_secret", "application_key", "app_key", "token",
+}
+SERVER_SECRET_KEYS = {"ssh_password", "db_password"}
+
+
+@dataclass(frozen=True)
+class Keyring:
+    current: int
+    by_version: dict[int, Fernet]
+    multi: MultiFernet  # current key first, then older keys, then the legacy key
+
+
+def _derive(secret: str, version: int) -> Fernet:
+    key = HKDF(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=b"vaultmaster-secrets",
+        info=f"v{version}".encode(),
+    ).derive(secret.encode())
+    return Fernet(base64.urlsafe_b64encode(key))
+
+
+def _legacy_fernet(secret: str) -> Fernet:
+    # Pre-HKDF derivation: secret padded/truncated to 32 bytes. Decrypt only.
+    return Fernet(base64.urlsafe_b64encode(secret.encode().ljust(32, b"\0")[:32]))
 
-def _get_fernet() -> Fernet:
+
+@lru_cache()
+def load_keys() -> Keyring:
+    """Derive all keys. Cached for the life of the process; raises ValueError on bad config.
+
+    ENCRYPTION_KEYS lists versioned secrets, newest first ("2:new,1:old"); when it is
+    empty, SECRET_KEY is version 1.
+    """
     settings = get_settings()
-    key = settings.secret_key.encode()
-    # Derive a 32-byte key from the secret, padded/truncated
-    key_bytes = key.ljust(32, b"\0")[:32]
-    fernet_key = base64.urlsafe_b64encode(key_bytes)
-    return Fernet(fernet_key)
+    versions: list[tuple[int, str]] = []
+    for entry in (settings.encryption_keys or "").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        version, sep, secret = entry.partition(":")
+        if not sep or not version.isdigit() or not secret:
+            raise ValueError("ENCRYPTION_KEYS entries must look like '<version>:<secret>'")
+        versions.append((int(version), secret))
+    if not versions:
+        versions = [(1, settings.secret_key)]
+
+    by_version = {v: _derive(secret, v) for v, secret in versions}
+    multi = MultiFernet([by_version[v] for v, _ in versions] + [_legacy_fernet(settings.secret_key)])
+    return Keyring(current=versions[0][0], by_version=by_version, multi=multi)
 
 
 def encrypt_secret(plaintext: str) -> str:
-    """Encrypt a secret string using Fernet (AES-128-CBC)."""
-    f = _get_fernet()
-    return f.encrypt(plaintext.encode()).decode()
+    """Encrypt a secret string with the current key (Fernet token)."""
+    keys = load_keys()
+    return keys.by_version[keys.current].encrypt(plaintext.encode()).decode()
 
 
 def decrypt_secret(ciphertext: str) -> str:
-    """Decrypt a Fernet-encrypted string."""
-    f = _get_fernet()
-    return f.decrypt(ciphertext.encode()).decode()
+    """Decrypt a Fernet token made with any known key."""
+    return load_keys().multi.decrypt(ciphertext.encode()).decode()
+
+
+def rotate_secret(ciphertext: str) -> str:
+    """Re-encrypt a Fernet token with the current key."""
+    return load_keys().multi.rotate(ciphertext.encode()).decode()
+
+
+def token_needs_rotation(ciphertext: str) -> bool:
+    """True if a Fernet token was not made with the current key."""
+    keys = load_keys()
+    try:
+        keys.by_version[keys.current].decrypt(ciphertext.encode())
+        return False
+    except InvalidToken:
+        return True
+
+
+def is_encrypted(value) -> bool:
+    return isinstance(value, str) and value.startswith(ENC_PREFIX)
+
+
+def encrypt_value(value: str) -> str:
+    """Encrypt a JSONB secret as enc:v<version>:<token>. Already-encrypted values are returned as is."""
+    if is_encrypted(value):
+        return value
+    return f"{ENC_PREFIX}{load_keys().current}:{encrypt_secret(value)}"
+
+
+def decrypt_value(value):
+    """Decrypt an enc:v… value; anything else is returned unchanged."""
+    if not is_encrypted(value):
+        return value
+    version, _, token = value[len(ENC_PREFIX):].partition(":")
+    keys = load_keys()
+    fernet = keys.by_version.get(int(version)) if version.isdigit() else None
+    if fernet is not None:
+        try:
+            return fernet.decrypt(token.encode()).decode()
+        except InvalidToken:
+            pass
+    return keys.multi.decrypt(token.encode()).decode()
+
+
+def needs_reencrypt(value) -> bool:
+    """True for plaintext secrets and values encrypted with a non-current key."""
+    if not value or not isinstance(value, str):
+        return False
+    return not value.startswith(f"{ENC_PREFIX}{load_keys().current}:")
+
+
+def encrypt_config(config: dict | None, secret_keys: set[str]) -> dict:
+    """Return a copy of config with the secret fields encrypted."""
+    out = dict(config or {})
+    for key in secret_keys:
+        if isinstance(out.get(key), str) and out[key]:
+            out[key] = encrypt_value(out[key])
+    return out
+
+
+def decrypt_config(config: dict | None) -> dict:
+    """Return a copy of config with every encrypted value decrypted."""
+    return {k: decrypt_value(v) for k, v in (config or {}).items()}
+
+
+def decrypt_configs(configs: list[dict | None]) -> list[dict]:
+    """Bulk decrypt_config. Keys are already derived, so this is only the Fernet work."""
+    return [decrypt_config(c) for c in configs]
+
+
+def reencrypt_config(config: dict | None, secret_keys: set[str]) -> dict | None:
+    """Re-encrypt secret fields with the current key. Returns None if nothing changed."""
+    if not config or not any(needs_reencrypt(config.get(k)) for k in secret_keys):
+        return None
+    out = dict(config)
+    for key in secret_keys:
+        if needs_reencrypt(out.get(key)):
+            out[key] = encrypt_value(decrypt_value(out[key]) if is_encrypted(out[key]) else out[key])
+    return out
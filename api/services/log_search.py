@@ -0,0 +1,127 @@
+"""Full-text search across run logs, through the GIN index on run_log_chunk.search."""
+
+import re
+import uuid
+from datetime import datetime
+
+from sqlalchemy import select, func, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.models.backup_job import BackupJob
+from api.models.backup_run import BackupRun
+from api.models.run_log_chunk import RunLogChunk
+from api.models.server import Server
+from api.services.run_logs import decode_chunk, read_lines, search_config
+
+MODES = ("phrase", "words")
+# Close to what the Postgres parser treats as a word; underscores separate words there too
+_WORD = re.compile(r"[^\W_]+")
+
+CHUNK_BATCH = 20
+# Chunks decompressed per request at most; the cursor continues after them
+MAX_CHUNKS = 200
+
+
+def _words(s: str) -> list[str]:
+    return _WORD.findall(s.lower())
+
+
+def line_matcher(q: str, mode: str):
+    """A predicate on a message: the line-level version of the chunk's tsquery."""
+    terms = _words(q)
+    if not terms:
+        raise ValueError("Query has no searchable words")
+    if mode == "words":
+        wanted = set(terms)
+        return lambda msg: wanted <= set(_words(msg))
+    n = len(terms)
+
+    def phrase(msg: str) -> bool:
+        words = _words(msg)
+        return any(words[i:i + n] == terms for i in range(len(words) - n + 1))
+    return phrase
+
+
+async def search_logs(
+    db: AsyncSession,
+    q: str,
+    mode: str = "phrase",
+    job_id: uuid.UUID | None = None,
+    server_id: uuid.UUID | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    level: str | None = None,
+    context: int = 2,
+    limit: int = 50,
+    cursor: tuple | None = None,
+) -> tuple[list[dict], tuple | None]:
+    """Matching lines with ``context`` lines either side, newest first.
+
+    A chunk's matches are never split across pages, so a page can hold a few more
+    than limit. Returns (matches, next cursor or None when there are no more chunks).
+    """
+    matches_line = line_matcher(q, mode)
+    tsquery = (func.phraseto_tsquery if mode == "phrase" else func.plainto_tsquery)(search_config(), q)
+    query = (
+        select(
+            RunLogChunk.run_id, RunLogChunk.seq, RunLogChunk.first_line, RunLogChunk.data, RunLogChunk.created_at,
+            BackupRun.job_id, BackupRun.server_id, BackupRun.status, BackupJob.name, Server.name,
+        )
+        .join(BackupRun, BackupRun.id == RunLogChunk.run_id)
+        .join(BackupJob, BackupJob.id == BackupRun.job_id)
+        .join(Server, Server.id == BackupRun.server_id)
+        .where(RunLogChunk.search.op("@@")(tsquery))
+        .order_by(RunLogChunk.created_at.desc(), RunLogChunk.run_id.desc(), RunLogChunk.seq.desc())
+    )
+    if job_id:
+        query = query.where(BackupRun.job_id == job_id)
+    if server_id:
+        query = query.where(BackupRun.server_id == server_id)
+    if since:
+        query = query.where(RunLogChunk.created_at >= since)
+    if until:
+        query = query.where(RunLogChunk.created_at < until)
+
+    results: list[dict] = []
+    last = cursor
+    scanned = 0
+    while scanned < MAX_CHUNKS:
+        page = query
+        if last:
+            page = page.where(tuple_(RunLogChunk.created_at, RunLogChunk.run_id, RunLogChunk.seq) < last)
+        rows = (await db.execute(page.limit(CHUNK_BATCH))).all()
+        for run_id, seq, first_line, data, created_at, r_job, r_server, status, job_name, server_name in rows:
+            scanned += 1
+            last = (created_at, run_id, seq)
+            lines = {i: line for i, line in enumerate(decode_chunk(data), start=first_line)}
+            hits = [
+                n for n, line in lines.items()
+                if matches_line(str(line.get("msg", ""))) and (level is None or line.get("level") == level)
+            ]
+            if hits:
+                # Context that crosses into a neighbouring chunk is read from there
+                outside = [
+                    n for n in range(max(min(hits) - context, 0), max(hits) + context + 1) if n not in lines
+                ]
+                if outside:
+                    for line in await read_lines(db, run_id, outside[0], outside[-1] - outside[0] + 1):
+                        lines.setdefault(line.pop("n"), line)
+                for n in hits:
+                    results.append({
+                        "run_id": str(run_id),
+                        "job_id": str(r_job),
+                        "job_name": job_name,
+                        "server_id": str(r_server),
+                        "server_name": server_name,
+                        "run_status": status,
+                        "n": n,
+                        **lines[n],
+                        "before": [{"n": i, **lines[i]} for i in range(max(n - context, 0), n) if i in lines],
+                        "after": [{"n": i, **lines[i]} for i in range(n + 1, n + context + 1) if i in lines],
+                    })
+            # Stop on a chunk boundary so the cursor resumes after it
+            if len(results) >= limit or scanned >= MAX_CHUNKS:
+                return results, last
+        if len(rows) < CHUNK_BATCH:
+            return results, None
+    return results, last
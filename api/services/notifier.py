@@ -1,10 +1,26 @@
+import asyncio
 import logging
 from datetime import datetime, timezone
 
-import httpx
+from api.services.dispatch import get_http_client
 
 logger = logging.getLogger(__name__)
 
+EVENT_SUBJECTS = {
+    "run.start": "Backup Started",
+    "run.success": "Backup Successful",
+    "run.failed": "Backup Failed",
+    "run.partial": "Backup Partial",
+    "restore.started": "Restore Started",
+    "restore.completed": "Restore Completed",
+    "restore.failed": "Restore Failed",
+    "storage.warning": "Storage Warning",
+    "storage.critical": "Storage Critical",
+    "server.offline": "Server Offline",
+    "artifact.expiring": "Artifact Expiring",
+    "rotation.completed": "Rotation Completed",
+}
+
 
 async def send_test_notification(channel) -> tuple[bool, str]:
     """Send a test notification through a channel."""
@@ -26,7 +42,12 @@ async def send_notification(channel, subject: str, message: str) -> tuple[bool,
         elif channel.channel_type == "email":
             return await _send_email(channel.config, subject, message)
         else:
-            return False, f"Unknown channel type: {channel.channel_type}"
+            # Plugin channel types are imported on first use
+            from api.plugins.registry import get_notification_plugin
+            plugin = get_notification_plugin(channel.channel_type)
+            if plugin is None:
+                return False, f"Unknown channel type: {channel.channel_type}"
+            return await plugin.send(f"{subject}\n\n{message}", channel.config)
     except Exception as e:
         logger.error(f"Notification failed for {channel.name}: {e}")
         return False, str(e)
@@ -36,11 +57,10 @@ async def _send_slack(config: dict, subject: str, message: str) -> tuple[bool, s
     webhook_url = config.get("webhook_url")
     if not webhook_url:
         return False, "No webhook_url configured"
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(webhook_url, json={"text": f"*{subject}*\n{message}"})
-        if resp.status_code == 200:
-            return True, "Slack notification sent"
-        return False, f"Slack returned {resp.status_code}"
+    resp = await get_http_client().post(webhook_url, json={"text": f"*{subject}*\n{message}"})
+    if resp.status_code == 200:
+        return True, "Slack notification sent"
+    return False, f"Slack returned {resp.status_code}"
 
 
 async def _send_ntfy(config: dict, subject: str, message: str) -> tuple[bool, str]:
@@ -48,15 +68,14 @@ async def _send_ntfy(config: dict, subject: str, message: str) -> tuple[bool, st
     topic = config.get("topic", "vaultmaster")
     if not url:
         return False, "No ntfy URL configured"
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            f"{url}/{topic}",
-            headers={"Title": subject, "Priority": config.get("priority", "default")},
-            content=message,
-        )
-        if resp.status_code == 200:
-            return True, "ntfy notification sent"
-        return False, f"ntfy returned {resp.status_code}"
+    resp = await get_http_client().post(
+        f"{url}/{topic}",
+        headers={"Title": subject, "Priority": config.get("priority", "default")},
+        content=message,
+    )
+    if resp.status_code == 200:
+        return True, "ntfy notification sent"
+    return False, f"ntfy returned {resp.status_code}"
 
 
 async def _send_telegram(config: dict, subject: str, message: str) -> tuple[bool, str]:
@@ -64,31 +83,26 @@ async def _send_telegram(config: dict, subject: str, message: str) -> tuple[bool
     chat_id = config.get("chat_id")
     if not bot_token or not chat_id:
         return False, "Missing bot_token or chat_id"
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            f"https://api.telegram.org/bot{bot_token}/sendMessage",
-            json={"chat_id": chat_id, "text": f"*{subject}*\n{message}", "parse_mode": "Markdown"},
-        )
-        if resp.status_code == 200:
-            return True, "Telegram notification sent"
-        return False, f"Telegram returned {resp.status_code}"
+    resp = await get_http_client().post(
+        f"https://api.telegram.org/bot{bot_token}/sendMessage",
+        json={"chat_id": chat_id, "text": f"*{subject}*\n{message}", "parse_mode": "Markdown"},
+    )
+    if resp.status_code == 200:
+        return True, "Telegram notification sent"
+    return False, f"Telegram returned {resp.status_code}"
 
 
 async def _send_webhook(config: dict, subject: str, message: str) -> tuple[bool, str]:
     url = config.get("url")
     if not url:
         return False, "No webhook URL configured"
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(url, json={"subject": subject, "message": message, "timestamp": datetime.now(timezone.utc).isoformat()})
-        if resp.status_code < 300:
-            return True, f"Webhook sent (status {resp.status_code})"
-        return False, f"Webhook returned {resp.status_code}"
+    resp = await get_http_client().post(url, json={"subject": subject, "message": message, "timestamp": datetime.now(timezone.utc).isoformat()})
+    if resp.status_code < 300:
+        return True, f"Webhook sent (status {resp.status_code})"
+    return False, f"Webhook returned {resp.status_code}"
 
 
 async def _send_email(config: dict, subject: str, message: str) -> tuple[bool, str]:
-    import smtplib
-    from email.mime.text import MIMEText
-
     smtp_host = config.get("smtp_host")
     smtp_port = config.get("smtp_port", 587)
     smtp_user = config.get("smtp_user")
@@ -99,64 +113,59 @@ async def _send_email(config: dict, subject: str, message: str) -> tuple[bool, s
         return False, "Missing email configuration"
 
     try:
-        msg = MIMEText(message)
-        msg["Subject"] = f"[VaultMaster] {subject}"
-        msg["From"] = smtp_user
-        msg["To"] = to_email
-
-        with smtplib.SMTP(smtp_host, smtp_port) as server:
-            server.starttls()
-            server.login(smtp_user, smtp_password)
-            server.send_message(msg)
+        # smtplib is blocking — keep it off the event loop
+        await asyncio.to_thread(_send_email_sync, smtp_host, smtp_port, smtp_user, smtp_password, to_email, subject, message)
         return True, "Email sent"
     except Exception as e:
         return False, f"Email failed: {e}"
 
 
-async def notify_event(db, event: str, data: dict):
-    """Send notifications for a specific event trigger to all matching channels."""
-    from sqlalchemy import select
-    from api.models.notification_channel import NotificationChannel
+def _send_email_sync(smtp_host: str, smtp_port: int, smtp_user: str, smtp_password: str, to_email: str, subject: str, message: str):
+    import smtplib
+    from email.mime.text import MIMEText
+
+    msg = MIMEText(message)
+    msg["Subject"] = f"[VaultMaster] {subject}"
+    msg["From"] = smtp_user
+    msg["To"] = to_email
+
+    with smtplib.SMTP(smtp_host, smtp_port, timeout=30) as server:
+        server.starttls()
+        server.login(smtp_user, smtp_password)
+        server.send_message(msg)
 
-    result = await db.execute(
-        select(NotificationChannel).where(
-            NotificationChannel.is_active == True,
-            NotificationChannel.triggers.any(event),
-        )
-    )
-    channels = result.scalars().all()
-
-    subject_map = {
-        "run.start": "Backup Started",
-        "run.success": "Backup Successful",
-        "run.failed": "Backup Failed",
-        "run.partial": "Backup Partial",
-        "storage.warning": "Storage Warning",
-        "storage.critical": "Storage Critical",
-        "server.offline": "Server Offline",
-        "artifact.expiring": "Artifact Expiring",
-        "rotation.completed": "Rotation Completed",
-    }
-
-    subject = subject_map.get(event, event)
-    message = _format_event_message(event, data)
-
-    for channel in channels:
-        success, msg = await send_notification(channel, subject, message)
-        if success:
-            channel.last_sent = datetime.now(timezone.utc)
-        logger.info(f"Notification {channel.name} ({channel.channel_type}): {msg}")
-
-
-def _format_event_message(event: str, data: dict) -> str:
+
+def format_event_message(event: str, data: dict) -> str:
     """Format a notification message based on event type."""
     if event == "run.success":
         return f"✅ Backup completed\nJob: {data.get('job_name', 'N/A')}\nServer: {data.get('server_name', 'N/A')}\nSize: {data.get('size_bytes', 0):,} bytes\nDuration: {data.get('duration', 'N/A')}"
     elif event == "run.failed":
         return f"❌ Backup failed\nJob: {data.get('job_name', 'N/A')}\nServer: {data.get('server_name', 'N/A')}\nError: {data.get('error', 'Unknown')}"
+    elif event == "run.partial":
+        return f"⚠️ Backup partial\nJob: {data.get('job_name', 'N/A')}\nServer: {data.get('server_name', 'N/A')}\nFailed destinations: {', '.join(data.get('failed_destinations') or []) or 'N/A'}\nError: {data.get('error', 'Unknown')}"
+    elif event == "restore.started":
+        return f"♻️ Restore started\nArtifact: {data.get('artifact', 'N/A')}\nServer: {data.get('server_name', 'N/A')}"
+    elif event == "restore.completed":
+        return f"✅ Restore completed\nArtifact: {data.get('artifact', 'N/A')}\nServer: {data.get('server_name', 'N/A')}\nDuration: {data.get('duration', 'N/A')}"
+    elif event == "restore.failed":
+        return f"❌ Restore failed\nArtifact: {data.get('artifact', 'N/A')}\nServer: {data.get('server_name', 'N/A')}\nError: {data.get('error', 'Unknown')}"
     elif event == "storage.warning":
         return f"⚠️ Storage warning\nDestination: {data.get('name', 'N/A')}\nUsage: {data.get('percent_used', 0)}%"
     elif event == "storage.critical":
         return f"🔴 Storage critical\nDestination: {data.get('name', 'N/A')}\nUsage: {data.get('percent_used', 0)}%"
     else:
         return str(data)
+
+
+def format_digest(event: str, items: list[dict]) -> tuple[str, str]:
+    """Summarise several occurrences of the same event as one (subject, message)."""
+    subject = f"{EVENT_SUBJECTS.get(event, event)} ×{len(items)}"
+    if event == "run.success":
+        total = sum(d.get("size_bytes") or 0 for d in items)
+        lines = [f"✅ {len(items)} backups completed ({total:,} bytes)"]
+        lines += [f"• {d.get('job_name', 'N/A')} on {d.get('server_name', 'N/A')}" for d in items[:50]]
+    else:
+        lines = [f"{len(items)} × {event}"] + [f"• {format_event_message(event, d).splitlines()[0]}" for d in items[:50]]
+    if len(items) > 50:
+        lines.append(f"… and {len(items) - 50} more")
+    return subject, "\n".join(lines)
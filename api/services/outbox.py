@@ -0,0 +1,308 @@
+"""Durable outbound event queue for webhooks and notification channels."""
+
+import logging
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+import redis.asyncio as aioredis
+from sqlalchemy import select, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.config import get_settings
+from api.models.notification_channel import NotificationChannel
+from api.models.outbox_event import OutboxEvent
+from api.models.webhook import Webhook
+from api.services.dispatch import fan_out, send_webhook, subscribed_webhooks
+from api.services.notifier import EVENT_SUBJECTS, format_event_message, format_digest, send_notification
+
+logger = logging.getLogger(__name__)
+
+# Notification trigger → webhook event name
+WEBHOOK_EVENTS = {
+    "run.start": "backup.started",
+    "run.success": "backup.completed",
+    "run.failed": "backup.failed",
+    "run.partial": "backup.partial",
+    "restore.started": "restore.started",
+    "restore.completed": "restore.completed",
+    "restore.failed": "restore.failed",
+    "server.offline": "server.offline",
+    "storage.warning": "storage.warning",
+    "storage.critical": "storage.critical",
+}
+
+BACKOFF_BASE = 30  # seconds before the first retry
+BACKOFF_MAX = 3600
+
+
+def _coalesce_events() -> set[str]:
+    settings = get_settings()
+    if settings.outbox_coalesce_window_seconds <= 0:
+        return set()
+    return {e.strip() for e in settings.outbox_coalesce_events.split(",") if e.strip()}
+
+
+async def enqueue_event(db: AsyncSession, event: str, data: dict) -> int:
+    """Queue event for every matching channel and webhook. Returns the number of rows added.
+
+    Rows are only added to the session; they are sent once the caller commits.
+    """
+    coalesce = event in _coalesce_events()
+    rows = []
+
+    result = await db.execute(
+        select(NotificationChannel.id).where(
+            NotificationChannel.is_active == True,
+            NotificationChannel.triggers.any(event),
+        )
+    )
+    for channel_id in result.scalars().all():
+        rows.append(("channel", channel_id, event))
+
+    webhook_event = WEBHOOK_EVENTS.get(event)
+    if webhook_event:
+        result = await db.execute(subscribed_webhooks(webhook_event).with_only_columns(Webhook.id))
+        for webhook_id in result.scalars().all():
+            rows.append(("webhook", webhook_id, webhook_event))
+
+    for target_type, target_id, name in rows:
+        db.add(OutboxEvent(
+            event=name,
+            target_type=target_type,
+            target_id=target_id,
+            payload=data,
+            status="pending",
+            attempts=0,
+            coalesce_key=f"{target_type}:{target_id}:{name}" if coalesce else None,
+        ))
+    return len(rows)
+
+
+def backoff_delay(attempts: int) -> float:
+    """Exponential backoff with jitter: 30s, 60s, 120s … capped at an hour."""
+    delay = min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+    return delay * random.uniform(0.5, 1.0)
+
+
+class CircuitBreaker:
+    """Per-endpoint breaker shared by all workers through Redis.
+
+    After `threshold` consecutive failures the endpoint is skipped for `cooldown`
+    seconds; the first attempt after that is the trial (half-open) request.
+    """
+
+    def __init__(self, client: aioredis.Redis, threshold: int, cooldown: int):
+        self.client = client
+        self.threshold = threshold
+        self.cooldown = cooldown
+
+    @staticmethod
+    def _key(target: str) -> str:
+        return f"vm:outbox:breaker:{target}"
+
+    async def open_for(self, target: str) -> int:
+        """Seconds until the breaker for target closes (0 if it is closed)."""
+        ttl = await self.client.ttl(self._key(target) + ":open")
+        return max(ttl, 0)
+
+    async def record(self, target: str, success: bool):
+        key = self._key(target)
+        if success:
+            await self.client.delete(key + ":failures")
+            return
+        failures = await self.client.incr(key + ":failures")
+        await self.client.expire(key + ":failures", self.cooldown * 4)
+        if failures >= self.threshold:
+            await self.client.set(key + ":open", 1, ex=self.cooldown)
+            logger.warning(f"Circuit open for {target} after {failures} failures")
+
+
+async def _due_coalesce_keys(db: AsyncSession, now: datetime) -> list[str]:
+    """Coalesce keys whose oldest pending event has waited a full window, oldest first."""
+    window = timedelta(seconds=get_settings().outbox_coalesce_window_seconds)
+    result = await db.execute(
+        select(OutboxEvent.coalesce_key)
+        .where(
+            OutboxEvent.status == "pending",
+            OutboxEvent.coalesce_key.isnot(None),
+            OutboxEvent.next_attempt_at <= now,
+        )
+        .group_by(OutboxEvent.coalesce_key)
+        .having(func.min(OutboxEvent.created_at) <= now - window)
+        .order_by(func.min(OutboxEvent.created_at))
+    )
+    return list(result.scalars().all())
+
+
+async def _claim(db: AsyncSession, now: datetime, limit: int) -> list[OutboxEvent]:
+    """Lock up to ``limit`` sends: whole digest groups first, then uncoalesced rows."""
+    rows, sends = [], 0
+    for key in await _due_coalesce_keys(db, now):
+        if sends >= limit:
+            break
+        # A group is claimed whole or not at all: its transaction lock keeps other workers off it
+        locked = (await db.execute(select(func.pg_try_advisory_xact_lock(func.hashtext(key))))).scalar()
+        if not locked:
+            continue
+        group = (await db.execute(
+            select(OutboxEvent)
+            .where(
+                OutboxEvent.coalesce_key == key,
+                OutboxEvent.status == "pending",
+                OutboxEvent.next_attempt_at <= now,
+            )
+            .order_by(OutboxEvent.created_at)
+            .with_for_update()
+        )).scalars().all()
+        if group:
+            rows.extend(group)
+            sends += 1
+    if sends < limit:
+        result = await db.execute(
+            select(OutboxEvent)
+            .where(
+                OutboxEvent.status == "pending",
+                OutboxEvent.next_attempt_at <= now,
+                OutboxEvent.coalesce_key.is_(None),
+            )
+            .order_by(OutboxEvent.next_attempt_at)
+            .limit(limit - sends)
+            .with_for_update(skip_locked=True)
+        )
+        rows.extend(result.scalars().all())
+    return rows
+
+
+def _webhook_payload(event: str, rows: list[OutboxEvent]) -> dict:
+    payload = {"event": event, "timestamp": datetime.now(timezone.utc).isoformat()}
+    if len(rows) == 1:
+        payload["data"] = rows[0].payload
+    else:
+        payload["digest"] = True
+        payload["data"] = {"count": len(rows), "events": [r.payload for r in rows]}
+    return payload
+
+
+def _channel_message(event: str, rows: list[OutboxEvent]) -> tuple[str, str]:
+    if len(rows) == 1:
+        return EVENT_SUBJECTS.get(event, event), format_event_message(event, rows[0].payload)
+    return format_digest(event, [r.payload for r in rows])
+
+
+async def deliver_due(db: AsyncSession) -> dict:
+    """Claim and deliver due outbox rows. Caller commits."""
+    settings = get_settings()
+    now = datetime.now(timezone.utc)
+    rows = await _claim(db, now, settings.outbox_batch_size)
+    summary = {"delivered": 0, "retried": 0, "dead": 0, "deferred": 0}
+    if not rows:
+        return summary
+
+    # One send per (endpoint, event) digest group; uncoalesced rows are sent alone
+    groups: dict[str, list[OutboxEvent]] = defaultdict(list)
+    for row in rows:
+        groups[row.coalesce_key or str(row.id)].append(row)
+
+    webhook_ids = {r.target_id for r in rows if r.target_type == "webhook"}
+    channel_ids = {r.target_id for r in rows if r.target_type == "channel"}
+    webhooks, channels = {}, {}
+    if webhook_ids:
+        result = await db.execute(select(Webhook).where(Webhook.id.in_(webhook_ids)))
+        webhooks = {w.id: w for w in result.scalars().all()}
+    if channel_ids:
+        result = await db.execute(select(NotificationChannel).where(NotificationChannel.id.in_(channel_ids)))
+        channels = {c.id: c for c in result.scalars().all()}
+
+    client = aioredis.from_url(settings.redis_url)
+    breaker = CircuitBreaker(client, settings.outbox_breaker_threshold, settings.outbox_breaker_cooldown_seconds)
+    try:
+        sends, timeouts, endpoint_of = {}, {}, {}
+        for key, group in groups.items():
+            first = group[0]
+            endpoint = f"{first.target_type}:{first.target_id}"
+            target = webhooks.get(first.target_id) if first.target_type == "webhook" else channels.get(first.target_id)
+
+            if target is None or not target.is_active:
+                # Endpoint was deleted or disabled since the event was queued
+                for row in group:
+                    row.status = "dead"
+                    row.last_error = "Target no longer exists or is inactive"
+                summary["dead"] += len(group)
+                continue
+
+            wait = await breaker.open_for(endpoint)
+            if wait:
+                for row in group:
+                    row.next_attempt_at = now + timedelta(seconds=wait)
+                summary["deferred"] += len(group)
+                continue
+
+            endpoint_of[key] = endpoint
+            if first.target_type == "webhook":
+                sends[key] = _send_to_webhook(target, _webhook_payload(first.event, group))
+            else:
+                subject, message = _channel_message(first.event, group)
+                sends[key] = send_notification(target, subject, message)
+                if target.channel_type == "email":
+                    timeouts[key] = 30.0
+
+        results = await fan_out(sends, timeouts=timeouts)
+
+        for key, (success, msg) in results.items():
+            group = groups[key]
+            first = group[0]
+            await breaker.record(endpoint_of[key], success)
+
+            if first.target_type == "webhook":
+                wh = webhooks[first.target_id]
+                wh.last_triggered = now
+                if not success:
+                    wh.failure_count += 1
+            elif success:
+                channels[first.target_id].last_sent = now
+
+            for row in group:
+                row.attempts += 1
+                if success:
+                    row.status = "delivered"
+                    row.delivered_at = now
+                    row.last_error = None
+                elif row.attempts >= settings.outbox_max_attempts:
+                    row.status = "dead"
+                    row.last_error = msg
+                else:
+                    row.next_attempt_at = now + timedelta(seconds=backoff_delay(row.attempts))
+                    row.last_error = msg
+
+            if success:
+                summary["delivered"] += len(group)
+            elif group[0].status == "dead":
+                summary["dead"] += len(group)
+                logger.error(f"Giving up on {first.event} to {endpoint_of[key]} after {first.attempts} attempts: {msg}")
+            else:
+                summary["retried"] += len(group)
+                logger.warning(f"Delivery of {first.event} to {endpoint_of[key]} failed (attempt {first.attempts}): {msg}")
+    finally:
+        await client.aclose()
+
+    await db.flush()
+    return summary
+
+
+async def _send_to_webhook(wh: Webhook, payload: dict) -> tuple[bool, str]:
+    code = await send_webhook(wh, payload)
+    wh.last_status_code = code
+    return code < 400, f"HTTP {code}"
+
+
+async def purge_delivered(db: AsyncSession) -> int:
+    """Delete delivered and dead rows older than the retention period."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=get_settings().outbox_retention_days)
+    result = await db.execute(
+        delete(OutboxEvent).where(
+            OutboxEvent.status.in_(["delivered", "dead"]),
+            OutboxEvent.created_at < cutoff,
+        )
+    )
+    return result.rowcount or 0
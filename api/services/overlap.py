@@ -0,0 +1,107 @@
+"""Job overlap policy, enforced through a per-job lease in Redis."""
+
+import logging
+
+import redis.asyncio as aioredis
+
+from api.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+OVERLAP_POLICIES = ("skip", "queue_one", "cancel_previous", "allow")
+
+# backup_run.overlap_decision
+SKIPPED = "skipped"
+QUEUED = "queued"
+CANCELLED_PREVIOUS = "cancelled_previous"
+ALLOWED = "allowed"
+DECISIONS = (SKIPPED, QUEUED, CANCELLED_PREVIOUS, ALLOWED)
+
+# A waiting run keeps its slot at most this long (seconds)
+QUEUE_SLOT_TTL = 86400
+
+# Delete or extend a key only while it still holds our value
+_RELEASE = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+_RENEW = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('expire', KEYS[1], ARGV[2]) end return 0"
+
+
+def lease_key(job_id) -> str:
+    return f"vm:job:{job_id}:lease"
+
+
+def queue_key(job_id) -> str:
+    return f"vm:job:{job_id}:queued"
+
+
+async def acquire(job_id, run_id) -> str | None:
+    """Take the job's lease for run_id. Returns None on success, else the id of the run holding it."""
+    client = aioredis.from_url(get_settings().redis_url)
+    try:
+        if await client.set(lease_key(job_id), str(run_id), nx=True, ex=get_settings().run_lease_seconds):
+            return None
+        holder = await client.get(lease_key(job_id))
+        if holder is None:
+            # Released in between: try once more
+            if await client.set(lease_key(job_id), str(run_id), nx=True, ex=get_settings().run_lease_seconds):
+                return None
+            holder = await client.get(lease_key(job_id))
+        holder = holder.decode() if holder else None
+        return None if holder == str(run_id) else holder
+    finally:
+        await client.aclose()
+
+
+async def renew(job_id, run_id) -> bool:
+    client = aioredis.from_url(get_settings().redis_url)
+    try:
+        return bool(await client.eval(_RENEW, 1, lease_key(job_id), str(run_id), get_settings().run_lease_seconds))
+    finally:
+        await client.aclose()
+
+
+async def release(job_id, run_id):
+    """Give up the job's lease if run_id holds it."""
+    client = aioredis.from_url(get_settings().redis_url)
+    try:
+        await client.eval(_RELEASE, 1, lease_key(job_id), str(run_id))
+    finally:
+        await client.aclose()
+
+
+async def leave_queue(job_id, run_id):
+    """Free the job's queue slot if run_id waits in it (it started, or was cancelled)."""
+    client = aioredis.from_url(get_settings().redis_url)
+    try:
+        await client.eval(_RELEASE, 1, queue_key(job_id), str(run_id))
+    finally:
+        await client.aclose()
+
+
+async def _claim_queue_slot(client, job_id, run_id) -> bool:
+    if await client.set(queue_key(job_id), str(run_id), nx=True, ex=QUEUE_SLOT_TTL):
+        return True
+    current = await client.get(queue_key(job_id))
+    return current is not None and current.decode() == str(run_id)
+
+
+async def decide(job, holder: str, run_id) -> str:
+    """What a new run of job does while ``holder`` has the lease. Cancels the holder for cancel_previous."""
+    from api.services.cancellation import request_cancel
+
+    policy = job.overlap_policy or "skip"
+    if policy == "allow":
+        return ALLOWED
+    if policy == "skip":
+        return SKIPPED
+
+    client = aioredis.from_url(get_settings().redis_url)
+    try:
+        if not await _claim_queue_slot(client, job.id, run_id):
+            return SKIPPED  # another run is already waiting
+    finally:
+        await client.aclose()
+    if policy == "cancel_previous":
+        await request_cancel(holder)
+        logger.info(f"Job {job.name}: cancelling run {holder} for run {run_id}")
+        return CANCELLED_PREVIOUS
+    return QUEUED
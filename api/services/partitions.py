@@ -0,0 +1,98 @@
+"""Monthly range partitions (<table>_pYYYYMM) of tables partitioned on created_at."""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def month_start(year: int, month: int) -> datetime:
+    year, month = year + (month - 1) // 12, (month - 1) % 12 + 1
+    return datetime(year, month, 1, tzinfo=timezone.utc)
+
+
+def partition_name(table: str, start: datetime) -> str:
+    return f"{table}_p{start:%Y%m}"
+
+
+def create_partition_sql(table: str, start: datetime) -> str:
+    end = month_start(start.year, start.month + 1)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, start)} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+def default_partition(table: str) -> str:
+    return f"{table}_default"
+
+
+async def create_partition(db: AsyncSession, table: str, start: datetime):
+    """Create the partition of start's month, moving its rows out of the default partition first.
+
+    CREATE ... PARTITION OF fails while the default holds rows of the new range, so
+    the default is detached, emptied of them into the new partition and attached
+    again, within the caller's transaction.
+    """
+    end = month_start(start.year, start.month + 1)
+    default = default_partition(table)
+    in_range = "created_at >= :start AND created_at < :end"
+    bounds = {"start": start, "end": end}
+    stranded = (await db.execute(
+        text(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {in_range})"), bounds,
+    )).scalar()
+    if not stranded:
+        await db.execute(text(create_partition_sql(table, start)))
+        return
+    await db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {default}"))
+    await db.execute(text(create_partition_sql(table, start)))
+    await db.execute(text(
+        f"WITH moved AS (DELETE FROM {default} WHERE {in_range} RETURNING *) INSERT INTO {table} SELECT * FROM moved"
+    ), bounds)
+    await db.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT"))
+
+
+async def maintain_monthly_partitions(
+    db: AsyncSession, table: str, months_ahead: int, retention_days: int, since: datetime | None = None,
+) -> dict:
+    """Create monthly partitions of table and drop those entirely past retention (0 keeps all).
+
+    Partitions are created from the month of ``since`` (default: this month) to months_ahead,
+    and for every month with rows in the default partition, which move there.
+    """
+    now = datetime.now(timezone.utc)
+    prefix = f"{table}_p"
+    since = since or now
+    # Rows left in the default while maintenance was behind: retention can only drop them from their month
+    stranded = (await db.execute(text(f"SELECT min(created_at) FROM {default_partition(table)}"))).scalar()
+    if stranded is not None:
+        since = min(since, stranded)
+    months_back = (now.year - since.year) * 12 + now.month - since.month
+
+    created = []
+    for i in range(-months_back, months_ahead + 1):
+        start = month_start(now.year, now.month + i)
+        exists = (await db.execute(text("SELECT to_regclass(:name)"), {"name": partition_name(table, start)})).scalar()
+        if not exists:
+            await create_partition(db, table, start)
+            created.append(partition_name(table, start))
+
+    dropped = []
+    if retention_days > 0:
+        result = await db.execute(text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:table)"
+        ), {"table": table})
+        cutoff = now.timestamp() - retention_days * 86400
+        for (name,) in result.all():
+            suffix = name[len(prefix):]
+            if not name.startswith(prefix) or not suffix.isdigit():
+                continue  # default partition
+            start = datetime(int(suffix[:4]), int(suffix[4:]), 1, tzinfo=timezone.utc)
+            if month_start(start.year, start.month + 1).timestamp() <= cutoff:
+                # Detaching first keeps the lock on the parent short
+                await db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+                await db.execute(text(f"DROP TABLE {name}"))
+                dropped.append(name)
+
+    return {"created": created, "dropped": dropped}
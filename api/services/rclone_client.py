@@ -4,6 +4,9 @@ import logging
 import os
 import shutil
 import subprocess
+import uuid
+
+from api.services.encryption import decrypt_config
 
 logger = logging.getLogger(__name__)
 
@@ -47,7 +50,7 @@ def _build_backend(dest) -> tuple[str, list[str]]:
     --backend-flag=value arguments.
     """
     backend = dest.backend
-    cfg = dest.config or {}
+    cfg = decrypt_config(dest.config)
 
     if backend == "local":
         return cfg.get("path", "/mnt/backup"), []
@@ -229,3 +232,132 @@ async def copy_file_to_storage(dest, local_path: str, remote_subpath: str) -> tu
     if exit_code == 0:
         return True, f"Copied to {target}"
     return False, f"Failed: {stderr}"
+
+
+async def upload_stream(dest, path: str, chunks) -> int:
+    """Write ``chunks`` (an async iterator of bytes) to an object, without staging it locally.
+
+    Uses ``rclone rcat`` (a plain file write for local destinations). Returns the
+    number of bytes written; raises on failure.
+    """
+    written = 0
+    if dest.backend == "local":
+        target = _object_path(dest, path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        # Under a temporary name until complete: an interrupted write never looks like a backup
+        partial = f"{target}.partial-{uuid.uuid4().hex[:12]}"
+        loop = asyncio.get_running_loop()
+        try:
+            with open(partial, "wb") as fh:
+                async for chunk in chunks:
+                    await loop.run_in_executor(None, fh.write, chunk)
+                    written += len(chunk)
+            os.replace(partial, target)
+        except BaseException:
+            try:
+                os.unlink(partial)
+            except FileNotFoundError:
+                pass
+            raise
+        return written
+
+    _, flags = _build_backend(dest)
+    proc = await asyncio.create_subprocess_exec(
+        "rclone", "rcat", _object_path(dest, path), *flags,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stderr = asyncio.create_task(proc.stderr.read())
+    try:
+        async for chunk in chunks:
+            proc.stdin.write(chunk)
+            await proc.stdin.drain()
+            written += len(chunk)
+        proc.stdin.close()
+        if await proc.wait() != 0:
+            raise RuntimeError(f"rclone rcat failed: {(await stderr).decode().strip()}")
+        return written
+    finally:
+        stderr.cancel()
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+
+
+def _object_path(dest, path: str) -> str:
+    """Build the full remote spec for an object path inside a destination."""
+    remote, _ = _build_backend(dest)
+    return f"{remote.rstrip('/')}/{path.lstrip('/')}"
+
+
+async def stat_object(dest, path: str) -> dict | None:
+    """Return {size, modified} for a single object, or None if it does not exist."""
+    if dest.backend == "local":
+        try:
+            st = os.stat(_object_path(dest, path))
+        except FileNotFoundError:
+            return None
+        return {"size": st.st_size, "modified": st.st_mtime}
+
+    _, flags = _build_backend(dest)
+    exit_code, stdout, stderr = await _run_rclone(["lsjson", "--stat", _object_path(dest, path)] + flags)
+    if exit_code != 0:
+        if "not found" in stderr.lower():
+            return None
+        raise RuntimeError(f"rclone lsjson --stat failed: {stderr.strip()}")
+    try:
+        item = json.loads(stdout)
+    except json.JSONDecodeError:
+        raise RuntimeError("Failed to parse rclone output")
+    return {"size": item.get("Size"), "modified": item.get("ModTime")}
+
+
+async def get_object_hash(dest, path: str, hash_type: str = "sha256") -> str | None:
+    """Ask the backend for a stored hash without downloading the object.
+
+    Returns None when the backend does not support the hash type; rclone
+    only answers from metadata unless --download is given.
+    """
+    _, flags = _build_backend(dest)
+    exit_code, stdout, _ = await _run_rclone(["hashsum", hash_type, _object_path(dest, path)] + flags)
+    if exit_code != 0 or not stdout.strip():
+        return None
+    value = stdout.split()[0].lower()
+    if not value or set(value) - set("0123456789abcdef"):
+        return None
+    return value
+
+
+async def stream_object(dest, path: str, chunk_size: int = 8 * 1024 * 1024):
+    """Yield the contents of a stored object in chunks without staging it on disk."""
+    if dest.backend == "local":
+        loop = asyncio.get_running_loop()
+        with open(_object_path(dest, path), "rb") as fh:
+            while True:
+                chunk = await loop.run_in_executor(None, fh.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        return
+
+    _, flags = _build_backend(dest)
+    proc = await asyncio.create_subprocess_exec(
+        "rclone", "cat", _object_path(dest, path), *flags,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        limit=chunk_size,
+    )
+    try:
+        while True:
+            chunk = await proc.stdout.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+        stderr = await proc.stderr.read()
+        if await proc.wait() != 0:
+            raise RuntimeError(f"rclone cat failed: {stderr.decode().strip()}")
+    finally:
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
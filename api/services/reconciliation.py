@@ -0,0 +1,279 @@
+"""Catalog ↔ storage reconciliation: missing, orphaned and size-mismatched objects."""
+
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.config import get_settings
+from api.models.backup_artifact import BackupArtifact
+from api.models.storage_destination import StorageDestination
+from api.models.storage_reconciliation import StorageReconciliation
+from api.services.rclone_client import _build_backend, _run_rclone
+
+logger = logging.getLogger(__name__)
+
+DRIFT_KINDS = ("missing", "orphaned", "size_mismatch")
+
+# Path relative to the destination root; matches ix_backup_artifact_storage_path
+artifact_key = func.ltrim(BackupArtifact.remote_path, "/").collate("C")
+
+
+def _target(dest: StorageDestination, prefix: str) -> tuple[str, list[str]]:
+    remote, flags = _build_backend(dest)
+    return (f"{remote.rstrip('/')}/{prefix}" if prefix else remote), flags
+
+
+def _parse(line: str) -> tuple[str, int]:
+    path, _, size = line.rpartition("\t")
+    return path, int(size) if size.lstrip("-").isdigit() else -1
+
+
+async def top_level(dest: StorageDestination) -> tuple[dict[str, str], list[tuple[str, int]]]:
+    """Top-level directories ({name/: modtime}) and root-level files [(name, size)]."""
+    target, flags = _target(dest, "")
+    exit_code, stdout, stderr = await _run_rclone(
+        ["lsf", "--format", "pst", "--separator", "\t", target] + flags, timeout=300,
+    )
+    if exit_code != 0:
+        raise RuntimeError(f"rclone lsf failed: {stderr.strip()}")
+    dirs, files = {}, []
+    for line in stdout.splitlines():
+        path, size, modtime = (line.split("\t") + ["", ""])[:3]
+        if path.endswith("/"):
+            dirs[path] = modtime
+        else:
+            files.append((path, int(size) if size.lstrip("-").isdigit() else -1))
+    return dirs, sorted(files)
+
+
+async def sorted_lines(dest: StorageDestination, prefix: str, fmt: str = "ps", extra: tuple[str, ...] = ()):
+    """Yield the `rclone lsf -R --files-only` lines (fields in fmt, tab-separated) under prefix, in byte order.
+
+    Raises RuntimeError after the last line if rclone failed, so the caller can
+    discard a partial result.
+    """
+    settings = get_settings()
+    target, flags = _target(dest, prefix)
+    os.makedirs(settings.reconcile_tmp_dir, exist_ok=True)
+
+    read_fd, write_fd = os.pipe()
+    try:
+        lister = await asyncio.create_subprocess_exec(
+            "rclone", "lsf", "-R", "--files-only", "--format", fmt, "--separator", "\t", *extra, target, *flags,
+            stdout=write_fd, stderr=asyncio.subprocess.PIPE,
+            env={**os.environ, "TZ": "UTC"},  # modification times in lsf output are local time
+        )
+    finally:
+        os.close(write_fd)
+    try:
+        sorter = await asyncio.create_subprocess_exec(
+            "sort", "-S", f"{settings.reconcile_sort_buffer_mb}M", "-T", settings.reconcile_tmp_dir,
+            stdin=read_fd, stdout=asyncio.subprocess.PIPE,
+            env={**os.environ, "LC_ALL": "C"},
+        )
+    finally:
+        os.close(read_fd)
+
+    lister_stderr = asyncio.create_task(lister.stderr.read())
+    try:
+        async for line in sorter.stdout:
+            yield line.decode("utf-8", "surrogateescape").rstrip("\n")
+        if await lister.wait() != 0:
+            raise RuntimeError(f"rclone lsf {prefix or '/'} failed: {(await lister_stderr).decode().strip()}")
+        await sorter.wait()
+    finally:
+        for proc in (lister, sorter):
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+        lister_stderr.cancel()
+
+
+async def _sorted_listing(dest: StorageDestination, prefix: str):
+    """Yield (path, size) for every object under prefix, in byte order."""
+    async for line in sorted_lines(dest, prefix):
+        path, size = _parse(line)
+        yield prefix + path, size
+
+
+async def _iter_list(items):
+    for item in items:
+        yield item
+
+
+def _prefix_filter(prefix: str):
+    if not prefix:
+        return func.strpos(artifact_key, "/") == 0
+    # '0' is the byte after '/', so this is a range scan on the index rather than LIKE
+    return (artifact_key >= prefix) & (artifact_key < prefix[:-1] + "0")
+
+
+async def _catalog_signatures(db: AsyncSession, storage_id) -> dict[str, list]:
+    """[count, newest created_at, newest deleted_at] per top-level prefix."""
+    first = func.split_part(func.ltrim(BackupArtifact.remote_path, "/"), "/", 1)
+    has_dir = func.strpos(func.ltrim(BackupArtifact.remote_path, "/"), "/") > 0
+    result = await db.execute(
+        select(
+            first, has_dir,
+            func.count().filter(BackupArtifact.is_deleted == False),
+            func.max(BackupArtifact.created_at),
+            func.max(BackupArtifact.deleted_at),
+        )
+        .where(BackupArtifact.storage_id == storage_id, BackupArtifact.remote_path != "")
+        .group_by(first, has_dir)
+    )
+    out = {}
+    for name, is_dir, count, created, deleted in result.all():
+        out[f"{name}/" if is_dir else ""] = [
+            count, created.isoformat() if created else None, deleted.isoformat() if deleted else None,
+        ]
+    return out
+
+
+class _PrefixResult:
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.objects = 0
+        self.artifacts = 0
+        self.counts = {k: 0 for k in DRIFT_KINDS}
+        self.samples = {k: [] for k in DRIFT_KINDS}
+
+    def add(self, kind: str, entry: dict):
+        self.counts[kind] += 1
+        if len(self.samples[kind]) < self.limit:
+            self.samples[kind].append(entry)
+
+    @property
+    def clean(self) -> bool:
+        return not any(self.counts.values())
+
+
+async def _merge(db: AsyncSession, storage_id, prefix: str, listing, result: _PrefixResult):
+    """Merge-join a sorted listing with the prefix's artifacts (same order)."""
+    stream = await db.stream(
+        select(BackupArtifact.id, artifact_key, BackupArtifact.size_bytes)
+        .where(
+            BackupArtifact.storage_id == storage_id,
+            BackupArtifact.is_deleted == False,
+            BackupArtifact.remote_path != "",
+            _prefix_filter(prefix),
+        )
+        .order_by(artifact_key)
+        .execution_options(yield_per=1000)
+    )
+    try:
+        await _merge_sorted(listing, stream.tuples(), result)
+    finally:
+        await stream.close()
+
+
+async def _merge_sorted(listing, artifacts, result: _PrefixResult):
+    obj = await anext(listing, None)
+    art = await anext(artifacts, None)
+    matched = None  # last object matched; several artifacts may share one object
+    while obj is not None or art is not None:
+        if art is not None and matched is not None and art[1] == matched[0]:
+            result.artifacts += 1
+            if matched[1] >= 0 and matched[1] != art[2]:
+                result.add("size_mismatch", {"path": art[1], "artifact_id": str(art[0]), "expected": art[2], "actual": matched[1]})
+            art = await anext(artifacts, None)
+        elif art is None or (obj is not None and obj[0] < art[1]):
+            result.objects += 1
+            result.add("orphaned", {"path": obj[0], "size": obj[1]})
+            obj = await anext(listing, None)
+        elif obj is None or art[1] < obj[0]:
+            result.artifacts += 1
+            result.add("missing", {"path": art[1], "artifact_id": str(art[0]), "size": art[2]})
+            art = await anext(artifacts, None)
+        else:
+            result.objects += 1
+            matched = obj
+            obj = await anext(listing, None)
+
+
+async def reconcile(db: AsyncSession, dest: StorageDestination, full: bool = False) -> StorageReconciliation:
+    """Reconcile one destination and store the report. Commits as it goes."""
+    settings = get_settings()
+    now = datetime.now(timezone.utc)
+    previous = (await db.execute(
+        select(StorageReconciliation)
+        .where(StorageReconciliation.storage_id == dest.id, StorageReconciliation.finished_at.isnot(None))
+        .order_by(StorageReconciliation.started_at.desc())
+        .limit(1)
+    )).scalar_one_or_none()
+    old_marks = previous.watermark if previous and not full else {}
+
+    report = StorageReconciliation(
+        storage_id=dest.id, status="running", full=full, started_at=now, prefixes_listed=0, prefixes_skipped=0,
+    )
+    db.add(report)
+    await db.commit()
+
+    totals = _PrefixResult(settings.reconcile_report_limit)
+    watermark, failures = {}, []
+    try:
+        dirs, root_files = await top_level(dest)
+        signatures = await _catalog_signatures(db, dest.id)
+        full_after = timedelta(hours=settings.reconcile_full_interval_hours)
+
+        for prefix in sorted(set(dirs) | set(signatures) | {""}):
+            mark = {"remote": dirs.get(prefix), "catalog": signatures.get(prefix), "listed_at": now.isoformat()}
+            old = old_marks.get(prefix)
+            # Clean last time and unchanged on both sides; object stores have no directory
+            # timestamps, so only the periodic full listing catches objects removed behind our back
+            if (
+                prefix and old and old.get("clean")
+                and old["remote"] == mark["remote"] and old["catalog"] == mark["catalog"]
+                and now - datetime.fromisoformat(old["listed_at"]) < full_after
+            ):
+                watermark[prefix] = old
+                report.prefixes_skipped += 1
+                continue
+
+            result = _PrefixResult(settings.reconcile_report_limit)
+            if not prefix:
+                listing = _iter_list(root_files)
+            elif prefix in dirs:
+                listing = _sorted_listing(dest, prefix)
+            else:
+                listing = _iter_list([])  # catalog rows under a prefix that no longer exists
+            try:
+                await _merge(db, dest.id, prefix, listing, result)
+            except RuntimeError as e:
+                # Partial listing: its "missing" entries would be false positives
+                failures.append(str(e))
+                logger.warning(f"Reconciliation of {dest.name}/{prefix} failed: {e}")
+                continue
+
+            report.prefixes_listed += 1
+            totals.objects += result.objects
+            totals.artifacts += result.artifacts
+            for kind in DRIFT_KINDS:
+                totals.counts[kind] += result.counts[kind]
+                room = totals.limit - len(totals.samples[kind])
+                totals.samples[kind].extend(result.samples[kind][:room])
+            watermark[prefix] = {**mark, "clean": result.clean}
+
+        report.status = "failed" if failures else "success"
+        report.error = "; ".join(failures)[:2000] or None
+    except Exception as e:
+        logger.error(f"Reconciliation of {dest.name} failed: {e}")
+        await db.rollback()
+        report.status = "failed"
+        report.error = str(e)
+
+    report.objects_listed = totals.objects
+    report.artifacts_checked = totals.artifacts
+    report.missing_count = totals.counts["missing"]
+    report.orphaned_count = totals.counts["orphaned"]
+    report.size_mismatch_count = totals.counts["size_mismatch"]
+    report.drift = totals.samples
+    report.watermark = watermark
+    report.finished_at = datetime.now(timezone.utc)
+    await db.commit()
+    await db.refresh(report)
+    return report
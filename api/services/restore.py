@@ -0,0 +1,198 @@
+"""Streaming restore: storage → [age -d] → ssh → [gunzip] → pg_restore / psql / tar."""
+
+import asyncio
+import logging
+import shlex
+import time
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.config import get_settings
+from api.models.backup_artifact import BackupArtifact
+from api.services.encryption import decrypt_value
+from api.services.rclone_client import stream_object
+from api.services.ssh_client import stream_to_remote_command, run_remote_command
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_INTERVAL = 5  # seconds between progress log lines
+
+
+def detect_format(artifact) -> str:
+    """Return the archive format of an artifact: pg_custom, pg_plain or tar."""
+    name = artifact.filename
+    if artifact.backup_type == "postgresql":
+        return "pg_plain" if ".sql" in name else "pg_custom"
+    if ".tar" in name:
+        return "tar"
+    raise ValueError(f"Don't know how to restore {name} ({artifact.backup_type})")
+
+
+def _pg_command(server, tool: str, args: str, pg_user: str | None = None) -> str:
+    """Build a pg_restore/psql invocation using the server's DB credentials.
+
+    Mirrors list_remote_databases: peer auth via sudo -u for local servers without a
+    password, PGPASSWORD otherwise.
+    """
+    meta = getattr(server, 'meta', None) or {}
+    db_host = meta.get('db_host', '127.0.0.1')
+    db_port = meta.get('db_port', 5432)
+    db_user = pg_user or meta.get('db_user', 'postgres')
+    db_password = decrypt_value(meta.get('db_password', ''))
+
+    is_local = db_host in ('127.0.0.1', 'localhost', '::1', '')
+    if is_local and not db_password:
+        return f"sudo -n -u {shlex.quote(db_user)} {tool} -p {db_port} {args}"
+    if db_password:
+        return f"PGPASSWORD={shlex.quote(db_password)} {tool} -h {db_host} -p {db_port} -U {shlex.quote(db_user)} -w {args}"
+    return f"{tool} -h {db_host} -p {db_port} -U {shlex.quote(db_user)} {args}"
+
+
+def build_restore_command(server, artifact, options: dict, staged_path: str | None = None) -> str:
+    """Build the remote command that consumes the artifact stream on stdin.
+
+    options: target_db_name, pg_user, tables, schemas, paths, target_path, jobs
+    """
+    fmt = detect_format(artifact)
+    tables = options.get("tables") or []
+    schemas = options.get("schemas") or []
+    paths = options.get("paths") or []
+
+    if fmt == "pg_custom":
+        db_name = options.get("target_db_name") or artifact.db_name or "postgres"
+        args = ["--no-owner", "--clean", "--if-exists", "-d", shlex.quote(db_name)]
+        args += [f"-t {shlex.quote(t)}" for t in tables]
+        args += [f"-n {shlex.quote(s)}" for s in schemas]
+        if staged_path:
+            args += [f"-j {int(options.get('jobs') or 1)}", shlex.quote(staged_path)]
+        return _pg_command(server, "pg_restore", " ".join(args), options.get("pg_user"))
+
+    if fmt == "pg_plain":
+        if tables or schemas:
+            raise ValueError("Selective restore needs a custom-format dump; this artifact is plain SQL")
+        db_name = options.get("target_db_name") or artifact.db_name or "postgres"
+        psql = _pg_command(server, "psql", f"-v ON_ERROR_STOP=1 -q -d {shlex.quote(db_name)}", options.get("pg_user"))
+        return f"gunzip -c | {psql}"
+
+    # tar archives store paths relative to / (tar strips the leading slash)
+    target = options.get("target_path") or "/"
+    members = " ".join(shlex.quote(p.lstrip("/")) for p in paths)
+    # Archives made with --listed-incremental carry deletions, applied when extracted the same way
+    incremental = " --listed-incremental=/dev/null" if getattr(artifact, "backup_level", None) else ""
+    return f"mkdir -p {shlex.quote(target)} && tar -xzf -{incremental} -C {shlex.quote(target)} {members}".rstrip()
+
+
+async def artifact_chain(db: AsyncSession, artifact) -> list:
+    """Artifacts to restore in order: the full, then each level up to ``artifact``.
+
+    Raises ValueError when a link is missing or deleted.
+    """
+    chain = [artifact]
+    while chain[0].parent_artifact_id is not None:
+        parent = (await db.execute(
+            select(BackupArtifact).where(BackupArtifact.id == chain[0].parent_artifact_id)
+        )).scalar_one_or_none()
+        if parent is None or parent.is_deleted:
+            raise ValueError(f"{chain[0].filename} depends on an artifact that no longer exists")
+        chain.insert(0, parent)
+    if chain[0].backup_level not in (None, "full"):
+        raise ValueError(f"{artifact.filename} has no full backup at the start of its chain")
+    return chain
+
+
+async def pipe_through(args: list[str], chunks, chunk_size: int = 1024 * 1024):
+    """Run a local process, feed it ``chunks`` on stdin and yield its stdout."""
+    proc = await asyncio.create_subprocess_exec(
+        *args,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+
+    async def _feed():
+        try:
+            async for chunk in chunks:
+                proc.stdin.write(chunk)
+                await proc.stdin.drain()
+        finally:
+            proc.stdin.close()
+
+    feeder = asyncio.create_task(_feed())
+    try:
+        while True:
+            data = await proc.stdout.read(chunk_size)
+            if not data:
+                break
+            yield data
+        await feeder
+        stderr = await proc.stderr.read()
+        if await proc.wait() != 0:
+            raise RuntimeError(f"{args[0]} failed: {stderr.decode().strip()}")
+    finally:
+        feeder.cancel()
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+
+
+async def _with_progress(chunks, log, total_bytes: int | None):
+    """Pass chunks through, logging throughput every PROGRESS_INTERVAL seconds."""
+    started = time.monotonic()
+    last_report = started
+    sent = 0
+    async for chunk in chunks:
+        sent += len(chunk)
+        yield chunk
+        now = time.monotonic()
+        if now - last_report >= PROGRESS_INTERVAL:
+            last_report = now
+            rate = sent / max(now - started, 1e-6)
+            pct = f" ({sent / total_bytes * 100:.1f}%)" if total_bytes else ""
+            await log("info", f"Restored {sent:,} bytes{pct} at {rate / 1024 / 1024:.1f} MB/s")
+    elapsed = max(time.monotonic() - started, 1e-6)
+    await log("info", f"Streamed {sent:,} bytes in {elapsed:.1f}s ({sent / elapsed / 1024 / 1024:.1f} MB/s)")
+
+
+async def restore_artifact(server, artifact, dest, options: dict, log, timeout: int) -> None:
+    """Stream ``artifact`` from ``dest`` into a restore command on ``server``.
+
+    ``log(level, msg)`` is an async callback that records progress on the run;
+    ``timeout`` bounds each remote command (see run_estimates.restore_timeout).
+    Raises on failure.
+    """
+    settings = get_settings()
+    fmt = detect_format(artifact)
+    jobs = int(options.get("jobs") or 1)
+
+    # Progress counts stored bytes, so it matches size_bytes for encrypted artifacts too
+    chunks = _with_progress(
+        stream_object(dest, artifact.remote_path, chunk_size=settings.verify_chunk_size), log, artifact.size_bytes,
+    )
+    if artifact.is_encrypted:
+        if not settings.age_identity_path:
+            raise RuntimeError("Artifact is encrypted but AGE_IDENTITY_PATH is not configured")
+        chunks = pipe_through(["age", "-d", "-i", settings.age_identity_path], chunks)
+
+    await log("info", f"Restoring {artifact.filename} ({fmt}) to {server.name}")
+
+    if fmt == "pg_custom" and jobs > 1:
+        staged = f"/tmp/vaultmaster/restore_{uuid.uuid4().hex}.dump"
+        await run_remote_command(server, "mkdir -p /tmp/vaultmaster")
+        try:
+            exit_code, _, stderr = await stream_to_remote_command(server, f"cat > {staged}", chunks, timeout=timeout)
+            if exit_code != 0:
+                raise RuntimeError(f"Upload to target failed: {stderr.strip()}")
+            cmd = build_restore_command(server, artifact, options, staged_path=staged)
+            await log("info", f"Running pg_restore with {jobs} parallel jobs")
+            exit_code, _, stderr = await run_remote_command(server, cmd, timeout=timeout)
+        finally:
+            await run_remote_command(server, f"rm -f {staged}")
+    else:
+        cmd = build_restore_command(server, artifact, options)
+        exit_code, _, stderr = await stream_to_remote_command(server, cmd, chunks, timeout=timeout)
+
+    if exit_code != 0:
+        raise RuntimeError(f"Restore command failed (exit {exit_code}): {stderr.strip()[-2000:]}")
+    await log("info", "Restore completed")
@@ -22,6 +22,26 @@ def _assign_bucket(dt: datetime) -> dict:
     }
 
 
+def _keep_run_siblings(artifacts, keep_ids: set):
+    """Keep every artifact of a kept run (e.g. one per Docker volume), not just the newest."""
+    kept_runs = {a.run_id for a in artifacts if a.id in keep_ids}
+    keep_ids.update(a.id for a in artifacts if a.run_id in kept_runs)
+
+
+def _keep_ancestors(artifacts, keep_ids: set):
+    """Add the chain (parents up to the full) of every kept incremental/differential to keep_ids.
+
+    Deleting a base would make every later artifact in its chain unrestorable.
+    """
+    by_id = {a.id: a for a in artifacts}
+    for artifact_id in list(keep_ids):
+        parent_id = by_id[artifact_id].parent_artifact_id
+        while parent_id is not None and parent_id not in keep_ids:
+            keep_ids.add(parent_id)
+            parent = by_id.get(parent_id)
+            parent_id = parent.parent_artifact_id if parent else None
+
+
 async def apply_rotation(db: AsyncSession, policy: RetentionPolicy, job_id: str | None = None, storage_id: str | None = None) -> dict:
     """Apply GFS rotation: keep configured number per time bucket, mark rest as deleted."""
     query = select(BackupArtifact).where(BackupArtifact.is_deleted == False)
@@ -75,6 +95,8 @@ async def apply_rotation(db: AsyncSession, policy: RetentionPolicy, job_id: str
     keep_from_bucket(buckets["weekly"], policy.keep_weekly)
     keep_from_bucket(buckets["monthly"], policy.keep_monthly)
     keep_from_bucket(buckets["yearly"], policy.keep_yearly)
+    _keep_run_siblings(artifacts, keep_ids)
+    _keep_ancestors(artifacts, keep_ids)
 
     # Mark deletions
     deleted = []
@@ -134,6 +156,8 @@ async def preview_rotation(db: AsyncSession, policy: RetentionPolicy, job_id: st
     keep_from_bucket(buckets["weekly"], policy.keep_weekly)
     keep_from_bucket(buckets["monthly"], policy.keep_monthly)
     keep_from_bucket(buckets["yearly"], policy.keep_yearly)
+    _keep_run_siblings(artifacts, keep_ids)
+    _keep_ancestors(artifacts, keep_ids)
 
     would_delete = []
     for artifact in artifacts:
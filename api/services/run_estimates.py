@@ -0,0 +1,139 @@
+"""Per-job run estimates for adaptive timeouts and ETAs."""
+
+import math
+import uuid
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.config import get_settings
+from api.models.backup_run import BackupRun
+from api.models.job_run_estimate import JobRunEstimate
+from api.services.run_stages import NON_BACKUP_TRIGGERS
+
+# One-sided z for the 99th percentile of a normal distribution
+Z99 = 2.326
+SEED_RUNS = 20
+
+
+def _ewma(mean: float | None, var: float, x: float, alpha: float) -> tuple[float, float]:
+    """Incremental exponentially weighted mean and variance."""
+    if mean is None:
+        return x, 0.0
+    diff = x - mean
+    incr = alpha * diff
+    return mean + incr, (1 - alpha) * (var + diff * incr)
+
+
+def add_duration_sample(est: JobRunEstimate, seconds: float, size_bytes: int | None):
+    alpha = get_settings().run_estimate_alpha
+    est.duration_mean, est.duration_var = _ewma(est.duration_mean, est.duration_var or 0.0, seconds, alpha)
+    if size_bytes:
+        est.size_mean, _ = _ewma(est.size_mean, 0.0, float(size_bytes), alpha)
+        est.last_size_bytes = size_bytes
+    est.samples = (est.samples or 0) + 1
+
+
+def add_throughput_sample(est: JobRunEstimate, bytes_per_second: float):
+    alpha = get_settings().run_estimate_alpha
+    est.throughput_mean, est.throughput_var = _ewma(
+        est.throughput_mean, est.throughput_var or 0.0, bytes_per_second, alpha,
+    )
+    est.throughput_samples = (est.throughput_samples or 0) + 1
+
+
+async def get_estimate(db: AsyncSession, job_id: uuid.UUID, level: str | None = None) -> JobRunEstimate:
+    """The job's estimate for backups of ``level``, seeded from its run history the first time. Caller commits."""
+    key = level or ""
+    est = await db.get(JobRunEstimate, (job_id, key))
+    if est is not None:
+        return est
+    est = JobRunEstimate(
+        job_id=job_id, backup_level=key, samples=0, duration_var=0.0, throughput_samples=0, throughput_var=0.0,
+    )
+    produced = BackupRun.checkpoint["produced"]
+    history = (await db.execute(
+        select(produced["seconds"].as_float(), BackupRun.size_bytes)
+        .where(
+            BackupRun.job_id == job_id,
+            BackupRun.status == "success",
+            BackupRun.triggered_by.notin_(NON_BACKUP_TRIGGERS),
+            func.coalesce(produced["backup_level"].astext, "") == key,
+            produced["seconds"].as_float().isnot(None),
+        )
+        .order_by(BackupRun.created_at.desc())
+        .limit(SEED_RUNS)
+    )).all()
+    for seconds, size_bytes in reversed(history):
+        add_duration_sample(est, seconds, size_bytes)
+    db.add(est)
+    return est
+
+
+def _clamp(seconds: float) -> int:
+    settings = get_settings()
+    return int(min(max(seconds, settings.run_timeout_min_seconds), settings.run_timeout_max_seconds))
+
+
+def duration_p99(est: JobRunEstimate) -> float | None:
+    if est.duration_mean is None:
+        return None
+    return est.duration_mean + Z99 * math.sqrt(max(est.duration_var or 0.0, 0.0))
+
+
+def produce_timeout(est: JobRunEstimate | None) -> int | None:
+    """Timeout for the executor's remote commands; None (executor default) until there is enough history."""
+    settings = get_settings()
+    if est is None or (est.samples or 0) < settings.run_estimate_min_samples:
+        return None
+    return _clamp(duration_p99(est) * settings.run_timeout_factor)
+
+
+def _slow_throughput(est: JobRunEstimate | None) -> float | None:
+    """p1 throughput, floored so a noisy history cannot make it zero or negative; None without history."""
+    if est is None or (est.throughput_samples or 0) < get_settings().run_estimate_min_samples or not est.throughput_mean:
+        return None
+    return max(
+        est.throughput_mean - Z99 * math.sqrt(max(est.throughput_var or 0.0, 0.0)),
+        est.throughput_mean * 0.1,
+    )
+
+
+def transfer_timeout(est: JobRunEstimate | None, size_bytes: int) -> int | None:
+    """Timeout for streaming size_bytes to one destination; None without throughput history."""
+    slow = _slow_throughput(est)
+    if slow is None:
+        return None
+    return _clamp(size_bytes / slow * get_settings().run_timeout_factor)
+
+
+def restore_timeout(est: JobRunEstimate | None, size_bytes: int | None) -> int:
+    """Timeout for restoring an artifact of size_bytes.
+
+    The longer of size_bytes at RESTORE_MIN_THROUGHPUT_BYTES and the job's transfer
+    timeout, at least RUN_TIMEOUT_MIN_SECONDS. Not capped at RUN_TIMEOUT_MAX_SECONDS:
+    a restore of a large database must not be killed for taking a day.
+    """
+    settings = get_settings()
+    size = size_bytes or 0
+    seconds = max(settings.run_timeout_min_seconds, size / settings.restore_min_throughput_bytes)
+    slow = _slow_throughput(est)
+    if slow is not None:
+        seconds = max(seconds, size / slow * settings.run_timeout_factor)
+    return int(seconds)
+
+
+def as_dict(est: JobRunEstimate) -> dict:
+    return {
+        "backup_level": est.backup_level or None,
+        "samples": est.samples,
+        "duration_mean": est.duration_mean,
+        "duration_stddev": math.sqrt(max(est.duration_var or 0.0, 0.0)),
+        "duration_p99": duration_p99(est),
+        "size_mean": est.size_mean,
+        "throughput_samples": est.throughput_samples,
+        "throughput_mean": est.throughput_mean,
+        "throughput_stddev": math.sqrt(max(est.throughput_var or 0.0, 0.0)),
+        "produce_timeout": produce_timeout(est),
+        "updated_at": est.updated_at,
+    }
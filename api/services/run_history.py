@@ -0,0 +1,110 @@
+"""Run history archival into backup_run_archive and run_daily_rollup."""
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.config import get_settings
+from api.services.partitions import maintain_monthly_partitions
+
+ARCHIVE_COLUMNS = (
+    "id, job_id, server_id, status, started_at, finished_at, size_bytes, error_message, "
+    "triggered_by, retry_count, log_line_count, created_at"
+)
+
+# Rows of artifacts deleted (by rotation, or a re-produce) longer ago than the cutoff; those still
+# the parent of a kept artifact stay. Their runs can then be archived.
+_PURGE_DELETED_ARTIFACTS = text("""
+    DELETE FROM backup_artifact
+    WHERE id IN (
+        SELECT a.id FROM backup_artifact a
+        WHERE a.is_deleted AND a.deleted_at < :cutoff
+          AND NOT EXISTS (
+              SELECT 1 FROM backup_artifact c
+              WHERE c.parent_artifact_id = a.id AND NOT (c.is_deleted AND c.deleted_at < :cutoff)
+          )
+        LIMIT :batch
+        FOR UPDATE SKIP LOCKED
+    )
+""")
+
+# One batch: move rows, write the archive and add to the rollups
+_ARCHIVE_BATCH = text(f"""
+    WITH moved AS (
+        DELETE FROM backup_run
+        WHERE id IN (
+            SELECT r.id FROM backup_run r
+            WHERE r.created_at < :cutoff
+              AND r.status IN ('success', 'failed', 'partial', 'cancelled', 'skipped')
+              AND NOT EXISTS (SELECT 1 FROM backup_artifact a WHERE a.run_id = r.id)
+            ORDER BY r.created_at
+            LIMIT :batch
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING {ARCHIVE_COLUMNS}
+    ),
+    archived AS (
+        INSERT INTO backup_run_archive ({ARCHIVE_COLUMNS}, archived_at)
+        SELECT {ARCHIVE_COLUMNS}, now() FROM moved
+        WHERE created_at >= :keep_after  -- older ones are only rolled up
+        RETURNING 1
+    ),
+    rolled AS (
+        INSERT INTO run_daily_rollup (day, job_id, server_id, status, runs, size_bytes, duration_seconds)
+        SELECT (created_at AT TIME ZONE 'UTC')::date, job_id, server_id, status, count(*),
+               coalesce(sum(size_bytes), 0),
+               coalesce(sum(extract(epoch FROM finished_at - started_at)), 0)
+        FROM moved
+        GROUP BY 1, 2, 3, 4
+        ON CONFLICT (day, job_id, server_id, status) DO UPDATE SET
+            runs = run_daily_rollup.runs + excluded.runs,
+            size_bytes = run_daily_rollup.size_bytes + excluded.size_bytes,
+            duration_seconds = run_daily_rollup.duration_seconds + excluded.duration_seconds
+    )
+    SELECT count(*) FROM moved
+""")
+
+
+async def archive_runs(db: AsyncSession, max_batches: int = 20) -> dict:
+    """Maintain archive partitions and move old runs in batches. Commits after each batch."""
+    settings = get_settings()
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(days=settings.run_archive_after_days)
+    keep_after = (
+        now - timedelta(days=settings.run_archive_retention_days) if settings.run_archive_retention_days > 0
+        else datetime.min.replace(tzinfo=timezone.utc)
+    )
+    oldest = None
+    if settings.run_archive_after_days > 0:
+        # Archived runs are old by definition: their months need partitions too
+        oldest = (await db.execute(
+            text("SELECT min(created_at) FROM backup_run WHERE created_at < :cutoff"), {"cutoff": cutoff},
+        )).scalar()
+        oldest = max(oldest, keep_after) if oldest else None
+    partitions = await maintain_monthly_partitions(
+        db, "backup_run_archive", months_ahead=2, retention_days=settings.run_archive_retention_days, since=oldest,
+    )
+    await db.commit()
+
+    archived = purged = 0
+    if settings.run_archive_after_days > 0:
+        for _ in range(max_batches):
+            deleted = (await db.execute(
+                _PURGE_DELETED_ARTIFACTS, {"cutoff": cutoff, "batch": settings.run_archive_batch_size},
+            )).rowcount
+            await db.commit()
+            purged += deleted
+            if deleted < settings.run_archive_batch_size:
+                break
+        for _ in range(max_batches):
+            moved = (await db.execute(
+                _ARCHIVE_BATCH,
+                {"cutoff": cutoff, "keep_after": keep_after, "batch": settings.run_archive_batch_size},
+            )).scalar() or 0
+            await db.commit()
+            archived += moved
+            if moved < settings.run_archive_batch_size:
+                break
+
+    return {"archived": archived, "purged_artifacts": purged, **partitions}
@@ -0,0 +1,142 @@
+"""Run leases and the stuck-run reaper."""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, update, func, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.config import get_settings
+from api.models.backup_job import BackupJob
+from api.models.backup_run import BackupRun
+
+logger = logging.getLogger(__name__)
+
+# Runs from before leases existed are reaped after the longest executor timeout
+LEGACY_RUN_TIMEOUT = timedelta(hours=3)
+
+
+def lease_values() -> dict:
+    now = datetime.now(timezone.utc)
+    return {"heartbeat_at": now, "lease_expires_at": now + timedelta(seconds=get_settings().run_lease_seconds)}
+
+
+async def renew_lease(db: AsyncSession, run_id) -> bool:
+    """Extend the lease of a running run. False once the run is no longer running."""
+    result = await db.execute(
+        update(BackupRun)
+        .where(BackupRun.id == run_id, BackupRun.status == "running")
+        .values(**lease_values())
+    )
+    await db.commit()
+    return result.rowcount > 0
+
+
+def _active_task_ids() -> set[str] | None:
+    """Ids of tasks executing on live workers, or None when no worker answered."""
+    from api.tasks.celery_app import celery_app
+
+    replies = celery_app.control.inspect(timeout=2.0).active()
+    if not replies:
+        return None
+    return {t["id"] for tasks in replies.values() for t in tasks}
+
+
+def _task_states(task_ids: list[str]) -> dict[str, str]:
+    """Result-backend state of each task (blocking: one backend read per task)."""
+    from celery.result import AsyncResult
+
+    return {task_id: AsyncResult(task_id).state for task_id in task_ids}
+
+
+async def fail_and_maybe_rerun(db: AsyncSession, run: BackupRun, reason: str) -> bool:
+    """Mark a lost run failed and queue the attempt that resumes it. Returns True if rerun."""
+    from api.services.overlap import release
+    from api.tasks.backup_tasks import run_backup_task
+
+    run.status = "failed"
+    run.error_message = reason
+    run.finished_at = datetime.now(timezone.utc)
+    run.lease_expires_at = None
+    try:
+        # Let the job's next run start without waiting for the job lease to expire too
+        await release(run.job_id, run.id)
+    except Exception as e:
+        logger.warning(f"Could not release the lease of job {run.job_id}: {e}")
+
+    rerun = False
+    if run.triggered_by != "restore":
+        job = (await db.execute(select(BackupJob).where(BackupJob.id == run.job_id))).scalar_one_or_none()
+        rerun = bool(job and job.is_active and run.retry_count < job.max_retries)
+    if rerun:
+        from api.services.run_stages import mark_retry_queued
+        mark_retry_queued(run, run.retry_count + 1)
+    await db.commit()
+    if rerun:
+        run_backup_task.apply_async(
+            args=[str(run.job_id)], kwargs={"attempt": run.retry_count + 1, "run_id": str(run.id)},
+        )
+    logger.warning(f"Run {run.id} lost: {reason}" + ("; rerun queued" if rerun else ""))
+    return rerun
+
+
+async def reap_expired_runs(db: AsyncSession) -> dict:
+    now = datetime.now(timezone.utc)
+    result = await db.execute(
+        select(BackupRun).where(
+            BackupRun.status == "running",
+            or_(
+                BackupRun.lease_expires_at < now,
+                and_(BackupRun.lease_expires_at.is_(None), BackupRun.started_at < now - LEGACY_RUN_TIMEOUT),
+            ),
+        )
+    )
+    expired = result.scalars().all()
+    if not expired:
+        return {"expired": 0, "failed": 0, "rerun": 0}
+
+    active = await asyncio.to_thread(_active_task_ids)
+    states = await asyncio.to_thread(_task_states, [run.task_id for run in expired if run.task_id])
+    failed = rerun = 0
+    for run in expired:
+        state = states.get(run.task_id)
+        if active is not None and run.task_id in active:
+            # Alive but not renewing (e.g. the database was unreachable): leave it be
+            logger.warning(f"Run {run.id} has an expired lease but task {run.task_id} is active on a worker")
+            continue
+        if state in ("SUCCESS", "FAILURE", "REVOKED"):
+            reason = f"Task ended ({state}) without recording the outcome"
+        else:
+            reason = f"Worker {run.worker or 'unknown'} stopped renewing the lease"
+        failed += 1
+        rerun += await fail_and_maybe_rerun(db, run, reason)
+    return {"expired": len(expired), "failed": failed, "rerun": rerun}
+
+
+async def claim_delivery(db: AsyncSession, task_id: str, attempt: int) -> bool:
+    """False when this task message already produced a run (a redelivery after acks_late).
+
+    An earlier run that is still running with an expired lease was lost with its
+    worker; it is reaped here, which queues the rerun when that is safe.
+    """
+    earlier = (await db.execute(
+        select(BackupRun).where(BackupRun.task_id == task_id, BackupRun.retry_count >= attempt).limit(1)
+    )).scalar_one_or_none()
+    if earlier is None:
+        return True
+    if earlier.status == "running" and earlier.lease_expires_at and earlier.lease_expires_at < datetime.now(timezone.utc):
+        await fail_and_maybe_rerun(db, earlier, "Worker lost; task message was redelivered")
+    logger.info(f"Ignoring redelivered task {task_id}: run {earlier.id} is {earlier.status}")
+    return False
+
+
+async def count_active(db: AsyncSession) -> int:
+    """Runs that are running with a live lease (what the dashboard and metrics report)."""
+    now = datetime.now(timezone.utc)
+    return (await db.execute(
+        select(func.count()).select_from(BackupRun).where(
+            BackupRun.status == "running",
+            or_(BackupRun.lease_expires_at >= now, BackupRun.lease_expires_at.is_(None)),
+        )
+    )).scalar() or 0
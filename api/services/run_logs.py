@@ -0,0 +1,141 @@
+"""Run log store: append-only, zlib-compressed NDJSON chunks in run_log_chunk."""
+
+import json
+import uuid
+import zlib
+from datetime import datetime, timezone
+
+from sqlalchemy import select, update, func, text, cast
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.models.backup_run import BackupRun
+from api.models.run_log_chunk import RunLogChunk
+
+CHUNK_LINES = 500
+SEARCH_CONFIG = "simple"
+# A tsvector is limited to 1 MB; a chunk's text is cut well below that
+SEARCH_TEXT_LIMIT = 256 * 1024
+
+
+def encode_chunk(lines: list[dict]) -> bytes:
+    return zlib.compress("\n".join(json.dumps(l, separators=(",", ":")) for l in lines).encode())
+
+
+def decode_chunk(data: bytes) -> list[dict]:
+    return [json.loads(l) for l in zlib.decompress(data).decode().split("\n") if l]
+
+
+def search_config():
+    return cast(SEARCH_CONFIG, REGCONFIG)
+
+
+def search_text(lines: list[dict]) -> str:
+    """The text of a chunk that goes into its tsvector."""
+    return "\n".join(str(l.get("msg", "")) for l in lines).replace("\x00", "")[:SEARCH_TEXT_LIMIT]
+
+
+class RunLogWriter:
+    """Buffers lines of one run and appends them as chunks on flush. Caller commits."""
+
+    def __init__(self, run_id: uuid.UUID, next_line: int = 0, next_seq: int = 0):
+        self.run_id = run_id
+        self.next_line = next_line
+        self.next_seq = next_seq
+        self._buffer: list[dict] = []
+
+    @classmethod
+    async def resume(cls, db: AsyncSession, run_id: uuid.UUID) -> "RunLogWriter":
+        """A writer that appends after whatever the run has logged already."""
+        seq, lines = (await db.execute(
+            select(func.max(RunLogChunk.seq), func.max(RunLogChunk.first_line + RunLogChunk.line_count))
+            .where(RunLogChunk.run_id == run_id)
+        )).one()
+        return cls(run_id, next_line=lines or 0, next_seq=(seq + 1) if seq is not None else 0)
+
+    def append(self, level: str, msg: str, ts: str | None = None):
+        self._buffer.append({"ts": ts or datetime.now(timezone.utc).isoformat(), "level": level, "msg": msg})
+
+    def extend(self, lines: list[dict]):
+        self._buffer.extend(lines)
+
+    async def flush(self, db: AsyncSession):
+        while self._buffer:
+            lines, self._buffer = self._buffer[:CHUNK_LINES], self._buffer[CHUNK_LINES:]
+            db.add(RunLogChunk(
+                run_id=self.run_id,
+                seq=self.next_seq,
+                first_line=self.next_line,
+                line_count=len(lines),
+                data=encode_chunk(lines),
+                search=func.to_tsvector(search_config(), search_text(lines)),
+            ))
+            self.next_seq += 1
+            self.next_line += len(lines)
+            await db.execute(
+                update(BackupRun).where(BackupRun.id == self.run_id).values(log_line_count=self.next_line)
+            )
+
+
+async def write_lines(db: AsyncSession, run_id: uuid.UUID, lines: list[dict]):
+    """Append lines to a run's log. Caller commits."""
+    if lines:
+        writer = await RunLogWriter.resume(db, run_id)
+        writer.extend(lines)
+        await writer.flush(db)
+
+
+async def read_lines(db: AsyncSession, run_id: uuid.UUID, start: int, limit: int) -> list[dict]:
+    """Lines start .. start + limit - 1, each with its line number as "n"."""
+    end = start + limit
+    result = await db.execute(
+        select(RunLogChunk.first_line, RunLogChunk.data)
+        .where(
+            RunLogChunk.run_id == run_id,
+            RunLogChunk.first_line < end,
+            RunLogChunk.first_line + RunLogChunk.line_count > start,
+        )
+        .order_by(RunLogChunk.seq)
+    )
+    out = []
+    for first_line, data in result.all():
+        for i, line in enumerate(decode_chunk(data), start=first_line):
+            if start <= i < end:
+                out.append({"n": i, **line})
+    return out
+
+
+async def read_chunks_after(db: AsyncSession, run_id: uuid.UUID, seq: int) -> tuple[list[dict], int]:
+    """Lines of every chunk after seq, and the last seq seen (for live tailing)."""
+    result = await db.execute(
+        select(RunLogChunk.seq, RunLogChunk.first_line, RunLogChunk.data)
+        .where(RunLogChunk.run_id == run_id, RunLogChunk.seq > seq)
+        .order_by(RunLogChunk.seq)
+    )
+    out = []
+    for seq, first_line, data in result.all():
+        out += [{"n": i, **line} for i, line in enumerate(decode_chunk(data), start=first_line)]
+    return out, seq
+
+
+async def index_unindexed_chunks(db: AsyncSession, batch: int = 500) -> int:
+    """Compute the tsvector of up to batch chunks written before search existed. Commits."""
+    rows = (await db.execute(
+        select(RunLogChunk.run_id, RunLogChunk.seq, RunLogChunk.data)
+        .where(RunLogChunk.search.is_(None))
+        .order_by(RunLogChunk.created_at)
+        .limit(batch)
+    )).all()
+    if rows:
+        await db.execute(
+            text(
+                "UPDATE run_log_chunk SET search = to_tsvector(CAST(:config AS regconfig), :body) "
+                "WHERE run_id = :run_id AND seq = :seq"
+            ),
+            [
+                {"config": SEARCH_CONFIG, "body": search_text(decode_chunk(data)), "run_id": run_id, "seq": seq}
+                for run_id, seq, data in rows
+            ],
+        )
+        await db.commit()
+    return len(rows)
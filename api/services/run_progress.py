@@ -0,0 +1,95 @@
+"""Live run progress, kept in Redis while a backup runs."""
+
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+import redis.asyncio as aioredis
+
+from api.config import get_settings
+
+PROGRESS_INTERVAL = 2.0
+PROGRESS_TTL = 3600
+
+
+def progress_key(run_id) -> str:
+    return f"vm:run:{run_id}:progress"
+
+
+async def read_progress(client, run_id) -> dict | None:
+    raw = await client.get(progress_key(run_id))
+    return json.loads(raw) if raw else None
+
+
+async def get_progress(run_id) -> dict | None:
+    client = aioredis.from_url(get_settings().redis_url)
+    try:
+        return await read_progress(client, run_id)
+    finally:
+        await client.aclose()
+
+
+class ProgressReporter:
+    """Publishes one run's progress. Use as an async context manager."""
+
+    def __init__(self, run_id):
+        self.run_id = run_id
+        self.state: dict = {}
+        self._client = None
+        self._last_write = 0.0
+        self._phase_started = time.monotonic()
+        self._phase_bytes = 0
+
+    async def __aenter__(self):
+        self._client = aioredis.from_url(get_settings().redis_url)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._client.aclose()
+
+    async def _write(self):
+        self.state["updated_at"] = datetime.now(timezone.utc).isoformat()
+        self._last_write = time.monotonic()
+        await self._client.set(progress_key(self.run_id), json.dumps(self.state), ex=PROGRESS_TTL)
+
+    async def stage(self, stage: str, total_bytes: int | None = None, expected_seconds: float | None = None,
+                    timeout: int | None = None, **extra):
+        """Enter a stage; expected_seconds (from the job's estimate) gives the ETA until bytes flow."""
+        now = datetime.now(timezone.utc)
+        self._phase_started = time.monotonic()
+        self._phase_bytes = 0
+        self.state = {
+            "stage": stage,
+            "started_at": now.isoformat(),
+            "bytes": 0,
+            "total_bytes": total_bytes,
+            "rate": None,
+            "eta": (now + timedelta(seconds=expected_seconds)).isoformat() if expected_seconds else None,
+            "timeout": timeout,
+            **extra,
+        }
+        await self._write()
+
+    async def advance(self, nbytes: int):
+        """Count bytes moved; written out at most every PROGRESS_INTERVAL seconds."""
+        self._phase_bytes += nbytes
+        self.state["bytes"] = self.state.get("bytes", 0) + nbytes
+        if time.monotonic() - self._last_write < PROGRESS_INTERVAL:
+            return
+        elapsed = time.monotonic() - self._phase_started
+        rate = self._phase_bytes / elapsed if elapsed > 0 else None
+        self.state["rate"] = rate
+        total = self.state.get("total_bytes")
+        if rate and total:
+            remaining = max(total - self.state["bytes"], 0)
+            self.state["eta"] = (datetime.now(timezone.utc) + timedelta(seconds=remaining / rate)).isoformat()
+        await self._write()
+
+    async def update(self, **fields):
+        self.state.update(fields)
+        await self._write()
+
+    def rate(self) -> float | None:
+        """Average bytes/s of the current stage so far."""
+        elapsed = time.monotonic() - self._phase_started
+        return self._phase_bytes / elapsed if self._phase_bytes and elapsed > 0 else None
@@ -0,0 +1,398 @@
+"""Staged backup runs: produce → transfer (per destination) → rotate → notify → done."""
+
+import asyncio
+import copy
+import hashlib
+import logging
+import shlex
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import String, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.config import get_settings
+from api.models.backup_artifact import BackupArtifact
+from api.models.backup_run import BackupRun
+from api.models.retention_policy import RetentionPolicy
+from api.models.storage_destination import StorageDestination
+from api.services.cancellation import RunCancelled, check_cancelled, run_cancellable
+from api.services.rclone_client import upload_stream
+from api.services.restore import pipe_through
+from api.services.ssh_client import stream_from_remote_command
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("produce", "transfer", "rotate", "notify", "done")
+# Runs recorded under a job that are not backups of it: restores, and catalog imports
+NON_BACKUP_TRIGGERS = ("restore", "import")
+# Checkpoint key holding the attempt queued to resume a failed or partial run
+QUEUED_ATTEMPT = "queued_attempt"
+
+
+def _checkpoint(run: BackupRun) -> dict:
+    # {"produced": {"files", "size_bytes", "backup_level", "parent_run_id", ...}, "staged": bool,
+    #  "transfers": {dest_id: {"status", "name", "error", "attempts"}}, "rotated": [dest_id, ...]}
+    # JSONB is not change-tracked in place: callers modify a copy and assign it back
+    return copy.deepcopy(run.checkpoint or {})
+
+
+def produced_files(result: dict) -> list[dict]:
+    """The files an executor result describes (one per Docker volume, or the single dump)."""
+    files = result.get("files") or (
+        [result] if result.get("filename") and result.get("checksum_sha256") else []
+    )
+    return [
+        {
+            "filename": f["filename"],
+            "remote_path": f.get("remote_path", ""),
+            "size_bytes": f.get("size_bytes", 0),
+            "checksum_sha256": f["checksum_sha256"],
+        }
+        for f in files
+    ]
+
+
+def record_produced(run: BackupRun, result: dict, seconds: float | None = None):
+    """Checkpoint a successful produce stage that took ``seconds``. Caller commits."""
+    checkpoint = _checkpoint(run)
+    checkpoint["produced"] = {
+        "files": produced_files(result),
+        "size_bytes": result.get("size_bytes", 0),
+        "backup_level": result.get("backup_level"),
+        "parent_run_id": result.get("parent_run_id"),
+        "seconds": seconds,
+    }
+    checkpoint["staged"] = True
+    checkpoint["transfers"] = {}
+    checkpoint["rotated"] = []
+    run.checkpoint = checkpoint
+    run.size_bytes = result.get("size_bytes", 0)
+    run.stage = "transfer"
+
+
+def mark_retry_queued(run: BackupRun, attempt: int):
+    """Record that ``attempt`` is queued to resume the run. Caller commits."""
+    checkpoint = _checkpoint(run)
+    checkpoint[QUEUED_ATTEMPT] = attempt
+    run.checkpoint = checkpoint
+
+
+async def claim_retry(db: AsyncSession, run_id: uuid.UUID) -> bool:
+    """Take a failed or partial run for the attempt that resumes it. Commits.
+
+    False when another message (a redelivery, a second retry) got there first.
+    """
+    claimed = (await db.execute(
+        update(BackupRun)
+        .where(BackupRun.id == run_id, BackupRun.status.in_(("failed", "partial")))
+        .values(status="running", checkpoint=BackupRun.checkpoint.op("-")(literal(QUEUED_ATTEMPT, String)))
+        .returning(BackupRun.id)
+        .execution_options(synchronize_session=False)
+    )).scalar_one_or_none()
+    await db.commit()
+    return claimed is not None
+
+
+def can_reuse_produced(run: BackupRun) -> bool:
+    """Whether the produced files are still staged on the source server."""
+    checkpoint = run.checkpoint or {}
+    return "produced" in checkpoint and checkpoint.get("staged", False)
+
+
+def keeps_staged(run: BackupRun) -> bool:
+    """A run that still has to transfer keeps its staged files for the retry."""
+    return run.status in ("failed", "partial") and run.stage == "transfer" and can_reuse_produced(run)
+
+
+def mark_unstaged(run: BackupRun):
+    """The staging directory is gone: a later retry has to produce again."""
+    checkpoint = _checkpoint(run)
+    if checkpoint.get("staged"):
+        checkpoint["staged"] = False
+        run.checkpoint = checkpoint
+    if run.stage == "transfer":
+        run.stage = "produce"
+
+
+async def discard_transfers(db: AsyncSession, run: BackupRun) -> int:
+    """Before producing again: retire the artifacts of the earlier produce. Caller commits.
+
+    The new files replace them on every destination; keeping both would give the
+    run two generations (and an incremental chain two links for one run).
+    """
+    artifacts = (await db.execute(
+        select(BackupArtifact).where(BackupArtifact.run_id == run.id, BackupArtifact.is_deleted == False)
+    )).scalars().all()
+    now = datetime.now(timezone.utc)
+    for artifact in artifacts:
+        artifact.is_deleted = True
+        artifact.deleted_at = now
+    checkpoint = _checkpoint(run)
+    checkpoint.pop("produced", None)
+    checkpoint["transfers"], checkpoint["rotated"] = {}, []
+    run.checkpoint = checkpoint
+    return len(artifacts)
+
+
+def storage_path(server, job, filename: str) -> str:
+    """Object path of a produced file inside a destination."""
+    prefix = (job.source_config or {}).get("subdir") or f"{server.name}/{job.name}"
+    return f"{prefix.strip('/')}/{filename}" + (".age" if job.encrypt else "")
+
+
+async def _hashed(chunks, digest, progress=None):
+    async for chunk in chunks:
+        await asyncio.to_thread(digest.update, chunk)
+        if progress is not None:
+            await progress.advance(len(chunk))
+        yield chunk
+
+
+async def transfer_file(server, job, dest: StorageDestination, f: dict, progress=None) -> dict:
+    """Stream one staged file to dest. Returns the stored object's path, size and sha256.
+
+    ``progress`` (a run_progress.ProgressReporter) counts the bytes as they are read.
+    """
+    settings = get_settings()
+    path = storage_path(server, job, f["filename"])
+    chunks = stream_from_remote_command(
+        server, f"cat {shlex.quote(f['remote_path'])}", chunk_size=settings.verify_chunk_size,
+    )
+    if job.encrypt:
+        if not settings.age_public_key:
+            raise RuntimeError("Job is encrypted but AGE_PUBLIC_KEY is not configured")
+        chunks = pipe_through(["age", "-r", settings.age_public_key], chunks)
+    digest = hashlib.sha256()
+    size = await upload_stream(dest, path, _hashed(chunks, digest, progress))
+    checksum = digest.hexdigest()
+    if not job.encrypt and checksum != f["checksum_sha256"].lower():
+        raise RuntimeError(f"{f['filename']} changed in transit: sha256 {checksum}, expected {f['checksum_sha256']}")
+    return {"remote_path": path, "size_bytes": size, "checksum_sha256": checksum}
+
+
+async def _parent_artifact_id(db: AsyncSession, parent_run_id: str | None, dest_id) -> uuid.UUID | None:
+    if not parent_run_id:
+        return None
+    return (await db.execute(
+        select(BackupArtifact.id).where(
+            BackupArtifact.run_id == uuid.UUID(parent_run_id),
+            BackupArtifact.storage_id == dest_id,
+            BackupArtifact.is_deleted == False,
+        ).limit(1)
+    )).scalar_one_or_none()
+
+
+async def plan_level(db: AsyncSession, server, job) -> dict:
+    """The level of the next file backup, forced to a full unless every destination holds the parent.
+
+    A destination added to the job after the last full, or one whose copy of the
+    parent was deleted, could otherwise only get an incremental without a base.
+    """
+    from api.services.backup_executor import plan_backup_level, reset_incremental_chain
+
+    plan = await plan_backup_level(server, job)
+    if not plan["parent_run_id"]:
+        return plan
+    held = set((await db.execute(
+        select(BackupArtifact.storage_id).where(
+            BackupArtifact.run_id == uuid.UUID(plan["parent_run_id"]),
+            BackupArtifact.is_deleted == False,
+        )
+    )).scalars().all())
+    if all(uuid.UUID(str(d)) in held for d in job.destination_ids or []):
+        return plan
+    logger.warning(f"Parent run {plan['parent_run_id']} of job {job.id} is not on every destination; taking a full")
+    await reset_incremental_chain(server, job)
+    return {"level": "full", "parent_run_id": None}
+
+
+async def transfer(db: AsyncSession, run: BackupRun, job, server, writer, progress=None, estimate=None) -> list[str]:
+    """Upload the produced files to every destination that does not have them yet.
+
+    With the job's ``estimate`` each destination gets an adaptive timeout, and its
+    throughput becomes a new sample. Commits after each destination. Returns the
+    ids of destinations that failed.
+    """
+    from api.services.run_estimates import add_throughput_sample, transfer_timeout
+
+    produced = (run.checkpoint or {})["produced"]
+    files = produced["files"]
+    dest_ids = [str(d) for d in (job.destination_ids or [])]
+    if files and not dest_ids:
+        writer.append("warning", "Job has no storage destinations; nothing was stored")
+
+    total = sum(f["size_bytes"] or 0 for f in files)
+    failed, broken_chain = [], False
+    moved_bytes, moved_seconds = 0, 0.0
+    for dest_id in dest_ids if files else []:
+        state = (run.checkpoint.get("transfers") or {}).get(dest_id, {})
+        if state.get("status") == "done":
+            continue
+        dest = (await db.execute(
+            select(StorageDestination).where(StorageDestination.id == uuid.UUID(dest_id))
+        )).scalar_one_or_none()
+        attempts = state.get("attempts", 0) + 1
+        try:
+            if dest is None:
+                raise RuntimeError("Storage destination not found")
+            timeout = transfer_timeout(estimate, total) if total else None
+            writer.append("info", f"Transferring {len(files)} file(s) to {dest.name}" + (
+                f" (timeout {timeout}s)" if timeout else ""
+            ))
+            if progress is not None:
+                await progress.stage("transfer", total_bytes=total, timeout=timeout, destination=dest.name)
+            started = time.monotonic()
+
+            async def send_all():
+                return [await transfer_file(server, job, dest, f, progress) for f in files]
+
+            try:
+                stored = await run_cancellable(server, run.id, asyncio.wait_for(send_all(), timeout))
+            except asyncio.TimeoutError:
+                raise RuntimeError(f"No complete copy after {timeout}s (expected well within that from earlier runs)")
+            moved_bytes += sum(o["size_bytes"] for o in stored)
+            moved_seconds += time.monotonic() - started
+
+            parent_id = await _parent_artifact_id(db, produced.get("parent_run_id"), dest.id)
+            if produced.get("parent_run_id") and parent_id is None:
+                # Never catalog an incremental without its base; the retry produces a full
+                broken_chain = True
+                raise RuntimeError(f"Parent run {produced['parent_run_id']} is no longer stored here")
+            for f, obj in zip(files, stored):
+                db.add(BackupArtifact(
+                    run_id=run.id,
+                    storage_id=dest.id,
+                    filename=f["filename"],
+                    remote_path=obj["remote_path"],
+                    size_bytes=obj["size_bytes"],
+                    checksum_sha256=obj["checksum_sha256"],
+                    is_encrypted=job.encrypt,
+                    backup_type=job.backup_type,
+                    tags=job.tags,
+                    domain=job.domain,
+                    db_name=job.source_config.get("db_name"),
+                    server_name=server.name,
+                    backup_level=produced.get("backup_level"),
+                    parent_artifact_id=parent_id,
+                ))
+            state = {"status": "done", "name": dest.name, "attempts": attempts}
+            writer.append("info", f"Stored on {dest.name} ({sum(o['size_bytes'] for o in stored):,} bytes)")
+        except RunCancelled:
+            raise
+        except Exception as e:
+            name = dest.name if dest else dest_id
+            state = {"status": "failed", "name": name, "error": str(e)[:2000], "attempts": attempts}
+            failed.append(dest_id)
+            writer.append("error", f"Transfer to {name} failed: {e}")
+            logger.warning(f"Run {run.id}: transfer to {name} failed: {e}")
+
+        checkpoint = _checkpoint(run)
+        checkpoint.setdefault("transfers", {})[dest_id] = state
+        run.checkpoint = checkpoint
+        await writer.flush(db)
+        await db.commit()
+
+    if estimate is not None and moved_bytes and moved_seconds > 0:
+        add_throughput_sample(estimate, moved_bytes / moved_seconds)
+    if broken_chain:
+        # A destination lost the parent since the level was planned: start over
+        from api.services.backup_executor import reset_incremental_chain
+        logger.warning(f"Incremental chain for job {job.id} is incomplete; next backup will be full")
+        await reset_incremental_chain(server, job)
+        mark_unstaged(run)
+        await db.commit()
+    return failed
+
+
+def transferred_destinations(run: BackupRun) -> list[str]:
+    transfers = (run.checkpoint or {}).get("transfers") or {}
+    return [d for d, state in transfers.items() if state.get("status") == "done"]
+
+
+async def rotate(db: AsyncSession, run: BackupRun, job):
+    """Apply each destination's retention policy once it holds this run's artifacts. Caller commits.
+
+    Raises RunCancelled when the run is cancelled (rotation is idempotent; nothing to undo).
+    """
+    from api.services.rotation import apply_rotation
+
+    checkpoint = _checkpoint(run)
+    rotated = checkpoint.setdefault("rotated", [])
+    overrides = job.retention_overrides or {}
+    for dest_id in transferred_destinations(run):
+        if dest_id in rotated:
+            continue
+        # Between destinations: a cancel must not end up recorded as a success
+        await check_cancelled(run.id)
+        # Use override policy if set, otherwise fall back to job default
+        policy_id = overrides.get(dest_id, str(job.retention_id) if job.retention_id else None)
+        if policy_id:
+            policy = (await db.execute(
+                select(RetentionPolicy).where(RetentionPolicy.id == uuid.UUID(policy_id))
+            )).scalar_one_or_none()
+            if policy:
+                await apply_rotation(db, policy, str(job.id), storage_id=dest_id)
+        rotated.append(dest_id)
+    run.checkpoint = checkpoint
+
+
+def outcome(run: BackupRun, job) -> str:
+    """success, partial or failed, from the transfer checkpoint."""
+    produced = (run.checkpoint or {}).get("produced") or {}
+    dest_ids = [str(d) for d in (job.destination_ids or [])]
+    if not produced.get("files") or not dest_ids:
+        return "success"
+    done = set(transferred_destinations(run))
+    stored = sum(1 for d in dest_ids if d in done)
+    if stored == len(dest_ids):
+        return "success"
+    return "partial" if stored else "failed"
+
+
+def failed_transfers(run: BackupRun) -> dict[str, str]:
+    """{destination name: error} of the destinations whose last transfer failed."""
+    transfers = (run.checkpoint or {}).get("transfers") or {}
+    return {s.get("name", d): s.get("error") for d, s in transfers.items() if s.get("status") == "failed"}
+
+
+def finish(run: BackupRun, status: str):
+    run.status = status
+    run.finished_at = datetime.now(timezone.utc)
+    if status == "success":
+        run.error_message = None
+    elif status in ("partial", "failed") and failed_transfers(run):
+        run.error_message = "; ".join(f"{name}: {e}" for name, e in failed_transfers(run).items())[:2000]
+
+
+async def expire_staged(db: AsyncSession) -> int:
+    """Remove staged files of unfinished runs after RUN_STAGED_RETENTION_HOURS. Commits per run.
+
+    A retry after that produces the backup again.
+    """
+    from api.models.server import Server
+    from api.services.cancellation import cleanup_run
+
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=get_settings().run_staged_retention_hours)
+    runs = (await db.execute(
+        select(BackupRun).where(
+            BackupRun.status.in_(("failed", "partial")),
+            BackupRun.stage == "transfer",
+            BackupRun.finished_at < cutoff,
+            BackupRun.checkpoint["staged"].as_boolean() == True,
+        )
+    )).scalars().all()
+    expired = 0
+    for run in runs:
+        server = (await db.execute(select(Server).where(Server.id == run.server_id))).scalar_one_or_none()
+        try:
+            if server:
+                await cleanup_run(server, run.id)
+        except Exception as e:
+            logger.warning(f"Could not remove staged files of run {run.id}: {e}")
+            continue
+        mark_unstaged(run)
+        await db.commit()
+        expired += 1
+    return expired
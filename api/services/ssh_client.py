@@ -1,13 +1,51 @@
 import asyncio
 import logging
+import shlex
+from contextvars import ContextVar
 from datetime import datetime, timezone
 
 import asyncssh
 
+from api.services.encryption import decrypt_value
+
 logger = logging.getLogger(__name__)
 
 LOCAL_HOSTS = {"127.0.0.1", "localhost", "::1", "0.0.0.0"}
 
+WORK_DIR = "/tmp/vaultmaster"
+
+# Set while a run executes (api.services.cancellation.run_cancellable). Remote
+# commands then start in their own process group, recorded in the run's pid
+# directory while they run, so cancelling the run can signal everything it started.
+current_run_id: ContextVar[str | None] = ContextVar("current_run_id", default=None)
+
+
+def run_work_dir(run_id) -> str:
+    """Remote staging directory of a run."""
+    return f"{WORK_DIR}/{run_id}"
+
+
+def run_pid_dir(run_id) -> str:
+    return f"{WORK_DIR}/.pids/{run_id}"
+
+
+# Start time (in clock ticks since boot) of process $1, so a recycled pid is not mistaken for it
+_START_TIME = "$(cut -d' ' -f22 /proc/$1/stat 2>/dev/null)"
+
+
+def _in_run_group(command: str) -> str:
+    run_id = current_run_id.get()
+    if run_id is None:
+        return command
+    entry = f"{run_pid_dir(run_id)}/$$"
+    # setsid makes the shell a process group leader. It records its pgid (the file
+    # name) and start time, and removes the entry when the command exits or is signalled
+    inner = (
+        f"mkdir -p {run_pid_dir(run_id)} && set -- $$ && echo {_START_TIME} > {entry} && "
+        f"trap 'rm -f {entry}' EXIT && trap 'exit 143' TERM HUP INT && sh -c {shlex.quote(command)}"
+    )
+    return f"setsid -w sh -c {shlex.quote(inner)}"
+
 
 def _resolve_host(host: str) -> str:
     """Rewrite localhost addresses to host.docker.internal so the container can reach the host."""
@@ -35,7 +73,7 @@ def _build_connect_kwargs(server) -> dict:
     key_path = getattr(server, 'ssh_key_path', None)
 
     if auth_type == 'ssh_password':
-        password = meta.get('ssh_password')
+        password = decrypt_value(meta.get('ssh_password'))
         if password:
             kwargs["password"] = password
             if key_path:
@@ -108,6 +146,7 @@ async def run_remote_command(server, command: str, timeout: int = 300) -> tuple[
 
     meta = getattr(server, 'meta', None) or {}
     use_sudo = getattr(server, 'use_sudo', False) or meta.get('use_sudo', False)
+    command = _in_run_group(command)
     if use_sudo and (getattr(server, 'ssh_user', None) or "root") != "root":
         command = f"sudo -n {command}"
 
@@ -116,6 +155,103 @@ async def run_remote_command(server, command: str, timeout: int = 300) -> tuple[
         return result.exit_status, result.stdout, result.stderr
 
 
+async def stream_to_remote_command(server, command: str, chunks, timeout: int | None = None) -> tuple[int, str, str]:
+    """Run a remote command and feed it ``chunks`` (an async iterator of bytes) on stdin.
+
+    The command runs under ``sh -c`` so pipelines work (and under sudo when use_sudo
+    is set). stdout/stderr are drained concurrently and only their tail is kept, so
+    chatty commands cannot stall the upload.
+    """
+    kwargs = _build_connect_kwargs(server)
+
+    meta = getattr(server, 'meta', None) or {}
+    use_sudo = getattr(server, 'use_sudo', False) or meta.get('use_sudo', False)
+    command = _in_run_group(f"sh -c {shlex.quote(command)}")
+    if use_sudo and (getattr(server, 'ssh_user', None) or "root") != "root":
+        command = f"sudo -n {command}"
+
+    async def _drain(reader, buf: bytearray, limit: int = 65536):
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                break
+            buf.extend(data)
+            if len(buf) > limit:
+                del buf[:len(buf) - limit]
+
+    async with asyncssh.connect(**kwargs) as conn:
+        async with conn.create_process(command, encoding=None) as process:
+            out, err = bytearray(), bytearray()
+            drainers = [
+                asyncio.create_task(_drain(process.stdout, out)),
+                asyncio.create_task(_drain(process.stderr, err)),
+            ]
+            try:
+                async for chunk in chunks:
+                    process.stdin.write(chunk)
+                    await process.stdin.drain()
+                process.stdin.write_eof()
+                result = await process.wait(check=False, timeout=timeout)
+                await asyncio.gather(*drainers)
+            finally:
+                for task in drainers:
+                    task.cancel()
+            return result.exit_status, out.decode(errors="replace"), err.decode(errors="replace")
+
+
+async def stream_from_remote_command(server, command: str, chunk_size: int = 8 * 1024 * 1024):
+    """Run a remote command and yield its stdout in chunks (e.g. ``cat`` of a staged file).
+
+    Raises RuntimeError after the last chunk if the command failed, so the caller
+    can discard what it received.
+    """
+    kwargs = _build_connect_kwargs(server)
+
+    meta = getattr(server, 'meta', None) or {}
+    use_sudo = getattr(server, 'use_sudo', False) or meta.get('use_sudo', False)
+    command = _in_run_group(f"sh -c {shlex.quote(command)}")
+    if use_sudo and (getattr(server, 'ssh_user', None) or "root") != "root":
+        command = f"sudo -n {command}"
+
+    async with asyncssh.connect(**kwargs) as conn:
+        async with conn.create_process(command, encoding=None) as process:
+            stderr = asyncio.create_task(process.stderr.read())
+            try:
+                while True:
+                    chunk = await process.stdout.read(chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
+                result = await process.wait(check=False)
+                if result.exit_status != 0:
+                    raise RuntimeError(
+                        f"Remote command failed (exit {result.exit_status}): "
+                        f"{(await stderr).decode(errors='replace').strip()[-2000:]}"
+                    )
+            finally:
+                stderr.cancel()
+
+
+async def kill_run_processes(server, run_id, grace: int = 5):
+    """Signal every process group a run started on the server: TERM, then KILL after grace seconds.
+
+    Entries whose leader has gone (its pid possibly reused since) are skipped.
+    """
+    pids = run_pid_dir(run_id)
+    signal_all = (
+        f'signal_all() {{ s=$1; for f in {pids}/*; do [ -f "$f" ] || continue; set -- "${{f##*/}}"; '
+        f'[ "{_START_TIME}" = "$(cat "$f")" ] && kill -$s -$1 2>/dev/null; done; }}'
+    )
+    script = f"test -d {pids} || exit 0; {signal_all}; signal_all TERM; sleep {grace}; signal_all KILL; rm -rf {pids}"
+    token = current_run_id.set(None)
+    try:
+        exit_code, _, stderr = await run_remote_command(server, f"sh -c {shlex.quote(script)}", timeout=grace + 60)
+    finally:
+        current_run_id.reset(token)
+    if exit_code != 0:
+        logger.warning(f"Could not signal processes of run {run_id} on {server.name}: {stderr.strip()}")
+
+
 async def list_remote_databases(server, db_type: str = "postgresql") -> list[dict]:
     """List databases on a remote server via SSH.
 
@@ -127,7 +263,7 @@ async def list_remote_databases(server, db_type: str = "postgresql") -> list[dic
     db_host = meta.get('db_host', '127.0.0.1')
     db_port = meta.get('db_port', 5432 if db_type == 'postgresql' else 3306)
     db_user = meta.get('db_user', 'postgres' if db_type == 'postgresql' else 'root')
-    db_password = meta.get('db_password', '')
+    db_password = decrypt_value(meta.get('db_password', ''))
 
     try:
         kwargs = _build_connect_kwargs(server)
@@ -0,0 +1,230 @@
+"""Storage usage and listing cache in Redis, served stale while a refresh is queued."""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from datetime import datetime, timezone
+
+import redis.asyncio as aioredis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.config import get_settings
+from api.models.storage_destination import StorageDestination
+from api.services.rclone_client import get_storage_usage, list_storage_directory
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_INTERVAL = 900
+ERROR_TTL = 60  # failed lookups are cached briefly so a broken remote isn't hit on every click
+REFRESH_LOCK_TTL = 300
+FETCH_CONCURRENCY = 4
+
+
+def refresh_interval(backend: str) -> int:
+    """Seconds a cached result stays fresh for a backend."""
+    for entry in get_settings().storage_refresh_intervals.split(","):
+        name, sep, seconds = entry.strip().partition(":")
+        if sep and name == backend and seconds.strip().isdigit():
+            return int(seconds)
+    return DEFAULT_REFRESH_INTERVAL
+
+
+def _normalize(path: str) -> str:
+    return "/" + path.strip("/")
+
+
+def usage_key(storage_id) -> str:
+    return f"vm:storage:{storage_id}:usage"
+
+
+def listing_key(storage_id, path: str) -> str:
+    return f"vm:storage:{storage_id}:ls:{_normalize(path)}"
+
+
+def _failed(data) -> bool:
+    if isinstance(data, dict):
+        return "error" in data
+    return len(data) == 1 and "error" in data[0]
+
+
+async def _read(client: aioredis.Redis, key: str) -> dict | None:
+    raw = await client.get(key)
+    return json.loads(raw) if raw else None
+
+
+async def _write(client: aioredis.Redis, key: str, data) -> dict:
+    entry = {"fetched_at": time.time(), "data": data}
+    ttl = ERROR_TTL if _failed(data) else get_settings().storage_cache_max_age_seconds
+    await client.set(key, json.dumps(entry), ex=ttl)
+    return entry
+
+
+def _meta(entry: dict, stale: bool) -> dict:
+    return {
+        "checked_at": datetime.fromtimestamp(entry["fetched_at"], timezone.utc).isoformat(),
+        "age_seconds": int(time.time() - entry["fetched_at"]),
+        "stale": stale,
+    }
+
+
+async def _request_refresh(client: aioredis.Redis, storage_id, path: str | None):
+    """Queue a background refresh unless one for the same entry is already pending."""
+    key = usage_key(storage_id) if path is None else listing_key(storage_id, path)
+    if await client.set(f"{key}:refreshing", 1, nx=True, ex=REFRESH_LOCK_TTL):
+        from api.tasks.storage_tasks import refresh_storage
+        refresh_storage.delay(str(storage_id), usage=path is None, paths=[path] if path is not None else [])
+
+
+async def _cached(dest: StorageDestination, key: str, path: str | None, fetch, force: bool):
+    client = aioredis.from_url(get_settings().redis_url)
+    try:
+        entry = None if force else await _read(client, key)
+        if entry is None:
+            entry = await _write(client, key, await fetch())
+            return entry, _meta(entry, stale=False)
+        stale = time.time() - entry["fetched_at"] >= refresh_interval(dest.backend)
+        if stale:
+            await _request_refresh(client, dest.id, path)
+        return entry, _meta(entry, stale)
+    finally:
+        await client.aclose()
+
+
+async def get_usage(dest: StorageDestination, force: bool = False) -> dict:
+    """Usage for a destination, from cache when possible."""
+    entry, meta = await _cached(dest, usage_key(dest.id), None, lambda: get_storage_usage(dest), force)
+    return {**entry["data"], **meta}
+
+
+async def get_listing(dest: StorageDestination, path: str = "/", force: bool = False) -> dict:
+    """Directory listing for a destination path, from cache when possible."""
+    path = _normalize(path)
+    entry, meta = await _cached(
+        dest, listing_key(dest.id, path), path, lambda: list_storage_directory(dest, path), force,
+    )
+    return {"path": path, "entries": entry["data"], **meta}
+
+
+async def invalidate(storage_id: uuid.UUID):
+    """Drop everything cached for a destination (after its config changes or it is deleted)."""
+    client = aioredis.from_url(get_settings().redis_url)
+    try:
+        keys = [k async for k in client.scan_iter(match=f"vm:storage:{storage_id}:*", count=500)]
+        if keys:
+            await client.delete(*keys)
+    finally:
+        await client.aclose()
+
+
+def usage_level(percent: float | None) -> str:
+    settings = get_settings()
+    if percent is None:
+        return "ok"
+    if percent > settings.storage_critical_percent:
+        return "critical"
+    if percent > settings.storage_warning_percent:
+        return "warning"
+    return "ok"
+
+
+def _percent(dest: StorageDestination, usage: dict) -> float | None:
+    if usage.get("percent_used") is not None:
+        return usage["percent_used"]
+    if dest.capacity_bytes and dest.used_bytes is not None:
+        return round(dest.used_bytes / dest.capacity_bytes * 100, 1)
+    return None
+
+
+async def _apply_usage(db: AsyncSession, client: aioredis.Redis, dest: StorageDestination, usage: dict):
+    """Store fresh usage on the destination and publish threshold crossings."""
+    from api.tasks.notification_tasks import publish_event
+
+    if _failed(usage):
+        logger.warning(f"Usage check for storage {dest.name} failed: {usage['error']}")
+        return
+    if usage.get("used_bytes") is not None:
+        dest.used_bytes = usage["used_bytes"]
+    dest.last_checked = datetime.now(timezone.utc)
+
+    percent = _percent(dest, usage)
+    level = usage_level(percent)
+    level_key = f"vm:storage:{dest.id}:level"
+    previous = (await client.getset(level_key, level) or b"ok").decode()
+    order = ("ok", "warning", "critical")
+    # Only escalations notify; recovering (or staying at a level) is silent
+    if order.index(level) > order.index(previous):
+        await publish_event(db, f"storage.{level}", {
+            "name": dest.name,
+            "backend": dest.backend,
+            "percent_used": percent,
+            "used_bytes": dest.used_bytes,
+        })
+
+
+async def _fetch(dest: StorageDestination, usage: bool, paths: list[str], sem: asyncio.Semaphore):
+    async with sem:
+        usage_data = await get_storage_usage(dest) if usage else None
+        listings = {p: await list_storage_directory(dest, p) for p in paths}
+    return usage_data, listings
+
+
+async def refresh(db: AsyncSession, dests: list[StorageDestination], usage: bool = True,
+                  paths: list[str] | None = None) -> int:
+    """Fetch usage and listings for dests, update the cache and the rows. Caller commits.
+
+    rclone calls run concurrently; database work happens afterwards, one destination at a time.
+    """
+    paths = [_normalize(p) for p in (["/"] if paths is None else paths)]
+    sem = asyncio.Semaphore(FETCH_CONCURRENCY)
+    results = await asyncio.gather(
+        *(_fetch(d, usage, paths, sem) for d in dests), return_exceptions=True,
+    )
+    client = aioredis.from_url(get_settings().redis_url)
+    refreshed = 0
+    try:
+        for dest, result in zip(dests, results):
+            keys = ([usage_key(dest.id)] if usage else []) + [listing_key(dest.id, p) for p in paths]
+            try:
+                if isinstance(result, Exception):
+                    logger.warning(f"Inventory refresh for storage {dest.name} failed: {result}")
+                    continue
+                usage_data, listings = result
+                if usage_data is not None:
+                    await _write(client, usage_key(dest.id), usage_data)
+                    await _apply_usage(db, client, dest, usage_data)
+                for path, entries in listings.items():
+                    await _write(client, listing_key(dest.id, path), entries)
+                refreshed += 1
+            finally:
+                await client.delete(*(f"{k}:refreshing" for k in keys))
+    finally:
+        await client.aclose()
+    return refreshed
+
+
+async def refresh_due(db: AsyncSession) -> int:
+    """Refresh destinations whose cached usage is older than their backend's interval."""
+    settings = get_settings()
+    result = await db.execute(select(StorageDestination).where(StorageDestination.is_active == True))
+    client = aioredis.from_url(settings.redis_url)
+    due = []
+    try:
+        now = time.time()
+        for dest in result.scalars().all():
+            if len(due) >= settings.storage_refresh_max_per_run:
+                break  # the rest are picked up by the next run
+            entry = await _read(client, usage_key(dest.id))
+            if entry is not None and now - entry["fetched_at"] < refresh_interval(dest.backend):
+                continue
+            # Skip destinations already being refreshed on request
+            if await client.set(f"{usage_key(dest.id)}:refreshing", 1, nx=True, ex=REFRESH_LOCK_TTL):
+                await client.set(f"{listing_key(dest.id, '/')}:refreshing", 1, ex=REFRESH_LOCK_TTL)
+                due.append(dest)
+    finally:
+        await client.aclose()
+    if not due:
+        return 0
+    return await refresh(db, due)
@@ -0,0 +1,168 @@
+"""Artifact checksum verification against the SHA-256 recorded at backup time."""
+
+import asyncio
+import hashlib
+import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.config import get_settings
+from api.models.backup_artifact import BackupArtifact
+from api.models.storage_destination import StorageDestination
+from api.services.rclone_client import stat_object, get_object_hash, stream_object
+
+logger = logging.getLogger(__name__)
+
+_hash_pool: ThreadPoolExecutor | None = None
+
+
+def _get_hash_pool() -> ThreadPoolExecutor:
+    global _hash_pool
+    if _hash_pool is None:
+        _hash_pool = ThreadPoolExecutor(
+            max_workers=get_settings().verify_hash_workers,
+            thread_name_prefix="vm-hash",
+        )
+    return _hash_pool
+
+
+class EgressBudget:
+    """Tracks how many bytes may still be downloaded for verification."""
+
+    def __init__(self, limit_bytes: int | None = None):
+        self.limit_bytes = limit_bytes
+        self.used_bytes = 0
+
+    def try_reserve(self, size: int) -> bool:
+        if self.limit_bytes is not None and self.used_bytes + size > self.limit_bytes:
+            return False
+        self.used_bytes += size
+        return True
+
+
+async def hash_object(dest, path: str, chunk_size: int | None = None) -> tuple[str, int]:
+    """Stream an object from storage and return (sha256_hex, bytes_read)."""
+    chunk_size = chunk_size or get_settings().verify_chunk_size
+    loop = asyncio.get_running_loop()
+    pool = _get_hash_pool()
+    digest = hashlib.sha256()
+    total = 0
+    pending = None
+
+    async for chunk in stream_object(dest, path, chunk_size=chunk_size):
+        # hashlib releases the GIL on large buffers; keep one update in flight
+        # while the next chunk is being read.
+        if pending is not None:
+            await pending
+        pending = loop.run_in_executor(pool, digest.update, chunk)
+        total += len(chunk)
+    if pending is not None:
+        await pending
+
+    return digest.hexdigest(), total
+
+
+async def verify_artifact(artifact: BackupArtifact, dest: StorageDestination, budget: EgressBudget | None = None) -> dict:
+    """Verify a single artifact. Returns {status, method, bytes_read, detail}.
+
+    status is one of: ok, mismatch, missing, error, skipped.
+    """
+    expected = (artifact.checksum_sha256 or "").lower()
+    if not expected:
+        return {"status": "error", "method": None, "bytes_read": 0, "detail": "No checksum recorded"}
+
+    try:
+        info = await stat_object(dest, artifact.remote_path)
+        if info is None:
+            return {"status": "missing", "method": "stat", "bytes_read": 0, "detail": "Object not found"}
+        if info.get("size") is not None and artifact.size_bytes and info["size"] != artifact.size_bytes:
+            return {
+                "status": "mismatch", "method": "size", "bytes_read": 0,
+                "detail": f"Size {info['size']} != expected {artifact.size_bytes}",
+            }
+
+        server_hash = await get_object_hash(dest, artifact.remote_path, "sha256")
+        if server_hash:
+            status = "ok" if server_hash == expected else "mismatch"
+            return {"status": status, "method": "server_hash", "bytes_read": 0, "detail": server_hash}
+
+        if budget is not None:
+            # What the download will cost: the stored size, else the recorded one
+            size = info.get("size")
+            if size is None or size < 0:
+                size = artifact.size_bytes
+            if size is None and budget.limit_bytes is not None:
+                return {"status": "skipped", "method": None, "bytes_read": 0, "detail": "Size unknown; cannot budget the download"}
+            if not budget.try_reserve(size or 0):
+                return {"status": "skipped", "method": None, "bytes_read": 0, "detail": "Egress budget exhausted"}
+
+        actual, bytes_read = await hash_object(dest, artifact.remote_path)
+        status = "ok" if actual == expected else "mismatch"
+        return {"status": status, "method": "download", "bytes_read": bytes_read, "detail": actual}
+
+    except Exception as e:
+        logger.error(f"Verification failed for artifact {artifact.id}: {e}")
+        return {"status": "error", "method": None, "bytes_read": 0, "detail": str(e)}
+
+
+async def verify_artifacts(db: AsyncSession, artifact_ids: list[uuid.UUID], budget: EgressBudget | None = None) -> dict:
+    """Verify many artifacts concurrently, limited per storage destination.
+
+    Stores verified_at/verify_status on each artifact (skipped ones are left untouched).
+    """
+    if not artifact_ids:
+        return {"verified": 0, "ok": 0, "failed": 0, "skipped": 0, "bytes_read": 0, "results": []}
+
+    result = await db.execute(select(BackupArtifact).where(BackupArtifact.id.in_(artifact_ids)))
+    artifacts = result.scalars().all()
+
+    storage_ids = {a.storage_id for a in artifacts}
+    result = await db.execute(select(StorageDestination).where(StorageDestination.id.in_(storage_ids)))
+    destinations = {d.id: d for d in result.scalars().all()}
+
+    per_dest = get_settings().verify_concurrency_per_destination
+    semaphores = {sid: asyncio.Semaphore(per_dest) for sid in storage_ids}
+
+    async def _one(artifact: BackupArtifact) -> dict:
+        dest = destinations.get(artifact.storage_id)
+        if dest is None:
+            return {"status": "error", "method": None, "bytes_read": 0, "detail": "Storage destination not found"}
+        async with semaphores[artifact.storage_id]:
+            return await verify_artifact(artifact, dest, budget)
+
+    outcomes = await asyncio.gather(*(_one(a) for a in artifacts))
+
+    now = datetime.now(timezone.utc)
+    summary = {"verified": 0, "ok": 0, "failed": 0, "skipped": 0, "bytes_read": 0, "results": []}
+    for artifact, outcome in zip(artifacts, outcomes):
+        summary["bytes_read"] += outcome["bytes_read"]
+        summary["results"].append({"artifact_id": str(artifact.id), **outcome})
+        if outcome["status"] == "skipped":
+            summary["skipped"] += 1
+            continue
+        artifact.verified_at = now
+        artifact.verify_status = outcome["status"]
+        summary["verified"] += 1
+        if outcome["status"] == "ok":
+            summary["ok"] += 1
+        else:
+            summary["failed"] += 1
+            logger.warning(f"Artifact {artifact.id} verification {outcome['status']}: {outcome['detail']}")
+
+    await db.flush()
+    return summary
+
+
+async def select_sample(db: AsyncSession, limit: int) -> list[uuid.UUID]:
+    """Pick the artifacts verified longest ago (never-verified first)."""
+    result = await db.execute(
+        select(BackupArtifact.id)
+        .where(BackupArtifact.is_deleted == False)
+        .order_by(BackupArtifact.verified_at.asc().nullsfirst(), BackupArtifact.created_at.asc())
+        .limit(limit)
+    )
+    return list(result.scalars().all())
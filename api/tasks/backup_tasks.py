@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import time
 import uuid
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
@@ -18,6 +19,8 @@ def _run_async(coro):
     try:
         return loop.run_until_complete(coro)
     finally:
+        from api.services.dispatch import close_http_client
+        loop.run_until_complete(close_http_client())
         loop.close()
 
 
@@ -44,26 +47,77 @@ async def get_task_session():
     await engine.dispose()
 
 
+@asynccontextmanager
+async def run_heartbeat(run_id, job_id=None):
+    """Renew the run's lease (and its job's, see services.overlap) in the background
+    while the body runs, on a session of its own."""
+    from api.services import overlap
+    from api.services.run_leases import renew_lease
+
+    interval = get_settings().run_heartbeat_interval
+
+    async def beat():
+        async with get_task_session() as db:
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    if not await renew_lease(db, run_id):
+                        return  # finished or cancelled
+                    if job_id is not None:
+                        await overlap.renew(job_id, run_id)
+                except Exception as e:
+                    logger.warning(f"Lease renewal for run {run_id} failed: {e}")
+                    await db.rollback()
+
+    beater = asyncio.create_task(beat())
+    try:
+        yield
+    finally:
+        beater.cancel()
+        await asyncio.gather(beater, return_exceptions=True)
+
+
+def _requeue_backup(job_id: str, attempt: int, run_id):
+    """Check again later whether a waiting run can start; the worker is free meanwhile."""
+    run_backup_task.apply_async(
+        args=[job_id], kwargs={"attempt": attempt, "run_id": str(run_id)},
+        countdown=get_settings().overlap_poll_seconds,
+    )
+
+
 @celery_app.task(bind=True, name="api.tasks.backup_tasks.run_backup_task", max_retries=3)
-def run_backup_task(self, job_id: str):
-    """Execute a backup job."""
-    _run_async(_run_backup(self, job_id))
+def run_backup_task(self, job_id: str, attempt: int | None = None, run_id: str | None = None):
+    """Execute a backup job.
 
+    ``run_id`` resumes that run at its first incomplete stage (retries, reruns
+    queued by the reaper, POST /runs/{id}/retry); ``attempt`` numbers it.
+    """
+    _run_async(_run_backup(self, job_id, attempt, run_id))
 
-async def _run_backup(task, job_id: str):
+
+async def _run_backup(task, job_id: str, attempt: int | None = None, run_id: str | None = None):
     from sqlalchemy import select
     from api.models.backup_job import BackupJob
     from api.models.backup_run import BackupRun
     from api.models.server import Server
-    from api.models.backup_artifact import BackupArtifact
-    from api.services.backup_executor import (
-        execute_postgresql_backup,
-        execute_docker_volumes_backup,
-        execute_files_backup,
-        execute_custom_backup,
-    )
+    from api.plugins.registry import get_backup_executor
+    from api.services import overlap, run_stages
+    from api.services.cancellation import RunCancelled, check_cancelled, clear_cancel, cleanup_run, run_cancellable
+    from api.services.run_leases import claim_delivery, lease_values
+    from api.services.backup_executor import backup_plan, command_timeout
+    from api.services.run_estimates import add_duration_sample, get_estimate, produce_timeout
+    from api.services.run_logs import RunLogWriter, write_lines
+    from api.services.run_progress import ProgressReporter
+    from api.services.ssh_client import kill_run_processes
+    from api.tasks.notification_tasks import publish_event
+
+    attempt = task.request.retries if attempt is None else attempt
 
     async with get_task_session() as db:
+        # acks_late: a message whose worker died is delivered again; never start its run twice
+        if task.request.id and not await claim_delivery(db, task.request.id, attempt):
+            return
+
         # Load job and server
         result = await db.execute(select(BackupJob).where(BackupJob.id == uuid.UUID(job_id)))
         job = result.scalar_one_or_none()
@@ -77,98 +131,196 @@ async def _run_backup(task, job_id: str):
             logger.error(f"Server {job.server_id} not found for job {job_id}")
             return
 
-        # Create run record
-        run = BackupRun(
-            job_id=job.id,
-            server_id=server.id,
-            status="running",
-            started_at=datetime.now(timezone.utc),
-            triggered_by="manual" if not hasattr(task, '_scheduled') else "scheduler",
-        )
-        db.add(run)
+        run = None
+        if run_id:
+            result = await db.execute(select(BackupRun).where(BackupRun.id == uuid.UUID(run_id)))
+            run = result.scalar_one_or_none()
+            waiting = run is not None and run.status == "pending" and run.overlap_decision in (
+                overlap.QUEUED, overlap.CANCELLED_PREVIOUS,
+            )
+            if run is None or not (waiting or run.status in ("failed", "partial")):
+                # Finished, cancelled or already resumed by another message
+                logger.info(f"Run {run_id} is {run.status if run else 'gone'}; not resuming it")
+                await overlap.leave_queue(job.id, run_id)
+                return
+        resumed = run is not None and run.status in ("failed", "partial")
+
+        # One run of a job at a time, unless its overlap policy says otherwise
+        new_run_id = run.id if run else uuid.uuid4()
+        holder = await overlap.acquire(job.id, new_run_id)
+        if holder is not None and run is None:
+            decision = await overlap.decide(job, holder, new_run_id)
+            run = BackupRun(
+                id=new_run_id,
+                job_id=job.id,
+                server_id=server.id,
+                status="pending",
+                triggered_by="retry" if attempt else ("manual" if not hasattr(task, '_scheduled') else "scheduler"),
+                stage="produce",
+                checkpoint={},
+                overlap_decision=decision,
+            )
+            db.add(run)
+            if decision != overlap.ALLOWED:
+                now = datetime.now(timezone.utc)
+                if decision == overlap.SKIPPED:
+                    run.status, run.stage, run.started_at, run.finished_at = "skipped", "done", now, now
+                    msg = f"Skipped: run {holder} of this job is still in progress"
+                elif decision == overlap.CANCELLED_PREVIOUS:
+                    msg = f"Cancelling run {holder} of this job; waiting for it to stop"
+                else:
+                    msg = f"Queued behind run {holder} of this job"
+                await db.flush()
+                await write_lines(db, run.id, [{"ts": now.isoformat(), "level": "info", "msg": msg}])
+                await db.commit()
+                logger.info(f"Job {job.name}: {msg}")
+                if decision != overlap.SKIPPED:
+                    _requeue_backup(job_id, attempt, run.id)
+                return
+        elif holder is not None and (job.overlap_policy or "skip") != "allow":
+            # A waiting run, or a retry, while another run of the job is in progress
+            _requeue_backup(job_id, attempt, run.id)
+            return
+        if run is not None and run.status == "pending":
+            await overlap.leave_queue(job.id, run.id)
+        if resumed:
+            # Atomically: a redelivered message or a second retry must not run it twice
+            if not await run_stages.claim_retry(db, run.id):
+                logger.info(f"Run {run.id} was resumed by another attempt")
+                return
+            await db.refresh(run)
+
+        if run is None:
+            # Create run record
+            run = BackupRun(
+                id=new_run_id,
+                job_id=job.id,
+                server_id=server.id,
+                triggered_by="retry" if attempt else ("manual" if not hasattr(task, '_scheduled') else "scheduler"),
+                stage="produce",
+                checkpoint={},
+            )
+            db.add(run)
+
+        run.status = "running"
+        run.started_at = run.started_at or datetime.now(timezone.utc)
+        run.retry_count = attempt
+        run.finished_at = None
+        run.task_id = task.request.id
+        run.worker = task.request.hostname
+        for key, value in lease_values().items():
+            setattr(run, key, value)
+        if run.stage == "transfer" and not run_stages.can_reuse_produced(run):
+            run.stage = "produce"
+        estimate = None
+        if run.stage == "transfer":
+            estimate = await get_estimate(db, job.id, run.checkpoint["produced"].get("backup_level"))
         await db.commit()
         await db.refresh(run)
 
-        try:
-            # Execute based on backup type
-            executors = {
-                "postgresql": execute_postgresql_backup,
-                "docker_volumes": execute_docker_volumes_backup,
-                "files": execute_files_backup,
-                "custom": execute_custom_backup,
-            }
+        writer = await RunLogWriter.resume(db, run.id)
+        if resumed:
+            writer.append("info", f"Attempt {attempt + 1}: resuming at the {run.stage} stage")
+        retry = False
 
-            executor = executors.get(job.backup_type)
-            if not executor:
-                raise Exception(f"Unknown backup type: {job.backup_type}")
-
-            result_data = await executor(server, job, str(run.id))
-
-            if result_data["success"]:
-                run.status = "success"
-                run.size_bytes = result_data.get("size_bytes", 0)
-                run.log_lines = result_data.get("logs", [])
-                run.finished_at = datetime.now(timezone.utc)
-
-                # Create artifact record for each destination
-                if result_data.get("filename") and result_data.get("checksum_sha256"):
-                    for dest_id in (job.destination_ids or []):
-                        artifact = BackupArtifact(
-                            run_id=run.id,
-                            storage_id=dest_id,
-                            filename=result_data["filename"],
-                            remote_path=result_data.get("remote_path", ""),
-                            size_bytes=result_data.get("size_bytes", 0),
-                            checksum_sha256=result_data["checksum_sha256"],
-                            is_encrypted=job.encrypt,
-                            backup_type=job.backup_type,
-                            tags=job.tags,
-                            domain=job.domain,
-                            db_name=job.source_config.get("db_name"),
-                            server_name=server.name,
-                        )
-                        db.add(artifact)
-
-                # Apply rotation after successful backup — per destination
-                from api.models.retention_policy import RetentionPolicy
-                from api.services.rotation import apply_rotation
-                overrides = job.retention_overrides or {}
-                for dest_id in (job.destination_ids or []):
-                    dest_str = str(dest_id)
-                    # Use override policy if set, otherwise fall back to job default
-                    policy_id = overrides.get(dest_str, str(job.retention_id) if job.retention_id else None)
-                    if not policy_id:
-                        continue
-                    ret_result = await db.execute(
-                        select(RetentionPolicy).where(RetentionPolicy.id == uuid.UUID(policy_id))
+        try:
+            async with run_heartbeat(run.id, job.id), ProgressReporter(run.id) as progress:
+                if run.stage == "produce":
+                    # Built-in executor or plugin (imported on first use)
+                    executor = get_backup_executor(job.backup_type)
+                    if not executor:
+                        raise Exception(f"Unknown backup type: {job.backup_type}")
+                    if resumed:
+                        # A lost attempt may have left processes behind in the staging directory
+                        await kill_run_processes(server, run.id, grace=1)
+                        await cleanup_run(server, run.id)
+                        if await run_stages.discard_transfers(db, run):
+                            writer.append("warning", "Staged files are gone; replacing the copies already stored")
+
+                    # Fulls and incrementals of a job take very different times: plan the level first
+                    plan = await run_stages.plan_level(db, server, job) if job.backup_type == "files" else None
+                    estimate = await get_estimate(db, job.id, plan["level"] if plan else None)
+                    # Remote commands time out relative to the job's usual duration once it has a history
+                    timeout = produce_timeout(estimate)
+                    if timeout:
+                        writer.append("info", f"Timeout {timeout}s (typically {estimate.duration_mean:.0f}s)")
+                    await progress.stage(
+                        "produce", total_bytes=int(estimate.size_mean) if estimate.size_mean else None,
+                        expected_seconds=estimate.duration_mean, timeout=timeout,
                     )
-                    policy = ret_result.scalar_one_or_none()
-                    if policy:
-                        await apply_rotation(db, policy, str(job.id), storage_id=dest_str)
-
-            else:
-                run.status = "failed"
-                run.error_message = result_data.get("error", "Unknown error")
-                run.log_lines = result_data.get("logs", [])
-                run.finished_at = datetime.now(timezone.utc)
-
-                # Retry if configured
-                if run.retry_count < job.max_retries:
-                    run.retry_count += 1
-                    task.retry(countdown=60 * run.retry_count)
-
+                    started = time.monotonic()
+                    token, plan_token = command_timeout.set(timeout), backup_plan.set(plan)
+                    try:
+                        result_data = await run_cancellable(server, run.id, executor(server, job, str(run.id)))
+                    finally:
+                        command_timeout.reset(token)
+                        backup_plan.reset(plan_token)
+                    seconds = time.monotonic() - started
+                    writer.extend(result_data.get("logs", []))
+                    if result_data["success"]:
+                        run_stages.record_produced(run, result_data, seconds)
+                        add_duration_sample(estimate, seconds, result_data.get("size_bytes"))
+                    else:
+                        run_stages.finish(run, "failed")
+                        run.error_message = result_data.get("error", "Unknown error")
+                    await writer.flush(db)
+                    await db.commit()
+
+                if run.stage == "transfer":
+                    # Only destinations that do not hold the files yet
+                    await run_stages.transfer(db, run, job, server, writer, progress, estimate)
+                    status = run_stages.outcome(run, job)
+                    if status == "success":
+                        run.stage = "rotate"
+                    run_stages.finish(run, status)
+
+                if run.status in ("running", "success", "partial"):
+                    # Rotation after a successful backup — per destination that has it
+                    await run_stages.rotate(db, run, job)
+                    await check_cancelled(run.id)
+                    if run.stage == "rotate":
+                        run.stage = "notify"
+                    if run.status == "running":
+                        # Resumed after the transfers had completed
+                        run_stages.finish(run, "success")
+                    await writer.flush(db)
+                    await db.commit()
+                await progress.update(stage=run.stage, status=run.status, eta=None)
+
+            # Retry if configured: the same run resumes, reusing what was produced
+            retry = run.status in ("failed", "partial") and attempt < job.max_retries
+            if retry:
+                run_stages.mark_retry_queued(run, attempt + 1)
+                writer.append("info", f"Retrying in {60 * (attempt + 1)}s")
+            await writer.flush(db)
             await db.commit()
 
-            # Send notifications
-            from api.services.notifier import notify_event
-            event = f"run.{run.status}"
-            await notify_event(db, event, {
+            # Queued in the outbox; delivered from the notification queue
+            await publish_event(db, f"run.{run.status}", {
+                "run_id": str(run.id),
                 "job_name": job.name,
                 "server_name": server.name,
                 "size_bytes": run.size_bytes,
                 "error": run.error_message,
+                "failed_destinations": list(run_stages.failed_transfers(run)),
                 "duration": str(run.finished_at - run.started_at) if run.finished_at and run.started_at else None,
             })
+            if run.stage == "notify":
+                run.stage = "done"
+                await db.commit()
+
+        except RunCancelled:
+            run.status = "cancelled"
+            run.finished_at = datetime.now(timezone.utc)
+            writer.append("warning", "Cancelled; remote processes stopped")
+            await writer.flush(db)
+            await db.commit()
+            logger.info(f"Backup of job {job_id} cancelled (run {run.id})")
+            await publish_event(db, "run.cancelled", {
+                "run_id": str(run.id),
+                "job_name": job.name,
+                "server_name": server.name,
+            })
 
         except Exception as e:
             run.status = "failed"
@@ -178,19 +330,208 @@ async def _run_backup(task, job_id: str):
             logger.error(f"Backup task failed for job {job_id}: {e}")
             raise
 
+        finally:
+            # Staged files wait for a retry of the failed transfers (at most
+            # RUN_STAGED_RETENTION_HOURS); once stored everywhere they are left over
+            try:
+                keep_staged = run_stages.keeps_staged(run)
+                await cleanup_run(server, run.id, keep_staged=keep_staged)
+                if not keep_staged:
+                    run_stages.mark_unstaged(run)
+                    await db.commit()
+            except Exception as e:
+                logger.warning(f"Cleanup of run {run.id} failed: {e}")
+            try:
+                await clear_cancel(run.id)
+                await overlap.release(job.id, run.id)
+            except Exception as e:
+                logger.warning(f"Could not release the lease of job {job.id}: {e}")
+
+        if retry:
+            task.retry(
+                kwargs={"attempt": attempt + 1, "run_id": str(run.id)},
+                countdown=60 * (attempt + 1),
+                max_retries=job.max_retries,
+            )
+
 
 @celery_app.task(name="api.tasks.backup_tasks.run_restore_task")
-def run_restore_task(artifact_id: str, target_server_id: str | None = None, target_db_name: str | None = None):
-    """Restore a backup artifact."""
+def run_restore_task(
+    artifact_id: str,
+    target_server_id: str | None = None,
+    target_db_name: str | None = None,
+    run_id: str | None = None,
+    options: dict | None = None,
+):
+    """Restore a backup artifact by streaming it from storage to the target server."""
     logger.info(f"Restore task queued for artifact {artifact_id}")
-    # TODO: Implement restore logic (download artifact, decrypt, pg_restore/tar extract)
+    _run_async(_run_restore(artifact_id, target_server_id, target_db_name, run_id, options or {}))
+
+
+async def _run_restore(artifact_id: str, target_server_id: str | None, target_db_name: str | None, run_id: str | None, options: dict):
+    from sqlalchemy import select
+    from api.models.backup_artifact import BackupArtifact
+    from api.models.backup_run import BackupRun
+    from api.models.server import Server
+    from api.models.storage_destination import StorageDestination
+    from api.services.cancellation import RunCancelled, clear_cancel, cleanup_run, run_cancellable
+    from api.services.restore import artifact_chain, restore_artifact
+    from api.services.run_estimates import get_estimate, restore_timeout
+    from api.services.run_leases import lease_values
+    from api.services.run_logs import RunLogWriter
+    from api.tasks.notification_tasks import publish_event
+    from celery import current_task
+
+    async with get_task_session() as db:
+        result = await db.execute(select(BackupArtifact).where(BackupArtifact.id == uuid.UUID(artifact_id)))
+        artifact = result.scalar_one_or_none()
+        if not artifact:
+            logger.error(f"Artifact {artifact_id} not found")
+            return
+
+        run = None
+        if run_id:
+            result = await db.execute(select(BackupRun).where(BackupRun.id == uuid.UUID(run_id)))
+            run = result.scalar_one_or_none()
+            if run is not None and run.status != "pending":
+                # Cancelled while queued, or a redelivered message of a restore that already started
+                logger.info(f"Restore run {run_id} is {run.status}; not starting it")
+                return
+        if run is None:
+            result = await db.execute(select(BackupRun).where(BackupRun.id == artifact.run_id))
+            source_run = result.scalar_one()
+            run = BackupRun(
+                job_id=source_run.job_id,
+                server_id=uuid.UUID(target_server_id) if target_server_id else source_run.server_id,
+                triggered_by="restore",
+            )
+            db.add(run)
+
+        run.status = "running"
+        run.started_at = datetime.now(timezone.utc)
+        run.task_id = current_task.request.id if current_task else None
+        run.worker = current_task.request.hostname if current_task else None
+        for key, value in lease_values().items():
+            setattr(run, key, value)
+        await db.commit()
+        writer = await RunLogWriter.resume(db, run.id)
+        server = None
+
+        def event_data() -> dict:
+            return {
+                "run_id": str(run.id),
+                "artifact": artifact.filename,
+                "db_name": target_db_name or artifact.db_name,
+                "server_name": server.name if server else None,
+                "error": run.error_message,
+                "duration": str(run.finished_at - run.started_at) if run.finished_at and run.started_at else None,
+            }
+
+        async def log(level: str, msg: str):
+            # Restores log a handful of milestones; each is committed at once for the SSE stream
+            writer.append(level, msg)
+            await writer.flush(db)
+            await db.commit()
+            logger.info(f"[restore {run.id}] {msg}")
+
+        try:
+            server = (await db.execute(select(Server).where(Server.id == run.server_id))).scalar_one_or_none()
+            if not server:
+                raise Exception(f"Target server {run.server_id} not found")
+            dest = (await db.execute(
+                select(StorageDestination).where(StorageDestination.id == artifact.storage_id)
+            )).scalar_one_or_none()
+            if not dest:
+                raise Exception(f"Storage destination {artifact.storage_id} not found")
+
+            if target_db_name:
+                options = {**options, "target_db_name": target_db_name}
+            chain = await artifact_chain(db, artifact)
+            await publish_event(db, "restore.started", event_data())
+            if len(chain) > 1:
+                await log("info", f"Restoring a chain of {len(chain)} backups: " + ", ".join(a.filename for a in chain))
+            # Bounded by size and the job's usual throughput, not a fixed limit: large restores take long
+            timeouts = [
+                restore_timeout(await get_estimate(db, run.job_id, link.backup_level), link.size_bytes) for link in chain
+            ]
+
+            async def restore_chain():
+                for link, timeout in zip(chain, timeouts):
+                    await restore_artifact(server, link, dest, options, log, timeout)
+
+            async with run_heartbeat(run.id):
+                await run_cancellable(server, run.id, restore_chain())
+            run.status = "success"
+            run.size_bytes = artifact.size_bytes
+        except RunCancelled:
+            run.status = "cancelled"
+            await log("warning", "Cancelled; remote processes stopped")
+        except Exception as e:
+            run.status = "failed"
+            run.error_message = str(e)
+            await log("error", str(e))
+            logger.error(f"Restore of artifact {artifact_id} failed: {e}")
+        finally:
+            run.finished_at = datetime.now(timezone.utc)
+            await db.commit()
+            try:
+                await clear_cancel(run.id)
+            except Exception as e:
+                logger.warning(f"Could not clear the cancel request of restore run {run.id}: {e}")
+            if server:
+                try:
+                    await cleanup_run(server, run.id)
+                except Exception as e:
+                    logger.warning(f"Cleanup of restore run {run.id} failed: {e}")
+
+        if run.status in ("success", "failed"):
+            await publish_event(db, "restore.completed" if run.status == "success" else "restore.failed", event_data())
 
 
 @celery_app.task(name="api.tasks.backup_tasks.verify_artifact_checksum")
 def verify_artifact_checksum(artifact_id: str):
     """Verify the checksum of a stored artifact."""
     logger.info(f"Checksum verification queued for artifact {artifact_id}")
-    # TODO: Implement checksum verification
+    return _run_async(_verify_artifacts([artifact_id]))
+
+
+@celery_app.task(name="api.tasks.backup_tasks.verify_artifacts_bulk")
+def verify_artifacts_bulk(artifact_ids: list[str]):
+    """Verify many artifacts, with a concurrency limit per storage destination."""
+    return _run_async(_verify_artifacts(artifact_ids))
+
+
+async def _verify_artifacts(artifact_ids: list[str], budget=None) -> dict:
+    from api.services.verification import verify_artifacts
+
+    async with get_task_session() as db:
+        summary = await verify_artifacts(db, [uuid.UUID(a) for a in artifact_ids], budget)
+        await db.commit()
+
+    logger.info(
+        f"Verified {summary['verified']} artifacts: ok={summary['ok']}, failed={summary['failed']}, "
+        f"skipped={summary['skipped']}, downloaded={summary['bytes_read']} bytes"
+    )
+    return summary
+
+
+@celery_app.task(name="api.tasks.backup_tasks.sample_artifact_verification")
+def sample_artifact_verification():
+    """Nightly: verify the least recently verified artifacts within the egress budget."""
+    return _run_async(_sample_verification())
+
+
+async def _sample_verification() -> dict:
+    from api.services.verification import EgressBudget, select_sample
+
+    settings = get_settings()
+    async with get_task_session() as db:
+        artifact_ids = await select_sample(db, settings.verify_nightly_max_artifacts)
+
+    budget = EgressBudget(settings.verify_nightly_egress_bytes)
+    summary = await _verify_artifacts([str(a) for a in artifact_ids], budget)
+    summary.pop("results", None)
+    return summary
 
 
 @celery_app.task(name="api.tasks.backup_tasks.check_scheduled_jobs")
@@ -204,6 +545,7 @@ async def _check_scheduled():
     from croniter import croniter
     from api.models.backup_job import BackupJob
     from api.models.backup_run import BackupRun
+    from api.services.run_stages import NON_BACKUP_TRIGGERS
 
     async with get_task_session() as db:
         result = await db.execute(select(BackupJob).where(BackupJob.is_active == True))
@@ -220,8 +562,14 @@ async def _check_scheduled():
                 if (now - prev_time).total_seconds() < 60:
                     # Check if we already have a run for this window
                     run_result = await db.execute(
-                        select(BackupRun)
-                        .where(BackupRun.job_id == job.id, BackupRun.created_at >= prev_time)
+                        select(BackupRun.id)
+                        .where(
+                            BackupRun.job_id == job.id,
+                            BackupRun.created_at >= prev_time,
+                            # A restore (or import) filed under the job is not its backup
+                            BackupRun.triggered_by.notin_(NON_BACKUP_TRIGGERS),
+                        )
+                        .limit(1)
                     )
                     existing = run_result.scalar_one_or_none()
                     if not existing:
@@ -241,7 +589,7 @@ async def _check_health():
     from sqlalchemy import select
     from api.models.server import Server
     from api.services.ssh_client import test_ssh_connection
-    from api.services.notifier import notify_event
+    from api.tasks.notification_tasks import publish_event
 
     async with get_task_session() as db:
         result = await db.execute(select(Server).where(Server.is_active == True))
@@ -257,6 +605,6 @@ async def _check_health():
             else:
                 server.last_error = message
                 if was_online:
-                    await notify_event(db, "server.offline", {"server_name": server.name, "error": message})
+                    await publish_event(db, "server.offline", {"server_name": server.name, "error": message})
 
         await db.commit()
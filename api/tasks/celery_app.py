@@ -1,4 +1,6 @@
 from celery import Celery
+from celery.schedules import crontab
+from celery.signals import worker_init
 
 from api.config import get_settings
 
@@ -8,7 +10,10 @@ celery_app = Celery(
     "vaultmaster",
     broker=settings.redis_url,
     backend=settings.redis_url,
-    include=["api.tasks.backup_tasks", "api.tasks.rotation_tasks"],
+    include=[
+        "api.tasks.backup_tasks", "api.tasks.rotation_tasks", "api.tasks.notification_tasks",
+        "api.tasks.storage_tasks",
+    ],
 )
 
 celery_app.conf.update(
@@ -23,15 +28,68 @@ celery_app.conf.update(
     task_routes={
         "api.tasks.backup_tasks.*": {"queue": "backup"},
         "api.tasks.rotation_tasks.*": {"queue": "rotation"},
+        "api.tasks.notification_tasks.*": {"queue": "notification"},
+        "api.tasks.storage_tasks.*": {"queue": "storage"},
     },
     beat_schedule={
         "check-scheduled-jobs": {
             "task": "api.tasks.backup_tasks.check_scheduled_jobs",
             "schedule": 60.0,  # every minute
         },
+        "reap-stuck-runs": {
+            "task": "api.tasks.rotation_tasks.reap_stuck_runs",
+            "schedule": 60.0,  # leases expire after RUN_LEASE_SECONDS
+        },
+        "expire-staged-runs": {
+            "task": "api.tasks.rotation_tasks.expire_staged_runs",
+            "schedule": 3600.0,  # hourly; staged files wait RUN_STAGED_RETENTION_HOURS for a retry
+        },
+        "index-run-logs": {
+            "task": "api.tasks.rotation_tasks.index_run_logs",
+            "schedule": 600.0,  # backfills chunks written before log search; idle once done
+        },
         "check-server-health": {
             "task": "api.tasks.backup_tasks.check_server_health",
             "schedule": 300.0,  # every 5 minutes
         },
+        "deliver-outbox": {
+            "task": "api.tasks.notification_tasks.deliver_outbox",
+            "schedule": 10.0,  # every 10 seconds
+        },
+        "purge-outbox": {
+            "task": "api.tasks.notification_tasks.purge_outbox",
+            "schedule": crontab(hour=4, minute=0),  # nightly
+        },
+        "reencrypt-secrets": {
+            "task": "api.tasks.rotation_tasks.reencrypt_secrets",
+            "schedule": crontab(hour=4, minute=30),  # nightly; no-op unless keys changed
+        },
+        "maintain-audit-partitions": {
+            "task": "api.tasks.rotation_tasks.maintain_audit_partitions",
+            "schedule": crontab(hour=4, minute=15),  # daily; partitions exist two months ahead
+        },
+        "archive-run-history": {
+            "task": "api.tasks.rotation_tasks.archive_run_history",
+            "schedule": crontab(hour=4, minute=30),
+        },
+        "refresh-storage-inventory": {
+            "task": "api.tasks.storage_tasks.refresh_storage_inventory",
+            "schedule": 60.0,  # every minute; each backend has its own refresh interval
+        },
+        "reconcile-storage": {
+            "task": "api.tasks.storage_tasks.reconcile_all_storage",
+            "schedule": crontab(hour=5, minute=0),  # nightly; unchanged prefixes are skipped
+        },
+        "sample-artifact-verification": {
+            "task": "api.tasks.backup_tasks.sample_artifact_verification",
+            "schedule": crontab(hour=3, minute=30),  # nightly
+        },
     },
 )
+
+
+@worker_init.connect
+def _index_plugins(**kwargs):
+    # Runs once in the parent before pool processes fork, so they inherit the index
+    from api.plugins.registry import build_index
+    build_index()
@@ -0,0 +1,50 @@
+import logging
+
+from api.tasks.celery_app import celery_app
+from api.tasks.backup_tasks import get_task_session, _run_async
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="api.tasks.notification_tasks.deliver_outbox")
+def deliver_outbox():
+    """Deliver due outbox events to webhooks and notification channels."""
+    return _run_async(_deliver_outbox())
+
+
+async def _deliver_outbox():
+    from api.services.outbox import deliver_due
+
+    async with get_task_session() as db:
+        summary = await deliver_due(db)
+        await db.commit()
+
+    if any(summary.values()):
+        logger.info(f"Outbox: {summary}")
+    return summary
+
+
+@celery_app.task(name="api.tasks.notification_tasks.purge_outbox")
+def purge_outbox():
+    """Remove delivered and dead outbox rows past the retention period."""
+    return _run_async(_purge_outbox())
+
+
+async def _purge_outbox():
+    from api.services.outbox import purge_delivered
+
+    async with get_task_session() as db:
+        deleted = await purge_delivered(db)
+        await db.commit()
+
+    logger.info(f"Outbox purge: removed {deleted} rows")
+    return deleted
+
+
+async def publish_event(db, event: str, data: dict):
+    """Queue an event in the caller's session, commit, and kick off delivery."""
+    from api.services.outbox import enqueue_event
+
+    if await enqueue_event(db, event, data):
+        await db.commit()
+        deliver_outbox.delay()
@@ -1,20 +1,11 @@
-import asyncio
 import logging
 
 from api.tasks.celery_app import celery_app
-from api.tasks.backup_tasks import get_task_session
+from api.tasks.backup_tasks import get_task_session, _run_async
 
 logger = logging.getLogger(__name__)
 
 
-def _run_async(coro):
-    loop = asyncio.new_event_loop()
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
-
-
 @celery_app.task(name="api.tasks.rotation_tasks.run_rotation")
 def run_rotation(policy_id: str, job_id: str | None = None):
     """Run GFS rotation for a specific retention policy."""
@@ -26,7 +17,7 @@ async def _do_rotation(policy_id: str, job_id: str | None):
     from sqlalchemy import select
     from api.models.retention_policy import RetentionPolicy
     from api.services.rotation import apply_rotation
-    from api.services.notifier import notify_event
+    from api.tasks.notification_tasks import publish_event
 
     async with get_task_session() as db:
         result = await db.execute(select(RetentionPolicy).where(RetentionPolicy.id == uuid.UUID(policy_id)))
@@ -39,10 +30,145 @@ async def _do_rotation(policy_id: str, job_id: str | None):
         await db.commit()
 
         if rotation_result["deleted"] > 0:
-            await notify_event(db, "rotation.completed", {
+            await publish_event(db, "rotation.completed", {
                 "policy_name": policy.name,
                 "kept": rotation_result["kept"],
                 "deleted": rotation_result["deleted"],
             })
 
         logger.info(f"Rotation complete: kept={rotation_result['kept']}, deleted={rotation_result['deleted']}")
+
+
+@celery_app.task(name="api.tasks.rotation_tasks.reencrypt_secrets")
+def reencrypt_secrets(batch_size: int = 200):
+    """Re-encrypt stored secrets with the current key; plaintext secrets get encrypted."""
+    return _run_async(_reencrypt_secrets(batch_size))
+
+
+async def _reencrypt_secrets(batch_size: int):
+    from sqlalchemy import select
+    from api.models.server import Server
+    from api.models.storage_destination import StorageDestination
+    from api.services.encryption import (
+        SERVER_SECRET_KEYS, STORAGE_SECRET_KEYS, reencrypt_config, rotate_secret, token_needs_rotation,
+    )
+
+    counts = {"servers": 0, "storage": 0}
+    async with get_task_session() as db:
+        for model, column, secret_keys, label in (
+            (Server, "meta", SERVER_SECRET_KEYS, "servers"),
+            (StorageDestination, "config", STORAGE_SECRET_KEYS, "storage"),
+        ):
+            last_id = None
+            while True:
+                # Rows being edited right now are skipped and picked up on the next run
+                query = select(model).order_by(model.id).limit(batch_size).with_for_update(skip_locked=True)
+                if last_id is not None:
+                    query = query.where(model.id > last_id)
+                rows = (await db.execute(query)).scalars().all()
+                if not rows:
+                    break
+                for row in rows:
+                    changed = False
+                    updated = reencrypt_config(getattr(row, column), secret_keys)
+                    if updated is not None:
+                        setattr(row, column, updated)
+                        changed = True
+                    if model is Server and row.api_token_encrypted and token_needs_rotation(row.api_token_encrypted):
+                        row.api_token_encrypted = rotate_secret(row.api_token_encrypted)
+                        changed = True
+                    counts[label] += changed
+                last_id = rows[-1].id
+                await db.commit()
+
+    logger.info(f"Secret re-encryption complete: {counts}")
+    return counts
+
+
+@celery_app.task(name="api.tasks.rotation_tasks.maintain_audit_partitions")
+def maintain_audit_partitions():
+    """Create the next audit_log partitions and drop months past retention."""
+    return _run_async(_maintain_audit_partitions())
+
+
+async def _maintain_audit_partitions():
+    from api.services.audit import maintain_partitions
+
+    async with get_task_session() as db:
+        result = await maintain_partitions(db)
+        await db.commit()
+    if result["created"] or result["dropped"]:
+        logger.info(f"Audit partitions: created={result['created']}, dropped={result['dropped']}")
+    return result
+
+
+@celery_app.task(name="api.tasks.rotation_tasks.archive_run_history")
+def archive_run_history():
+    """Move old finished runs to the monthly archive and roll them up per day."""
+    return _run_async(_archive_run_history())
+
+
+async def _archive_run_history():
+    from api.services.run_history import archive_runs
+
+    async with get_task_session() as db:
+        result = await archive_runs(db)
+    if result["archived"] or result["purged_artifacts"] or result["dropped"]:
+        logger.info(
+            f"Run history: archived={result['archived']}, purged_artifacts={result['purged_artifacts']}, "
+            f"dropped={result['dropped']}"
+        )
+    return result
+
+
+@celery_app.task(name="api.tasks.rotation_tasks.reap_stuck_runs")
+def reap_stuck_runs():
+    """Fail (and where safe rerun) runs whose worker stopped renewing the lease."""
+    return _run_async(_reap_stuck_runs())
+
+
+async def _reap_stuck_runs():
+    from api.services.run_leases import reap_expired_runs
+
+    async with get_task_session() as db:
+        result = await reap_expired_runs(db)
+    if result["failed"]:
+        logger.warning(f"Reaped {result['failed']} stuck runs, {result['rerun']} rerun")
+    return result
+
+
+@celery_app.task(name="api.tasks.rotation_tasks.expire_staged_runs")
+def expire_staged_runs():
+    """Remove staged files that failed or partial runs kept for a retry that never came."""
+    return _run_async(_expire_staged_runs())
+
+
+async def _expire_staged_runs():
+    from api.services.run_stages import expire_staged
+
+    async with get_task_session() as db:
+        expired = await expire_staged(db)
+    if expired:
+        logger.info(f"Removed staged files of {expired} runs")
+    return {"expired": expired}
+
+
+@celery_app.task(name="api.tasks.rotation_tasks.index_run_logs")
+def index_run_logs():
+    """Build the search index of log chunks written before it existed, a few batches per run."""
+    return _run_async(_index_run_logs())
+
+
+async def _index_run_logs(batches: int = 20):
+    from api.services.run_logs import index_unindexed_chunks
+
+    indexed = 0
+    async with get_task_session() as db:
+        for _ in range(batches):
+            n = await index_unindexed_chunks(db)
+            indexed += n
+            if not n:
+                break
+    if indexed:
+        logger.info(f"Indexed {indexed} log chunks for search")
+    return {"indexed": indexed}
@@ -0,0 +1,130 @@
+import logging
+
+from api.tasks.celery_app import celery_app
+from api.tasks.backup_tasks import get_task_session, _run_async
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="api.tasks.storage_tasks.refresh_storage_inventory")
+def refresh_storage_inventory():
+    """Refresh cached usage and top-level listings for destinations that are due."""
+    return _run_async(_refresh_storage_inventory())
+
+
+async def _refresh_storage_inventory():
+    from api.services.storage_inventory import refresh_due
+
+    async with get_task_session() as db:
+        refreshed = await refresh_due(db)
+        await db.commit()
+
+    if refreshed:
+        logger.info(f"Storage inventory: refreshed {refreshed} destinations")
+    return refreshed
+
+
+@celery_app.task(name="api.tasks.storage_tasks.refresh_storage")
+def refresh_storage(storage_id: str, usage: bool = True, paths: list[str] | None = None):
+    """Refresh one destination's cache entries (queued when a stale entry is served)."""
+    return _run_async(_refresh_storage(storage_id, usage, paths or []))
+
+
+async def _refresh_storage(storage_id: str, usage: bool, paths: list[str]):
+    import uuid
+    from sqlalchemy import select
+    from api.models.storage_destination import StorageDestination
+    from api.services.storage_inventory import refresh
+
+    async with get_task_session() as db:
+        result = await db.execute(select(StorageDestination).where(StorageDestination.id == uuid.UUID(storage_id)))
+        dest = result.scalar_one_or_none()
+        if not dest:
+            logger.error(f"Storage destination {storage_id} not found")
+            return 0
+        refreshed = await refresh(db, [dest], usage=usage, paths=paths)
+        await db.commit()
+    return refreshed
+
+
+@celery_app.task(name="api.tasks.storage_tasks.reconcile_storage")
+def reconcile_storage(storage_id: str, full: bool = False):
+    """Compare one destination's listing with its artifact catalog."""
+    return _run_async(_reconcile_storage(storage_id, full))
+
+
+async def _reconcile_storage(storage_id: str, full: bool):
+    import uuid
+    import redis.asyncio as aioredis
+    from sqlalchemy import select
+    from api.config import get_settings
+    from api.models.storage_destination import StorageDestination
+    from api.services.reconciliation import reconcile
+
+    client = aioredis.from_url(get_settings().redis_url)
+    lock = f"vm:storage:{storage_id}:reconciling"
+    # One reconciliation per destination at a time (listings can take hours)
+    if not await client.set(lock, 1, nx=True, ex=6 * 3600):
+        await client.aclose()
+        logger.info(f"Reconciliation of storage {storage_id} already running")
+        return None
+    try:
+        async with get_task_session() as db:
+            result = await db.execute(select(StorageDestination).where(StorageDestination.id == uuid.UUID(storage_id)))
+            dest = result.scalar_one_or_none()
+            if not dest:
+                logger.error(f"Storage destination {storage_id} not found")
+                return None
+            name = dest.name
+            report = await reconcile(db, dest, full=full)
+            logger.info(
+                f"Reconciled {name}: {report.status}, missing={report.missing_count}, "
+                f"orphaned={report.orphaned_count}, size_mismatch={report.size_mismatch_count}, "
+                f"prefixes listed={report.prefixes_listed} skipped={report.prefixes_skipped}"
+            )
+            return str(report.id)
+    finally:
+        await client.delete(lock)
+        await client.aclose()
+
+
+@celery_app.task(name="api.tasks.storage_tasks.reconcile_all_storage")
+def reconcile_all_storage():
+    """Nightly: queue a reconciliation for every active destination."""
+    return _run_async(_reconcile_all_storage())
+
+
+async def _reconcile_all_storage():
+    from sqlalchemy import select
+    from api.models.storage_destination import StorageDestination
+
+    async with get_task_session() as db:
+        result = await db.execute(select(StorageDestination.id).where(StorageDestination.is_active == True))
+        storage_ids = [str(s) for s in result.scalars().all()]
+    for storage_id in storage_ids:
+        reconcile_storage.delay(storage_id)
+    return len(storage_ids)
+
+
+@celery_app.task(name="api.tasks.storage_tasks.import_catalog")
+def import_catalog(import_id: str):
+    """Import existing backups on a destination into the catalog, from the import's cursor."""
+    return _run_async(_import_catalog(import_id))
+
+
+async def _import_catalog(import_id: str):
+    import uuid
+    from api.services.catalog_import import claim, run_import
+
+    async with get_task_session() as db:
+        imp = await claim(db, uuid.UUID(import_id))
+        if imp is None:
+            logger.info(f"Catalog import {import_id} is not waiting to run")
+            return None
+        imp = await run_import(db, imp)
+        logger.info(
+            f"Catalog import {import_id}: {imp.status}, imported={imp.imported_count}, "
+            f"existing={imp.existing_count}, unmatched={imp.unmatched_count}, failed={imp.failed_count}, "
+            f"downloaded={imp.bytes_downloaded} bytes"
+        )
+        return imp.status
@@ -8,12 +8,17 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 from alembic import context
 
 config = context.config
-if config.config_file_name is not None:
+# Skip logging setup when run from the API, it would replace uvicorn's loggers
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
     fileConfig(config.config_file_name)
 
+from api.config import get_settings
 from api.database import Base
 from api.models import *  # noqa: F401
 
+# The app's DATABASE_URL wins over the placeholder in alembic.ini
+config.set_main_option("sqlalchemy.url", get_settings().database_url)
+
 target_metadata = Base.metadata
 
 
@@ -0,0 +1,184 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-02-21 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _timestamps() -> list[sa.Column]:
+    return [
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "server",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("name", sa.String(255), nullable=False, unique=True),
+        sa.Column("host", sa.String(255), nullable=False),
+        sa.Column("port", sa.Integer()),
+        sa.Column("auth_type", sa.String(50), nullable=False),
+        sa.Column("provider", sa.String(100)),
+        sa.Column("ssh_user", sa.String(100)),
+        sa.Column("ssh_key_path", sa.String(500)),
+        sa.Column("api_token_encrypted", sa.Text()),
+        sa.Column("tags", postgresql.ARRAY(sa.String())),
+        sa.Column("is_active", sa.Boolean()),
+        sa.Column("last_seen", sa.DateTime(timezone=True)),
+        sa.Column("last_error", sa.Text()),
+        sa.Column("meta", postgresql.JSONB()),
+        *_timestamps(),
+    )
+    op.create_table(
+        "retention_policy",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("name", sa.String(255), nullable=False, unique=True),
+        sa.Column("keep_hourly", sa.Integer()),
+        sa.Column("keep_daily", sa.Integer()),
+        sa.Column("keep_weekly", sa.Integer()),
+        sa.Column("keep_monthly", sa.Integer()),
+        sa.Column("keep_yearly", sa.Integer()),
+        sa.Column("max_age_days", sa.Integer()),
+        *_timestamps(),
+    )
+    op.create_table(
+        "storage_destination",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("name", sa.String(255), nullable=False, unique=True),
+        sa.Column("backend", sa.String(50), nullable=False),
+        sa.Column("config", postgresql.JSONB(), nullable=False),
+        sa.Column("is_active", sa.Boolean()),
+        sa.Column("capacity_bytes", sa.BigInteger()),
+        sa.Column("used_bytes", sa.BigInteger()),
+        sa.Column("last_checked", sa.DateTime(timezone=True)),
+        *_timestamps(),
+    )
+    op.create_table(
+        "backup_job",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("backup_type", sa.String(50), nullable=False),
+        sa.Column("server_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("server.id"), nullable=False),
+        sa.Column("source_config", postgresql.JSONB(), nullable=False),
+        sa.Column("schedule_cron", sa.String(100), nullable=False),
+        sa.Column("destination_ids", postgresql.ARRAY(postgresql.UUID(as_uuid=True))),
+        sa.Column("retention_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("retention_policy.id")),
+        sa.Column("retention_overrides", postgresql.JSONB()),
+        sa.Column("tags", postgresql.ARRAY(sa.String())),
+        sa.Column("domain", sa.String(100)),
+        sa.Column("is_active", sa.Boolean()),
+        sa.Column("encrypt", sa.Boolean()),
+        sa.Column("pre_script", sa.String(1000)),
+        sa.Column("post_script", sa.String(1000)),
+        sa.Column("max_retries", sa.Integer()),
+        *_timestamps(),
+    )
+    op.create_table(
+        "backup_run",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("job_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("backup_job.id"), nullable=False),
+        sa.Column("server_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("server.id"), nullable=False),
+        sa.Column("status", sa.String(50), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True)),
+        sa.Column("finished_at", sa.DateTime(timezone=True)),
+        sa.Column("size_bytes", sa.BigInteger()),
+        sa.Column("log_lines", postgresql.JSONB()),
+        sa.Column("error_message", sa.Text()),
+        sa.Column("triggered_by", sa.String(50)),
+        sa.Column("retry_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_table(
+        "backup_artifact",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("run_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("backup_run.id"), nullable=False),
+        sa.Column("storage_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("storage_destination.id"), nullable=False),
+        sa.Column("filename", sa.String(500), nullable=False),
+        sa.Column("remote_path", sa.String(1000), nullable=False),
+        sa.Column("size_bytes", sa.BigInteger(), nullable=False),
+        sa.Column("checksum_sha256", sa.String(64), nullable=False),
+        sa.Column("is_encrypted", sa.Boolean()),
+        sa.Column("backup_type", sa.String(50), nullable=False),
+        sa.Column("tags", postgresql.ARRAY(sa.String())),
+        sa.Column("domain", sa.String(100)),
+        sa.Column("db_name", sa.String(255)),
+        sa.Column("server_name", sa.String(255)),
+        sa.Column("expires_at", sa.DateTime(timezone=True)),
+        sa.Column("is_deleted", sa.Boolean()),
+        sa.Column("deleted_at", sa.DateTime(timezone=True)),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_table(
+        "notification_channel",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("channel_type", sa.String(50), nullable=False),
+        sa.Column("config", postgresql.JSONB(), nullable=False),
+        sa.Column("triggers", postgresql.ARRAY(sa.String())),
+        sa.Column("is_active", sa.Boolean()),
+        sa.Column("last_sent", sa.DateTime(timezone=True)),
+        *_timestamps(),
+    )
+    op.create_table(
+        "user",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("username", sa.String(100), nullable=False, unique=True),
+        sa.Column("hashed_password", sa.String(255), nullable=False),
+        sa.Column("email_addresses", postgresql.ARRAY(sa.String(255))),
+        sa.Column("role", sa.String(20)),
+        sa.Column("is_active", sa.Boolean()),
+        sa.Column("is_admin", sa.Boolean()),
+        sa.Column("totp_secret", sa.String(255)),
+        sa.Column("totp_enabled", sa.Boolean()),
+        sa.Column("api_key_hash", sa.String(255), unique=True),
+        sa.Column("api_key_prefix", sa.String(12)),
+        *_timestamps(),
+    )
+    op.create_table(
+        "audit_log",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True)),
+        sa.Column("username", sa.String(100)),
+        sa.Column("action", sa.String(100), nullable=False),
+        sa.Column("resource_type", sa.String(50)),
+        sa.Column("resource_id", sa.String(100)),
+        sa.Column("detail", sa.Text()),
+        sa.Column("meta", postgresql.JSONB()),
+        sa.Column("ip_address", sa.String(45)),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_table(
+        "webhook",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("url", sa.Text(), nullable=False),
+        sa.Column("secret", sa.String(255)),
+        sa.Column("events", postgresql.ARRAY(sa.String())),
+        sa.Column("is_active", sa.Boolean()),
+        sa.Column("last_triggered", sa.DateTime(timezone=True)),
+        sa.Column("last_status_code", sa.Integer()),
+        sa.Column("failure_count", sa.Integer()),
+        sa.Column("headers", postgresql.JSONB()),
+        *_timestamps(),
+    )
+
+
+def downgrade() -> None:
+    for table in (
+        "webhook", "audit_log", "user", "notification_channel", "backup_artifact",
+        "backup_run", "backup_job", "storage_destination", "retention_policy", "server",
+    ):
+        op.drop_table(table)
@@ -0,0 +1,25 @@
+"""artifact verification status
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("backup_artifact", sa.Column("verified_at", sa.DateTime(timezone=True)))
+    op.add_column("backup_artifact", sa.Column("verify_status", sa.String(20)))
+
+
+def downgrade() -> None:
+    op.drop_column("backup_artifact", "verify_status")
+    op.drop_column("backup_artifact", "verified_at")
@@ -0,0 +1,48 @@
+"""artifact search indexes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_TRGM_COLUMNS = ("filename", "db_name", "domain", "server_name")
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # CONCURRENTLY keeps backup_artifact writable while large tables are indexed
+    with op.get_context().autocommit_block():
+        for column in _TRGM_COLUMNS:
+            op.create_index(
+                f"ix_backup_artifact_{column}_trgm", "backup_artifact", [column],
+                postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+        op.create_index(
+            "ix_backup_artifact_tags", "backup_artifact", ["tags"],
+            postgresql_using="gin", postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_backup_artifact_deleted_created", "backup_artifact", ["is_deleted", "created_at", "id"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_backup_artifact_storage_created", "backup_artifact", ["storage_id", "created_at"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_backup_artifact_storage_created", table_name="backup_artifact")
+    op.drop_index("ix_backup_artifact_deleted_created", table_name="backup_artifact")
+    op.drop_index("ix_backup_artifact_tags", table_name="backup_artifact")
+    for column in _TRGM_COLUMNS:
+        op.drop_index(f"ix_backup_artifact_{column}_trgm", table_name="backup_artifact")
@@ -0,0 +1,48 @@
+"""outbound event queue
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "outbox_event",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("event", sa.String(100), nullable=False),
+        sa.Column("target_type", sa.String(20), nullable=False),
+        sa.Column("target_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("payload", postgresql.JSONB(), nullable=False),
+        sa.Column("status", sa.String(20)),
+        sa.Column("attempts", sa.Integer()),
+        sa.Column("next_attempt_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("last_error", sa.Text()),
+        sa.Column("coalesce_key", sa.String(255)),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("delivered_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index(
+        "ix_outbox_event_due", "outbox_event", ["next_attempt_at"],
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+    op.create_index(
+        "ix_outbox_event_coalesce", "outbox_event", ["coalesce_key", "created_at"],
+        postgresql_where=sa.text("status = 'pending' AND coalesce_key IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_outbox_event_coalesce", table_name="outbox_event")
+    op.drop_index("ix_outbox_event_due", table_name="outbox_event")
+    op.drop_table("outbox_event")
@@ -0,0 +1,43 @@
+"""foreign key and subscription indexes
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # Artifact lookups per run (run detail, cascade deletes) and jobs per server
+        op.create_index(
+            "ix_backup_artifact_run_id", "backup_artifact", ["run_id"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_backup_job_server_id", "backup_job", ["server_id"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        # Event subscription lookups (triggers @> / && event)
+        op.create_index(
+            "ix_notification_channel_triggers", "notification_channel", ["triggers"],
+            postgresql_using="gin", postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_webhook_events", "webhook", ["events"],
+            postgresql_using="gin", postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_webhook_events", table_name="webhook")
+    op.drop_index("ix_notification_channel_triggers", table_name="notification_channel")
+    op.drop_index("ix_backup_job_server_id", table_name="backup_job")
+    op.drop_index("ix_backup_artifact_run_id", table_name="backup_artifact")
@@ -0,0 +1,95 @@
+"""partition audit_log by month
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = "id, user_id, username, action, resource_type, resource_id, detail, meta, ip_address, created_at"
+
+
+def _columns() -> list[sa.Column]:
+    return [
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True)),
+        sa.Column("username", sa.String(100)),
+        sa.Column("action", sa.String(100), nullable=False),
+        sa.Column("resource_type", sa.String(50)),
+        sa.Column("resource_id", sa.String(100)),
+        sa.Column("detail", sa.Text()),
+        sa.Column("meta", postgresql.JSONB()),
+        sa.Column("ip_address", sa.String(45)),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    op.rename_table("audit_log", "audit_log_legacy")
+    op.execute("ALTER INDEX audit_log_pkey RENAME TO audit_log_legacy_pkey")
+
+    # The partition key must be part of the primary key
+    op.create_table(
+        "audit_log",
+        *_columns(),
+        sa.PrimaryKeyConstraint("id", "created_at", name="audit_log_pkey"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    op.create_index("ix_audit_log_created", "audit_log", ["created_at", "id"])
+    op.create_index("ix_audit_log_resource_type_created", "audit_log", ["resource_type", "created_at"])
+    op.create_index(
+        "ix_audit_log_action_created", "audit_log", ["action", "created_at"],
+        postgresql_ops={"action": "text_pattern_ops"},
+    )
+
+    # Catches rows outside the monthly partitions if maintenance falls behind
+    op.execute("CREATE TABLE audit_log_default PARTITION OF audit_log DEFAULT")
+    # One partition per month from the oldest existing entry to two months ahead (UTC boundaries)
+    op.execute("""
+        DO $$
+        DECLARE m timestamp;
+        BEGIN
+            FOR m IN SELECT generate_series(
+                date_trunc('month', coalesce((SELECT min(created_at) FROM audit_log_legacy), now()) AT TIME ZONE 'UTC'),
+                date_trunc('month', now() AT TIME ZONE 'UTC') + interval '2 months',
+                interval '1 month'
+            ) LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF audit_log FOR VALUES FROM (%L) TO (%L)',
+                    'audit_log_p' || to_char(m, 'YYYYMM'),
+                    m AT TIME ZONE 'UTC',
+                    (m + interval '1 month') AT TIME ZONE 'UTC'
+                );
+            END LOOP;
+        END $$
+    """)
+
+    op.execute(f"""
+        INSERT INTO audit_log ({COLUMNS})
+        SELECT id, user_id, username, action, resource_type, resource_id, detail, meta, ip_address,
+               coalesce(created_at, now())
+        FROM audit_log_legacy
+    """)
+    op.drop_table("audit_log_legacy")
+
+
+def downgrade() -> None:
+    op.rename_table("audit_log", "audit_log_partitioned")
+    op.execute("ALTER INDEX audit_log_pkey RENAME TO audit_log_partitioned_pkey")
+    op.create_table(
+        "audit_log",
+        *_columns(),
+        sa.PrimaryKeyConstraint("id", name="audit_log_pkey"),
+    )
+    op.execute(f"INSERT INTO audit_log ({COLUMNS}) SELECT {COLUMNS} FROM audit_log_partitioned")
+    # Dropping the parent drops every partition
+    op.drop_table("audit_log_partitioned")
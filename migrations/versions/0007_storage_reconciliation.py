@@ -0,0 +1,57 @@
+"""storage reconciliation reports
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "storage_reconciliation",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "storage_id", postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("storage_destination.id", ondelete="CASCADE"), nullable=False,
+        ),
+        sa.Column("status", sa.String(20)),
+        sa.Column("full", sa.Boolean()),
+        sa.Column("prefixes_listed", sa.Integer()),
+        sa.Column("prefixes_skipped", sa.Integer()),
+        sa.Column("objects_listed", sa.BigInteger()),
+        sa.Column("artifacts_checked", sa.BigInteger()),
+        sa.Column("missing_count", sa.BigInteger()),
+        sa.Column("orphaned_count", sa.BigInteger()),
+        sa.Column("size_mismatch_count", sa.BigInteger()),
+        sa.Column("drift", postgresql.JSONB()),
+        sa.Column("watermark", postgresql.JSONB()),
+        sa.Column("error", sa.Text()),
+        sa.Column("started_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("finished_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index(
+        "ix_storage_reconciliation_storage_started", "storage_reconciliation", ["storage_id", "started_at"],
+    )
+    with op.get_context().autocommit_block():
+        # Byte-ordered paths per destination for the reconciliation merge-join
+        op.create_index(
+            "ix_backup_artifact_storage_path", "backup_artifact",
+            ["storage_id", sa.text("ltrim(remote_path, '/') COLLATE \"C\"")],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_backup_artifact_storage_path", table_name="backup_artifact")
+    op.drop_index("ix_storage_reconciliation_storage_started", table_name="storage_reconciliation")
+    op.drop_table("storage_reconciliation")
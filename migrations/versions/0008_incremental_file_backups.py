@@ -0,0 +1,31 @@
+"""incremental file backup chains
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("backup_artifact", sa.Column("backup_level", sa.String(20)))
+    op.add_column(
+        "backup_artifact",
+        sa.Column("parent_artifact_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("backup_artifact.id")),
+    )
+    op.create_index("ix_backup_artifact_parent_artifact_id", "backup_artifact", ["parent_artifact_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_backup_artifact_parent_artifact_id", table_name="backup_artifact")
+    op.drop_column("backup_artifact", "parent_artifact_id")
+    op.drop_column("backup_artifact", "backup_level")
@@ -0,0 +1,108 @@
+"""move run logs to run_log_chunk
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 00:00:00.000000
+"""
+import json
+import zlib
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same encoding as api.services.run_logs, copied so the migration stays fixed if that changes
+CHUNK_LINES = 500
+BATCH = 200
+
+run_log_chunk = sa.table(
+    "run_log_chunk",
+    sa.column("run_id", postgresql.UUID(as_uuid=True)),
+    sa.column("seq", sa.Integer()),
+    sa.column("first_line", sa.Integer()),
+    sa.column("line_count", sa.Integer()),
+    sa.column("data", sa.LargeBinary()),
+)
+
+
+def _encode(lines: list) -> bytes:
+    return zlib.compress("\n".join(json.dumps(l, separators=(",", ":")) for l in lines).encode())
+
+
+def _decode(data: bytes) -> list:
+    return [json.loads(l) for l in zlib.decompress(data).decode().split("\n") if l]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "run_log_chunk",
+        sa.Column("run_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("backup_run.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("seq", sa.Integer(), nullable=False),
+        sa.Column("first_line", sa.Integer(), nullable=False),
+        sa.Column("line_count", sa.Integer(), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("run_id", "seq"),
+    )
+    op.add_column("backup_run", sa.Column("log_line_count", sa.Integer(), server_default="0", nullable=False))
+
+    # Existing logs are carried over only when run online; zlib isn't available in plain SQL
+    if not context.is_offline_mode():
+        bind = op.get_bind()
+        after = None
+        while True:
+            # Keyset batches, so large histories are never loaded at once
+            query = sa.text(
+                "SELECT id, log_lines FROM backup_run "
+                "WHERE jsonb_array_length(coalesce(log_lines, '[]'::jsonb)) > 0"
+                + (" AND id > :after" if after else "") + " ORDER BY id LIMIT :batch"
+            ).columns(id=postgresql.UUID(as_uuid=True), log_lines=postgresql.JSONB())
+            params = {"batch": BATCH, **({"after": after} if after else {})}
+            rows = bind.execute(query, params).all()
+            if not rows:
+                break
+            chunks = []
+            for run_id, lines in rows:
+                for seq, first in enumerate(range(0, len(lines), CHUNK_LINES)):
+                    part = lines[first:first + CHUNK_LINES]
+                    chunks.append({
+                        "run_id": run_id, "seq": seq, "first_line": first,
+                        "line_count": len(part), "data": _encode(part),
+                    })
+            op.bulk_insert(run_log_chunk, chunks)
+            update = sa.text(
+                "UPDATE backup_run SET log_line_count = jsonb_array_length(log_lines) WHERE id = ANY(:ids)"
+            ).bindparams(sa.bindparam("ids", type_=postgresql.ARRAY(postgresql.UUID(as_uuid=True))))
+            bind.execute(update, {"ids": [r[0] for r in rows]})
+            after = rows[-1][0]
+
+    op.drop_column("backup_run", "log_lines")
+
+
+def downgrade() -> None:
+    op.add_column("backup_run", sa.Column("log_lines", postgresql.JSONB()))
+
+    if not context.is_offline_mode():
+        bind = op.get_bind()
+        update = sa.text("UPDATE backup_run SET log_lines = :lines WHERE id = :id").bindparams(
+            sa.bindparam("lines", type_=postgresql.JSONB()),
+        )
+        run_ids = bind.execute(
+            sa.text("SELECT DISTINCT run_id FROM run_log_chunk").columns(run_id=postgresql.UUID(as_uuid=True))
+        ).scalars().all()
+        select_chunks = sa.text("SELECT data FROM run_log_chunk WHERE run_id = :id ORDER BY seq").columns(
+            data=sa.LargeBinary(),
+        )
+        for run_id in run_ids:
+            lines = [l for data in bind.execute(select_chunks, {"id": run_id}).scalars() for l in _decode(data)]
+            bind.execute(update, {"lines": lines, "id": run_id})
+
+    op.drop_column("backup_run", "log_line_count")
+    op.drop_table("run_log_chunk")
+
@@ -0,0 +1,80 @@
+"""run history indexes, archive and daily rollups
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0010"
+down_revision: Union[str, None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "backup_run_archive",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("job_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("server_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("status", sa.String(50), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True)),
+        sa.Column("finished_at", sa.DateTime(timezone=True)),
+        sa.Column("size_bytes", sa.BigInteger()),
+        sa.Column("error_message", sa.Text()),
+        sa.Column("triggered_by", sa.String(50)),
+        sa.Column("retry_count", sa.Integer()),
+        sa.Column("log_line_count", sa.Integer()),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("archived_at", sa.DateTime(timezone=True)),
+        # The partition key must be part of the primary key
+        sa.PrimaryKeyConstraint("id", "created_at"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    op.create_index("ix_backup_run_archive_created", "backup_run_archive", ["created_at", "id"])
+    op.create_index("ix_backup_run_archive_job_created", "backup_run_archive", ["job_id", "created_at"])
+    # Monthly partitions are created by the archive task ahead of time; this one catches the rest
+    op.execute("CREATE TABLE backup_run_archive_default PARTITION OF backup_run_archive DEFAULT")
+
+    op.create_table(
+        "run_daily_rollup",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("job_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("server_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("status", sa.String(50), nullable=False),
+        sa.Column("runs", sa.BigInteger()),
+        sa.Column("size_bytes", sa.BigInteger()),
+        sa.Column("duration_seconds", sa.Float()),
+        sa.PrimaryKeyConstraint("day", "job_id", "server_id", "status"),
+    )
+
+    with op.get_context().autocommit_block():
+        # Concurrently, so backup_run stays writable on large installs
+        for name, columns, where in (
+            ("ix_backup_run_created", ["created_at", "id"], None),
+            ("ix_backup_run_job_created", ["job_id", "created_at", "id"], None),
+            ("ix_backup_run_server_created", ["server_id", "created_at", "id"], None),
+            ("ix_backup_run_open_failed", ["status", "created_at"], "status IN ('pending', 'running', 'failed', 'partial')"),
+            ("ix_backup_run_success_finished", ["finished_at"], "status = 'success'"),
+        ):
+            op.create_index(
+                name, "backup_run", columns,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    for name in (
+        "ix_backup_run_success_finished", "ix_backup_run_open_failed", "ix_backup_run_server_created",
+        "ix_backup_run_job_created", "ix_backup_run_created",
+    ):
+        op.drop_index(name, table_name="backup_run")
+    op.drop_table("run_daily_rollup")
+    # Archived runs are not moved back: their artifacts and logs are already gone
+    op.drop_table("backup_run_archive")
@@ -0,0 +1,36 @@
+"""run leases
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0011"
+down_revision: Union[str, None] = "0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("backup_run", sa.Column("task_id", sa.String(155)))
+    op.add_column("backup_run", sa.Column("worker", sa.String(255)))
+    op.add_column("backup_run", sa.Column("heartbeat_at", sa.DateTime(timezone=True)))
+    op.add_column("backup_run", sa.Column("lease_expires_at", sa.DateTime(timezone=True)))
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_backup_run_task_id", "backup_run", ["task_id"],
+            postgresql_where=sa.text("task_id IS NOT NULL"),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_backup_run_task_id", table_name="backup_run")
+    op.drop_column("backup_run", "lease_expires_at")
+    op.drop_column("backup_run", "heartbeat_at")
+    op.drop_column("backup_run", "worker")
+    op.drop_column("backup_run", "task_id")
@@ -0,0 +1,28 @@
+"""run stages and checkpoints
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0012"
+down_revision: Union[str, None] = "0011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("backup_run", sa.Column("stage", sa.String(20), nullable=False, server_default="produce"))
+    op.add_column("backup_run", sa.Column("checkpoint", postgresql.JSONB()))
+    # Earlier runs have nothing to resume: successful ones are complete
+    op.execute("UPDATE backup_run SET stage = 'done' WHERE status = 'success'")
+
+
+def downgrade() -> None:
+    op.drop_column("backup_run", "checkpoint")
+    op.drop_column("backup_run", "stage")
@@ -0,0 +1,25 @@
+"""job overlap policy
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0013"
+down_revision: Union[str, None] = "0012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("backup_job", sa.Column("overlap_policy", sa.String(20), nullable=False, server_default="skip"))
+    op.add_column("backup_run", sa.Column("overlap_decision", sa.String(20)))
+
+
+def downgrade() -> None:
+    op.drop_column("backup_run", "overlap_decision")
+    op.drop_column("backup_job", "overlap_policy")
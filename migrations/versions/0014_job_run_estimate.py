@@ -0,0 +1,36 @@
+"""job run estimates
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0014"
+down_revision: Union[str, None] = "0013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_run_estimate",
+        sa.Column("job_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("backup_job.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("samples", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("duration_mean", sa.Float()),
+        sa.Column("duration_var", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("size_mean", sa.Float()),
+        sa.Column("throughput_samples", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("throughput_mean", sa.Float()),
+        sa.Column("throughput_var", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("last_size_bytes", sa.BigInteger()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("job_run_estimate")
@@ -0,0 +1,42 @@
+"""run log full-text search
+
+Revision ID: 0015
+Revises: 0014
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0015"
+down_revision: Union[str, None] = "0014"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing chunks stay NULL here; the index-run-logs task fills them in batches
+    op.add_column("run_log_chunk", sa.Column("search", postgresql.TSVECTOR()))
+    # CONCURRENTLY keeps run_log_chunk writable while running backups log
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_run_log_chunk_search", "run_log_chunk", ["search"],
+            postgresql_using="gin", postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_run_log_chunk_created", "run_log_chunk", ["created_at"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_run_log_chunk_unindexed", "run_log_chunk", ["created_at"],
+            postgresql_where=sa.text("search IS NULL"), postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_run_log_chunk_unindexed", table_name="run_log_chunk")
+    op.drop_index("ix_run_log_chunk_created", table_name="run_log_chunk")
+    op.drop_index("ix_run_log_chunk_search", table_name="run_log_chunk")
+    op.drop_column("run_log_chunk", "search")
@@ -0,0 +1,41 @@
+"""updated_at on artifacts and runs for delta exports
+
+Revision ID: 0016
+Revises: 0015
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0016"
+down_revision: Union[str, None] = "0015"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # now() is evaluated once, so existing rows get the upgrade time without a table rewrite;
+    # the first delta sync after the upgrade therefore exports everything once
+    for table in ("backup_artifact", "backup_run"):
+        op.add_column(
+            table,
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_backup_artifact_updated", "backup_artifact", ["updated_at", "id"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_backup_run_updated", "backup_run", ["updated_at", "id"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_backup_run_updated", table_name="backup_run")
+    op.drop_index("ix_backup_artifact_updated", table_name="backup_artifact")
+    op.drop_column("backup_run", "updated_at")
+    op.drop_column("backup_artifact", "updated_at")
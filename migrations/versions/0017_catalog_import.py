@@ -0,0 +1,50 @@
+"""catalog import
+
+Revision ID: 0017
+Revises: 0016
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0017"
+down_revision: Union[str, None] = "0016"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "catalog_import",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("storage_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("storage_destination.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("job_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("backup_job.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("prefix", sa.String(1000), nullable=False, server_default=""),
+        sa.Column("patterns", postgresql.JSONB(), nullable=False, server_default="[]"),
+        sa.Column("egress_budget_bytes", sa.BigInteger()),
+        sa.Column("status", sa.String(20), nullable=False, server_default="pending"),
+        sa.Column("cursor", sa.Text()),
+        sa.Column("objects_listed", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("imported_count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("existing_count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("unmatched_count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("failed_count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("hashed_by_backend", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("hashed_by_download", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("bytes_downloaded", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("samples", postgresql.JSONB(), nullable=False, server_default="{}"),
+        sa.Column("error", sa.Text()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("started_at", sa.DateTime(timezone=True)),
+        sa.Column("finished_at", sa.DateTime(timezone=True)),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_catalog_import_storage_created", "catalog_import", ["storage_id", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_catalog_import_storage_created", table_name="catalog_import")
+    op.drop_table("catalog_import")
@@ -0,0 +1,30 @@
+"""job run estimates per backup level
+
+Revision ID: 0018
+Revises: 0017
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0018"
+down_revision: Union[str, None] = "0017"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The old estimates mixed fulls and incrementals (and restores); they are reseeded
+    op.execute("DELETE FROM job_run_estimate")
+    op.add_column("job_run_estimate", sa.Column("backup_level", sa.String(20), nullable=False, server_default=""))
+    op.drop_constraint("job_run_estimate_pkey", "job_run_estimate", type_="primary")
+    op.create_primary_key("job_run_estimate_pkey", "job_run_estimate", ["job_id", "backup_level"])
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM job_run_estimate WHERE backup_level <> ''")
+    op.drop_constraint("job_run_estimate_pkey", "job_run_estimate", type_="primary")
+    op.create_primary_key("job_run_estimate_pkey", "job_run_estimate", ["job_id"])
+    op.drop_column("job_run_estimate", "backup_level")
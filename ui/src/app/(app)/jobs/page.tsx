@@ -19,7 +19,7 @@ const emptyForm = {
   // Storage & retention
   destination_ids: [] as string[], storage_subdir: '', retention_id: '', retention_overrides: {} as Record<string, string>,
   // Advanced
-  pre_script: '', post_script: '', max_retries: 2,
+  pre_script: '', post_script: '', max_retries: 2, overlap_policy: 'skip',
 };
 
 export default function JobsPage() {
@@ -75,9 +75,10 @@ export default function JobsPage() {
       destination_ids: (j.destination_ids || []).map((id: any) => String(id)), storage_subdir: sc.subdir || '',
       retention_id: j.retention_id || '', retention_overrides: j.retention_overrides || {},
       pre_script: j.pre_script || '', post_script: j.post_script || '', max_retries: j.max_retries ?? 2,
+      overlap_policy: j.overlap_policy || 'skip',
     });
     setShowForm(true);
-    setShowAdvanced(!!(j.pre_script || j.post_script || (j.max_retries != null && j.max_retries !== 2)));
+    setShowAdvanced(!!(j.pre_script || j.post_script || (j.max_retries != null && j.max_retries !== 2) || (j.overlap_policy && j.overlap_policy !== 'skip')));
   };
   const closeForm = () => { setShowForm(false); setEditId(null); setShowBrowser(false); };
 
@@ -100,6 +101,7 @@ export default function JobsPage() {
       retention_overrides: Object.keys(form.retention_overrides).length > 0 ? form.retention_overrides : {},
       tags: form.tags, domain: form.domain || null, encrypt: form.encrypt,
       pre_script: form.pre_script || null, post_script: form.post_script || null, max_retries: form.max_retries,
+      overlap_policy: form.overlap_policy,
     };
     if (editId) { await updateJob(editId, payload); } else { await createJob(payload); }
     closeForm(); load();
@@ -579,6 +581,15 @@ export default function JobsPage() {
               <FormLabel label={t('jobs.max_retries')} tooltip={t('jobs.max_retries_tip')} />
               <input type="number" min="0" max="10" value={form.max_retries} onChange={e => setForm({...form, max_retries: Number(e.target.value)})} className={INPUT} />
             </div>
+            <div>
+              <FormLabel label={t('jobs.overlap_policy')} tooltip={t('jobs.overlap_policy_tip')} />
+              <select value={form.overlap_policy} onChange={e => setForm({...form, overlap_policy: e.target.value})} className={INPUT}>
+                <option value="skip">{t('jobs.overlap_skip')}</option>
+                <option value="queue_one">{t('jobs.overlap_queue_one')}</option>
+                <option value="cancel_previous">{t('jobs.overlap_cancel_previous')}</option>
+                <option value="allow">{t('jobs.overlap_allow')}</option>
+              </select>
+            </div>
           </div>
         </div>
       )}
@@ -9,7 +9,7 @@ import { Plus, Trash2, TestTube, Bell, Send, Eye, EyeOff, Pencil, X } from 'luci
 const INPUT = "w-full bg-vm-surface2 border border-vm-border rounded px-3 py-2.5 text-vm-text font-mono text-sm outline-none focus:border-vm-accent";
 
 const TRIGGER_VALUES = [
-  'run.success', 'run.failed', 'run.started',
+  'run.success', 'run.failed', 'run.partial', 'run.started',
   'restore.started', 'restore.completed', 'restore.failed',
   'server.offline', 'storage.warning', 'storage.critical',
 ];
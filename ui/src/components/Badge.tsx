@@ -9,8 +9,9 @@ export default function Badge({ status, label }: { status: string; label?: strin
         'bg-vm-success shadow-[0_0_6px_theme(colors.vm.success)]': status === 'success',
         'bg-vm-accent shadow-[0_0_6px_theme(colors.vm.accent)] animate-pulse-glow': status === 'running',
         'bg-vm-danger': status === 'failed',
+        'bg-vm-accent2': status === 'partial',
         'bg-vm-warning animate-pulse-glow': status === 'pending',
-        'bg-vm-text-dim': status === 'cancelled',
+        'bg-vm-text-dim': status === 'cancelled' || status === 'skipped',
       })} />
       {text}
     </span>
@@ -290,6 +290,7 @@ const translations: Dict = {
   // ── Trigger labels ──
   'trigger.run.success': { sv: 'Backup lyckades', en: 'Backup success' },
   'trigger.run.failed': { sv: 'Backup misslyckades', en: 'Backup failed' },
+  'trigger.run.partial': { sv: 'Backup delvis lyckad', en: 'Backup partial' },
   'trigger.run.started': { sv: 'Backup startad', en: 'Backup started' },
   'trigger.restore.started': { sv: 'Återställning startad', en: 'Restore started' },
   'trigger.restore.completed': { sv: 'Återställning klar', en: 'Restore completed' },
@@ -494,6 +495,12 @@ const translations: Dict = {
   'jobs.post_script_tip': { sv: 'Kommando som körs EFTER backup. T.ex. starta tjänster, skicka notis.', en: 'Command to run AFTER backup. E.g. start services, send notification.' },
   'jobs.max_retries': { sv: 'Max omförsök', en: 'Max Retries' },
   'jobs.max_retries_tip': { sv: 'Antal gånger att försöka igen vid misslyckande. 0 = inga omförsök.', en: 'Number of times to retry on failure. 0 = no retries.' },
+  'jobs.overlap_policy': { sv: 'Vid överlapp', en: 'On Overlap' },
+  'jobs.overlap_policy_tip': { sv: 'Vad som händer när jobbet startas medan föregående körning fortfarande pågår.', en: 'What happens when the job starts while its previous run is still in progress.' },
+  'jobs.overlap_skip': { sv: 'Hoppa över', en: 'Skip' },
+  'jobs.overlap_queue_one': { sv: 'Köa en körning', en: 'Queue one run' },
+  'jobs.overlap_cancel_previous': { sv: 'Avbryt föregående', en: 'Cancel previous' },
+  'jobs.overlap_allow': { sv: 'Tillåt parallellt', en: 'Allow in parallel' },
 
   // ── Notifications: Delivery settings ──
   'notif.delivery': { sv: 'Leveransinställningar', en: 'Delivery Settings' },
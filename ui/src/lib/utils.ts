@@ -47,8 +47,9 @@ export function statusBg(status: string): string {
     case 'success': return 'bg-vm-success/10 border-vm-success/30 text-vm-success';
     case 'running': return 'bg-vm-accent/10 border-vm-accent/30 text-vm-accent';
     case 'failed': return 'bg-vm-danger/10 border-vm-danger/30 text-vm-danger';
+    case 'partial': return 'bg-vm-accent2/10 border-vm-accent2/30 text-vm-accent2';
     case 'pending': return 'bg-vm-warning/10 border-vm-warning/30 text-vm-warning';
-    case 'cancelled': return 'bg-vm-text-dim/10 border-vm-text-dim/30 text-vm-text-dim';
+    case 'cancelled': case 'skipped': return 'bg-vm-text-dim/10 border-vm-text-dim/30 text-vm-text-dim';
     default: return 'bg-vm-surface2 border-vm-border text-vm-text-dim';
   }
 }